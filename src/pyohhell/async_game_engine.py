@@ -0,0 +1,495 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from itertools import cycle
+from typing import Dict, List, Optional, Tuple, Type
+import asyncio
+import logging
+
+from pydecklib.card import Card, Suit
+
+from src.pyohhell.cards import Hand
+from src.pyohhell.events import Event
+from src.pyohhell.game_engine import GameEngine, get_authorised_bids
+from src.pyohhell.game_state import AbstractPointAttributionStrategy, GameState
+from src.pyohhell.player import (
+    AbstractBidSelectionStrategy,
+    AbstractCardSelectionStrategy,
+    FirstBidSelectionStrategy,
+    FirstCardSelectionStrategy,
+    Player
+)
+from src.pyohhell.rng import round_seed
+
+
+class AbstractAsyncPlayer(ABC):
+
+    """
+    Abstract base class representing a 'oh hell' player whose decisions are
+    awaited, e.g. a bot playing over the network.
+
+    It mirrors `AbstractPlayer`, except that `play_card` and `make_bid` are
+    coroutines. The engine may play a fallback move on behalf of a player that
+    takes too long to decide or whose move isn't authorised, and then puts
+    back the cards the player removed with `add_to_hand` and removes the
+    fallback card from its hand with `remove_from_hand`.
+
+    Properties:
+        id: Unique identifier for the player.
+        hand: Current set of cards held by the player.
+        notified_events: Event types the player is notified of, None to
+                         receive the whole game state after every move.
+    """
+
+    @property
+    @abstractmethod
+    def id(self) -> int:
+
+        """
+        Property representing the player's unique identifier.
+
+        :return: The unique identifier of the player.
+        :rtype: int
+        """
+
+        pass
+
+    @property
+    @abstractmethod
+    def hand(self) -> List[Card]:
+
+        """
+        Property representing the current hand of the player.
+
+        :return: The current set of cards held by the player.
+        :rtype: List[Card]
+        """
+
+        pass
+
+    @property
+    def notified_events(self) -> Optional[Tuple[Type[Event], ...]]:
+
+        """
+        Property representing the event types the player is notified of, see
+        `AbstractPlayer.notified_events`.
+
+        :return: The event types the player is notified of, or None.
+        :rtype: Optional[Tuple[Type[Event], ...]]
+        """
+
+        return None
+
+    def notify(self, event: Event):
+
+        """
+        Notify the player of an event of one of its `notified_events` types.
+
+        :param event: The event that just happened.
+        :type event: Event
+        """
+
+        pass
+
+    def reseed(self, seed: int):
+
+        """
+        Reseed the random number generators of the player, see
+        `AbstractPlayer.reseed`.
+
+        :param seed: The new seed.
+        :type seed: int
+        """
+
+        pass
+
+    @abstractmethod
+    def add_to_hand(self, card: Card):
+
+        """
+        Add a card to the player's hand.
+
+        :param card: The card to add.
+        :type card: Card
+        """
+
+        pass
+
+    @abstractmethod
+    def remove_from_hand(self, card: Card):
+
+        """
+        Remove a card played on behalf of the player from its hand.
+
+        :param card: The card to remove.
+        :type card: Card
+        """
+
+        pass
+
+    def authorised_cards(self, trick_suit: Optional[Suit]) -> List[Card]:
+
+        """
+        The cards of the player's hand allowed in the current trick (see
+        `AbstractPlayer.authorised_cards`).
+
+        :param trick_suit: The suit of the current trick.
+        :type trick_suit: Optional[Suit]
+        :return: The authorised cards, in the order of the hand.
+        :rtype: List[Card]
+        """
+
+        return Hand(self.hand).authorised_cards(trick_suit)
+
+    @abstractmethod
+    def update_game_state(self, game_state: GameState):
+
+        """
+        Update the player's knowledge of the game state.
+
+        :param game_state: The current state of the game.
+        :type game_state: GameState
+        """
+
+        pass
+
+    @abstractmethod
+    async def play_card(self, authorised_cards: List[Card]) -> Card:
+
+        """
+        Determine and return a card to be played from the player's hand, and
+        remove it from the hand.
+
+        :param authorised_cards: List of cards that the player is allowed
+                                 to play.
+        :type authorised_cards: List[Card]
+        :return: The card chosen to be played.
+        :rtype: Card
+        """
+
+        pass
+
+    @abstractmethod
+    async def make_bid(self, authorised_bids: List[int]) -> int:
+
+        """
+        Make a bid on the won tricks based on the game rules and the player's
+        strategy.
+
+        :param authorised_bids: List of bids that the player is allowed to
+                                make.
+        :type authorised_bids: List[int]
+        :return: The bid chosen by the player.
+        :rtype: int
+        """
+
+        pass
+
+
+class AsyncPlayerAdapter(AbstractAsyncPlayer):
+
+    """
+    Asynchronous player deciding with a synchronous `Player`, to seat local
+    players at the table of an `AsyncGameEngine`.
+
+    :param player: The synchronous player.
+    :type player: Player
+
+    :Example:
+        >>> player = AsyncPlayerAdapter(Player(1))
+    """
+
+    def __init__(self, player: Player):
+
+        self._player = player
+
+    @property
+    def id(self) -> int:
+
+        return self._player.id
+
+    @property
+    def hand(self) -> List[Card]:
+
+        return self._player.hand
+
+    @property
+    def notified_events(self) -> Optional[Tuple[Type[Event], ...]]:
+
+        return self._player.notified_events
+
+    def notify(self, event: Event):
+
+        self._player.notify(event)
+
+    def reseed(self, seed: int):
+
+        self._player.reseed(seed)
+
+    def add_to_hand(self, card: Card):
+
+        self._player.add_to_hand(card)
+
+    def remove_from_hand(self, card: Card):
+
+        self._player.remove_from_hand(card)
+
+    def authorised_cards(self, trick_suit: Optional[Suit]) -> List[Card]:
+
+        return self._player.authorised_cards(trick_suit)
+
+    def update_game_state(self, game_state: GameState):
+
+        self._player.update_game_state(game_state)
+
+    async def play_card(self, authorised_cards: List[Card]) -> Card:
+
+        return self._player.play_card(authorised_cards)
+
+    async def make_bid(self, authorised_bids: List[int]) -> int:
+
+        return self._player.make_bid(authorised_bids)
+
+
+class AsyncGameEngine(GameEngine):
+
+    """
+    Asyncio variant of `GameEngine` awaiting the decisions of
+    `AbstractAsyncPlayer` players.
+
+    Every decision can be bounded by a timeout. When a player doesn't decide
+    in time, or makes a move that isn't authorised, the engine makes a
+    fallback move on its behalf with the fallback strategies. A single event
+    loop can then drive many tables whose players are network bots.
+
+    :param point_attribution_strategy: The strategy used for attributing points
+                                       to players.
+    :type point_attribution_strategy: AbstractPointAttributionStrategy
+    :param decision_timeout: The time given to a player for each decision, in
+                             seconds, None for no limit.
+    :type decision_timeout: Optional[float]
+    :param fallback_card_selection_strategy: The strategy selecting the card
+                                             played on behalf of a player
+                                             that timed out.
+    :type fallback_card_selection_strategy: AbstractCardSelectionStrategy
+    :param fallback_bid_selection_strategy: The strategy selecting the bid made
+                                            on behalf of a player that timed
+                                            out.
+    :type fallback_bid_selection_strategy: AbstractBidSelectionStrategy
+    :param resolve_forced_moves: True to play the forced moves without
+                                 asking the players, see `GameEngine`.
+    :type resolve_forced_moves: bool
+
+    :Example:
+        >>> async def play_tables(n_tables):
+        ...     game_engines = list()
+        ...     for _ in range(n_tables):
+        ...         game_engine = AsyncGameEngine(
+        ...             DefaultPointAttributionStrategy(), decision_timeout=1.
+        ...         )
+        ...         game_engine.subscribe_player(RemotePlayer(1))
+        ...         game_engine.subscribe_player(RemotePlayer(2))
+        ...         game_engines.append(game_engine)
+        ...     return await asyncio.gather(*(
+        ...         game_engine.play_game() for game_engine in game_engines
+        ...     ))
+        >>> asyncio.run(play_tables(100))
+    """
+
+    def __init__(
+        self, point_attribution_strategy: AbstractPointAttributionStrategy,
+        decision_timeout: Optional[float] = None,
+        fallback_card_selection_strategy: AbstractCardSelectionStrategy =
+        FirstCardSelectionStrategy(),
+        fallback_bid_selection_strategy: AbstractBidSelectionStrategy =
+        FirstBidSelectionStrategy(),
+        resolve_forced_moves: bool = False
+    ):
+
+        if decision_timeout is not None and decision_timeout <= 0:
+            raise ValueError("`decision_timeout` should be greater than 0")
+
+        super().__init__(point_attribution_strategy, resolve_forced_moves)
+
+        self._decision_timeout = decision_timeout
+        self._fallback_card_selection_strategy = \
+            fallback_card_selection_strategy
+        self._fallback_bid_selection_strategy = \
+            fallback_bid_selection_strategy
+
+    async def play_game(self, seed: Optional[int] = None) -> Dict[int, int]:
+
+        """
+        Plays the entire game, going through all the rounds.
+
+        :param seed: The seed value for random operations, such as shuffling.
+        :type seed: Optional[int]
+
+        :return: The final points scored by each player.
+        :rtype: Dict[int, int]
+        """
+
+        players_idx = cycle(range(len(self._players)))
+        max_n_cards = 51 // len(self._players)
+
+        self._start_game(seed)
+        for round_idx in range(max_n_cards):
+
+            self._shuffle_deck(round_seed(seed, round_idx))
+            first_player_idx = next(players_idx)
+            await self.play_round(round_idx, round_idx+1, first_player_idx)
+            self._game_state.store_current_round()
+
+        return self._end_game()
+
+    async def play_round(
+        self, round_id: int, n_cards: int, first_player_idx: int
+    ) -> Dict[int, int]:
+
+        """
+        Plays a single round of the game.
+
+        :param round_id: The identifier for the round.
+        :type round_id: int
+        :param n_cards: The number of cards to be played in this round.
+        :type n_cards: int
+        :param first_player_idx: The index of the first player in this round.
+        :type first_player_idx: int
+
+        :return: The points scored in this round by each player.
+        :rtype: Dict[int, int]
+        """
+
+        game_round = self._start_round(round_id, n_cards)
+
+        # make bids
+        for i, player in enumerate(self._ordered_players(first_player_idx)):
+            autorised_bids = get_authorised_bids(
+                n_cards, game_round.total_bid, i+1 == len(self._players)
+            )
+            bid = self._forced_bid(autorised_bids)
+            forced = bid is not None
+            if not forced:
+                self._flush_notifications()
+                bid = await self._make_bid(player, autorised_bids)
+            self._add_bid(game_round, player, bid, forced)
+
+        # play tricks
+        for trick_idx in range(n_cards):
+
+            await self._play_trick(trick_idx, first_player_idx)
+
+        return self._end_round(game_round)
+
+    async def _play_trick(self, trick_id: int, first_player_idx: int):
+
+        """
+        Plays a single trick within a round.
+
+        :param trick_id: The identifier for the trick.
+        :type trick_id: int
+        :param first_player_idx: The index of the first player in this trick.
+        :type first_player_idx: int
+        """
+
+        # play cards
+        trick = self._start_trick(trick_id)
+        for player in self._ordered_players(first_player_idx):
+
+            authorised_cards = player.authorised_cards(trick.suit)
+            played_card = self._forced_card(player, authorised_cards)
+            forced = played_card is not None
+            if not forced:
+                self._flush_notifications()
+                played_card = await self._play_card(player, authorised_cards)
+            self._add_card(trick, player, played_card, forced)
+
+        self._end_trick(trick)
+        self._flush_notifications()
+
+    async def _make_bid(
+        self, player: AbstractAsyncPlayer, authorised_bids: List[int]
+    ) -> int:
+
+        """
+        Awaits the bid of a player, or makes the fallback bid if the player
+        times out or makes a bid that isn't authorised.
+
+        :param player: The player making the bid.
+        :type player: AbstractAsyncPlayer
+        :param authorised_bids: The bids the player is allowed to make.
+        :type authorised_bids: List[int]
+
+        :return: The bid of the player.
+        :rtype: int
+        """
+
+        try:
+            bid = await asyncio.wait_for(
+                player.make_bid(authorised_bids), self._decision_timeout
+            )
+            if bid in authorised_bids:
+                return bid
+            reason = "made an unauthorised bid %r" % (bid,)
+
+        except asyncio.TimeoutError:
+            reason = "timed out"
+
+        bid = self._fallback_bid_selection_strategy.select_bid(
+            player.hand, authorised_bids, self._game_state
+        )
+        logging.warning(
+            "Player %s %s, fallback bid: %s", player.id, reason, bid
+        )
+
+        return bid
+
+    async def _play_card(
+        self, player: AbstractAsyncPlayer, authorised_cards: List[Card]
+    ) -> Card:
+
+        """
+        Awaits the card played by a player, or plays the fallback card on its
+        behalf if the player times out or plays a card that isn't authorised.
+        In both cases, the cards the player removed from its hand are put
+        back before the fallback card is removed.
+
+        :param player: The player playing the card.
+        :type player: AbstractAsyncPlayer
+        :param authorised_cards: The cards the player is allowed to play.
+        :type authorised_cards: List[Card]
+
+        :return: The card played.
+        :rtype: Card
+        """
+
+        hand = list(player.hand)
+        try:
+            card = await asyncio.wait_for(
+                player.play_card(authorised_cards), self._decision_timeout
+            )
+            if card in authorised_cards:
+                return card
+            reason = "played an unauthorised card %r" % (card,)
+
+        except asyncio.TimeoutError:
+            # the decision may have been cancelled after removing its card
+            reason = "timed out"
+
+        for held_card in hand:
+            if held_card not in player.hand:
+                player.add_to_hand(held_card)
+
+        card = self._fallback_card_selection_strategy.select_card(
+            player.hand, authorised_cards, self._game_state
+        )
+        if card in player.hand:
+            player.remove_from_hand(card)
+        logging.warning(
+            "Player %s %s, fallback card: %s", player.id, reason, card
+        )
+
+        return card
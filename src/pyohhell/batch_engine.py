@@ -0,0 +1,362 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.pyohhell.cards import BEATS, N_CARDS, N_SUITS, N_VALUES
+from src.pyohhell.player import (
+    AbstractBidSelectionStrategy,
+    AbstractCardSelectionStrategy,
+    FirstBidSelectionStrategy,
+    FirstCardSelectionStrategy,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+
+
+_BEATS = np.frombuffer(BEATS, dtype=np.uint8).reshape(
+    N_SUITS, N_SUITS, N_CARDS, N_CARDS
+).astype(bool)
+
+_FIRST = 0
+_RANDOM = 1
+
+_CARD_STRATEGY_KINDS = {
+    FirstCardSelectionStrategy: _FIRST,
+    RandomCardSelectionStrategy: _RANDOM
+}
+_BID_STRATEGY_KINDS = {
+    FirstBidSelectionStrategy: _FIRST,
+    RandomBidSelectionStrategy: _RANDOM
+}
+
+
+class BatchGameEngine:
+
+    """
+    Plays many games in lockstep with NumPy arrays, for players using the
+    stateless first or random strategies.
+
+    The games follow the rules of `GameEngine` and the default point
+    attribution: the rounds go from 1 card to ``51 // n_players`` cards, the
+    first player of the round moves one seat at each round and leads every
+    trick of the round. Hands, bids, trick cards and scores of all the games
+    are stored as arrays indexed by game and seat, so every decision is a
+    handful of array operations over the whole batch instead of a Python
+    object graph per game.
+
+    Players using `FirstCardSelectionStrategy` and `FirstBidSelectionStrategy`
+    play exactly like they do in `GameEngine` on the same deals. The random
+    strategies draw from the generator of the batch engine, their own seed is
+    ignored.
+
+    :param card_selection_strategies: The card selection strategy of each
+                                      seat.
+    :type card_selection_strategies: Sequence[AbstractCardSelectionStrategy]
+    :param bid_selection_strategies: The bid selection strategy of each seat.
+    :type bid_selection_strategies: Sequence[AbstractBidSelectionStrategy]
+    :param seed: The seed of the generator used for the deals and the random
+                 strategies.
+    :type seed: Optional[int]
+
+    :raises ValueError: If the numbers of strategies don't match or if a
+                        strategy isn't supported.
+
+    :Example:
+        >>> batch_engine = BatchGameEngine(
+        ...     [FirstCardSelectionStrategy(), RandomCardSelectionStrategy()],
+        ...     [FirstBidSelectionStrategy(), RandomBidSelectionStrategy()],
+        ...     seed=42
+        ... )
+        >>> points = batch_engine.play_games(n_games=100000)
+        >>> points.shape
+        (100000, 2)
+    """
+
+    def __init__(
+        self,
+        card_selection_strategies: Sequence[AbstractCardSelectionStrategy],
+        bid_selection_strategies: Sequence[AbstractBidSelectionStrategy],
+        seed: Optional[int] = None
+    ):
+
+        if len(card_selection_strategies) != len(bid_selection_strategies):
+            raise ValueError(
+                "`card_selection_strategies` and `bid_selection_strategies` "
+                "should have the same length"
+            )
+
+        if not 2 <= len(card_selection_strategies) <= N_CARDS // 2:
+            raise ValueError(
+                f"the number of players should be between 2 and "
+                f"{N_CARDS // 2}"
+            )
+
+        self._card_strategy_kinds = [
+            self._strategy_kind(strategy, _CARD_STRATEGY_KINDS)
+            for strategy in card_selection_strategies
+        ]
+        self._bid_strategy_kinds = [
+            self._strategy_kind(strategy, _BID_STRATEGY_KINDS)
+            for strategy in bid_selection_strategies
+        ]
+        self._rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def _strategy_kind(strategy, kinds) -> int:
+
+        """
+        Maps a strategy to the kind of decision rule it uses.
+
+        :param strategy: The strategy.
+        :param kinds: The kind of each supported strategy class.
+
+        :return: The kind of the strategy.
+        :rtype: int
+
+        :raises ValueError: If the strategy isn't supported.
+        """
+
+        kind = kinds.get(type(strategy))
+        if kind is None:
+            raise ValueError(
+                f"{type(strategy).__name__} isn't supported by the batch "
+                f"engine"
+            )
+
+        return kind
+
+    @property
+    def n_players(self) -> int:
+
+        """
+        The number of players of each game.
+
+        :return: The number of players.
+        :rtype: int
+        """
+
+        return len(self._card_strategy_kinds)
+
+    @property
+    def n_rounds(self) -> int:
+
+        """
+        The number of rounds of each game.
+
+        :return: The number of rounds.
+        :rtype: int
+        """
+
+        return (N_CARDS - 1) // self.n_players
+
+    def deal(self, n_games: int) -> np.ndarray:
+
+        """
+        Draws the deals of a batch of games.
+
+        :param n_games: The number of games.
+        :type n_games: int
+
+        :return: One shuffled deck of card indices per game and round, of
+                 shape ``(n_games, n_rounds, 52)``.
+        :rtype: np.ndarray
+        """
+
+        decks = np.broadcast_to(
+            np.arange(N_CARDS, dtype=np.int64),
+            (n_games, self.n_rounds, N_CARDS)
+        )
+
+        return self._rng.permuted(decks, axis=2)
+
+    def play_games(
+        self, n_games: Optional[int] = None,
+        deals: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+
+        """
+        Plays a batch of games.
+
+        Each round is dealt like in `GameEngine`: the seat ``s`` gets the
+        cards at positions ``s``, ``s + n_players``, ... of the deck and the
+        card following the hands is the trump card.
+
+        :param n_games: The number of games, when the deals are drawn by the
+                        batch engine.
+        :type n_games: Optional[int]
+        :param deals: The deals of the games, of shape
+                      ``(n_games, n_rounds, 52)``, see `deal`.
+        :type deals: Optional[np.ndarray]
+
+        :return: The points scored by each seat in each game, of shape
+                 ``(n_games, n_players)``.
+        :rtype: np.ndarray
+
+        :raises ValueError: If neither `n_games` nor `deals` is given, or if
+                            `deals` doesn't have the expected shape.
+        """
+
+        if deals is None:
+            if n_games is None:
+                raise ValueError("either `n_games` or `deals` should be given")
+            deals = self.deal(n_games)
+
+        deals = np.asarray(deals, dtype=np.int64)
+        if deals.ndim != 3 or deals.shape[1:] != (self.n_rounds, N_CARDS):
+            raise ValueError(
+                f"`deals` should have the shape "
+                f"(n_games, {self.n_rounds}, {N_CARDS})"
+            )
+
+        points = np.zeros((deals.shape[0], self.n_players), dtype=np.int64)
+        for round_idx in range(self.n_rounds):
+            points += self._play_round(
+                deals[:, round_idx], round_idx + 1,
+                round_idx % self.n_players
+            )
+
+        return points
+
+    def _play_round(
+        self, decks: np.ndarray, n_cards: int, first_player_idx: int
+    ) -> np.ndarray:
+
+        """
+        Plays a single round of every game of the batch.
+
+        :param decks: The shuffled deck of each game.
+        :type decks: np.ndarray
+        :param n_cards: The number of cards dealt to each player.
+        :type n_cards: int
+        :param first_player_idx: The seat of the first player of the round.
+        :type first_player_idx: int
+
+        :return: The points scored by each seat in each game.
+        :rtype: np.ndarray
+        """
+
+        n_games = decks.shape[0]
+        n_players = self.n_players
+        games = np.arange(n_games)
+        seats = [
+            (first_player_idx + i) % n_players for i in range(n_players)
+        ]
+
+        # hands in deal order, indexed by game, seat and card position
+        hands = decks[:, :n_players * n_cards].reshape(
+            n_games, n_cards, n_players
+        ).transpose(0, 2, 1)
+        hand_suits = hands // N_VALUES
+        in_hand = np.ones(hands.shape, dtype=bool)
+        trump_suits = decks[:, n_players * n_cards] // N_VALUES
+
+        bids = self._make_bids(n_games, n_cards, seats)
+
+        wins = np.zeros((n_games, n_players), dtype=np.int64)
+        for _ in range(n_cards):
+
+            lead_suits = None
+            best_cards = None
+            best_seats = None
+            for seat in seats:
+
+                authorised = in_hand[:, seat]
+                if lead_suits is not None:
+                    following = authorised & (
+                        hand_suits[:, seat] == lead_suits[:, None]
+                    )
+                    authorised = np.where(
+                        following.any(axis=1)[:, None], following, authorised
+                    )
+
+                positions = self._select_positions(
+                    authorised, self._card_strategy_kinds[seat]
+                )
+                cards = hands[games, seat, positions]
+                in_hand[games, seat, positions] = False
+
+                if lead_suits is None:
+                    lead_suits = cards // N_VALUES
+                    best_cards = cards
+                    best_seats = np.full(n_games, seat)
+                else:
+                    beaten = _BEATS[lead_suits, trump_suits, cards, best_cards]
+                    best_cards = np.where(beaten, cards, best_cards)
+                    best_seats = np.where(beaten, seat, best_seats)
+
+            wins[games, best_seats] += 1
+
+        return np.where(bids == wins, 3 + bids, -np.abs(wins - bids))
+
+    def _make_bids(
+        self, n_games: int, n_cards: int, seats: Sequence[int]
+    ) -> np.ndarray:
+
+        """
+        Makes the bids of every player of every game of the batch.
+
+        :param n_games: The number of games.
+        :type n_games: int
+        :param n_cards: The number of cards dealt to each player.
+        :type n_cards: int
+        :param seats: The seats in bidding order.
+        :type seats: Sequence[int]
+
+        :return: The bid of each seat in each game.
+        :rtype: np.ndarray
+        """
+
+        bids = np.zeros((n_games, self.n_players), dtype=np.int64)
+        total_bids = np.zeros(n_games, dtype=np.int64)
+        for i, seat in enumerate(seats):
+
+            # only the last player has a forbidden bid, which makes the total
+            # bid equal to the number of cards
+            if i + 1 == len(seats):
+                forbidden_bids = n_cards - total_bids
+            else:
+                forbidden_bids = np.full(n_games, -1)
+            has_forbidden_bid = forbidden_bids >= 0
+
+            if self._bid_strategy_kinds[seat] == _FIRST:
+                seat_bids = (forbidden_bids == 0).astype(np.int64)
+            else:
+                seat_bids = self._rng.integers(
+                    0, n_cards + 1 - has_forbidden_bid
+                )
+                seat_bids += has_forbidden_bid & (seat_bids >= forbidden_bids)
+
+            bids[:, seat] = seat_bids
+            total_bids += seat_bids
+
+        return bids
+
+    def _select_positions(
+        self, authorised: np.ndarray, strategy_kind: int
+    ) -> np.ndarray:
+
+        """
+        Selects the position of the played card in the hand of a seat, for
+        every game of the batch.
+
+        :param authorised: Whether each card of the hand can be played.
+        :type authorised: np.ndarray
+        :param strategy_kind: The kind of the card selection strategy.
+        :type strategy_kind: int
+
+        :return: The position of the played card in each game.
+        :rtype: np.ndarray
+        """
+
+        if strategy_kind == _FIRST:
+            return authorised.argmax(axis=1)
+
+        keys = self._rng.random(authorised.shape)
+        keys[~authorised] = -1.0
+
+        return keys.argmax(axis=1)
@@ -0,0 +1,508 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Bidding from the strength of the hand, looked up in a table of expected
+tricks.
+
+A hand is summarised by its signature: the number of players, the number of
+cards, the seat of the player in bidding order, the length of its trump suit,
+its trump honours (jack or better) and its aces and kings in the other suits.
+The table maps each signature to the mean number of tricks won by such hands,
+measured offline by bulk simulation (`simulate_expected_tricks`): random
+deals played out at random, every seat of every deal giving one sample.
+
+The means of the signatures seen only a few times are shrunk towards the mean
+of their (players, cards, seat) bucket when the table is loaded, so that a
+lookup is a single dictionary access. The table shipped with the package is
+read from `DEFAULT_TABLE_PATH` on the first bid, and can be rebuilt with:
+
+    >>> simulate_expected_tricks(range(2, 8), 20000, seed=0).save(
+    ...     DEFAULT_TABLE_PATH
+    ... )
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+import random
+import struct
+import zlib
+
+from pydecklib.card import Card
+
+from src.pyohhell.cards import (
+    BEATS,
+    N_CARDS,
+    N_SUITS,
+    N_VALUES,
+    SUIT_MASKS,
+    beats_offset,
+    card_suit,
+    card_to_index,
+    cards_to_mask,
+    count_cards
+)
+from src.pyohhell.game_state import GameState
+from src.pyohhell.player import AbstractBidSelectionStrategy
+
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(__file__), 'data', 'expected_tricks.bin'
+)
+
+TABLE_MAGIC = b'OHET'
+_HEADER = struct.Struct('<4sI')
+# signature, mean number of tricks and number of samples, the rows being
+# compressed with zlib after the header
+_ROW = struct.Struct('<7BfI')
+
+# the number of samples of the bucket mean added to the samples of a
+# signature when it is looked up
+_PRIOR_WEIGHT = 8
+
+# the ranks of the honours: jack, queen, king and ace
+_HONOURS_MASK = 0b1111 << (N_VALUES - 4)
+_KING_RANK = N_VALUES - 2
+_ACE_RANK = N_VALUES - 1
+
+Signature = Tuple[int, int, int, int, int, int, int]
+
+
+def hand_signature(
+    hand_mask: int, trump_suit: int, seat: int, n_players: int
+) -> Signature:
+
+    """
+    Summarises a hand by the features driving the number of tricks it wins.
+
+    :param hand_mask: The bitmask of the hand (see `cards.cards_to_mask`).
+    :type hand_mask: int
+    :param trump_suit: The index of the trump suit.
+    :type trump_suit: int
+    :param seat: The seat of the player in bidding order, 0 leading the
+                 first trick.
+    :type seat: int
+    :param n_players: The number of players.
+    :type n_players: int
+
+    :return: The number of players, the number of cards, the seat, the number
+             of trumps, of trump honours, of other aces and of other kings.
+    :rtype: Signature
+
+    :Example:
+        >>> # ace and four of hearts, hearts trump, first of 4 players
+        >>> hand_signature(0b1000000000100 << 13, 1, 0, 4)
+        (4, 2, 0, 2, 1, 0, 0)
+    """
+
+    trumps = hand_mask & SUIT_MASKS[trump_suit]
+    others = hand_mask ^ trumps
+    side_aces = side_kings = 0
+    for suit in range(N_SUITS):
+        if suit != trump_suit:
+            side_aces += others >> (suit * N_VALUES + _ACE_RANK) & 1
+            side_kings += others >> (suit * N_VALUES + _KING_RANK) & 1
+
+    return (
+        n_players, count_cards(hand_mask), seat, count_cards(trumps),
+        count_cards(trumps >> (trump_suit * N_VALUES) & _HONOURS_MASK),
+        side_aces, side_kings
+    )
+
+
+class ExpectedTricksTable:
+
+    """
+    Mean number of tricks won by the hands of each signature (see
+    `hand_signature`).
+
+    :param samples: The mean number of tricks and the number of samples of
+                    each signature.
+    :type samples: Dict[Signature, Tuple[float, int]]
+
+    :Example:
+        >>> table = ExpectedTricksTable.load(DEFAULT_TABLE_PATH)
+        >>> table.expected_tricks((4, 2, 0, 2, 1, 0, 0))
+        1.58...
+    """
+
+    def __init__(self, samples: Dict[Signature, Tuple[float, int]]):
+
+        self._samples = dict(samples)
+
+        # the mean of each (players, cards, seat) bucket
+        totals: Dict[Tuple[int, int, int], List[float]] = dict()
+        for signature, (mean, count) in self._samples.items():
+            total = totals.setdefault(signature[:3], [0., 0])
+            total[0] += mean * count
+            total[1] += count
+        self._bucket_means = {
+            bucket: total / count if count else 0.
+            for bucket, (total, count) in totals.items()
+        }
+
+        self._expected_tricks = dict()
+        for signature, (mean, count) in self._samples.items():
+            prior = self._bucket_means[signature[:3]]
+            self._expected_tricks[signature] = \
+                (mean * count + prior * _PRIOR_WEIGHT) / \
+                (count + _PRIOR_WEIGHT)
+
+    @property
+    def samples(self) -> Dict[Signature, Tuple[float, int]]:
+
+        """
+        The mean number of tricks and the number of samples of each
+        signature.
+
+        :return: The samples by signature.
+        :rtype: Dict[Signature, Tuple[float, int]]
+        """
+
+        return dict(self._samples)
+
+    def expected_tricks(self, signature: Signature) -> float:
+
+        """
+        The expected number of tricks won by a hand. The signatures missing
+        from the table get the mean of their bucket, or the share of the
+        tricks of a player if the bucket is missing too.
+
+        :param signature: The signature of the hand.
+        :type signature: Signature
+
+        :return: The expected number of tricks.
+        :rtype: float
+        """
+
+        expected = self._expected_tricks.get(signature)
+        if expected is not None:
+            return expected
+
+        n_players, n_cards, _, _, _, _, _ = signature
+
+        return self._bucket_means.get(signature[:3], n_cards / n_players)
+
+    def to_bytes(self) -> bytes:
+
+        """
+        Serialises the table, one fixed-size row per signature, the rows
+        being sorted and compressed.
+
+        :return: The serialised table.
+        :rtype: bytes
+        """
+
+        rows = sorted(self._samples.items())
+        buffer = bytearray()
+        for signature, (mean, count) in rows:
+            buffer += _ROW.pack(*signature, mean, count)
+
+        return _HEADER.pack(TABLE_MAGIC, len(rows)) + zlib.compress(buffer, 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> ExpectedTricksTable:
+
+        """
+        Deserialises a table built by `to_bytes`.
+
+        :param data: The serialised table.
+        :type data: bytes
+
+        :return: The table.
+        :rtype: ExpectedTricksTable
+
+        :raises ValueError: If the data isn't a serialised table.
+        """
+
+        if len(data) < _HEADER.size:
+            raise ValueError("`data` is too short to hold a table")
+        magic, n_rows = _HEADER.unpack_from(data)
+        if magic != TABLE_MAGIC:
+            raise ValueError("`data` doesn't start with the table magic")
+        try:
+            rows = zlib.decompress(data[_HEADER.size:])
+        except zlib.error as error:
+            raise ValueError("`data` rows can't be decompressed") from error
+        if len(rows) != n_rows * _ROW.size:
+            raise ValueError("`data` doesn't match its number of rows")
+
+        samples = dict()
+        for *signature, mean, count in _ROW.iter_unpack(rows):
+            samples[tuple(signature)] = (mean, count)
+
+        return cls(samples)
+
+    def save(self, path: str):
+
+        """
+        Writes the table to a file.
+
+        :param path: The path of the file.
+        :type path: str
+        """
+
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> ExpectedTricksTable:
+
+        """
+        Reads a table written by `save`.
+
+        :param path: The path of the file.
+        :type path: str
+
+        :return: The table.
+        :rtype: ExpectedTricksTable
+        """
+
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+    def __len__(self) -> int:
+
+        return len(self._samples)
+
+
+@lru_cache(maxsize=None)
+def load_default_table() -> ExpectedTricksTable:
+
+    """
+    Reads the table shipped with the package, once per process.
+
+    :return: The table.
+    :rtype: ExpectedTricksTable
+    """
+
+    return ExpectedTricksTable.load(DEFAULT_TABLE_PATH)
+
+
+def _play_out(
+    hands: List[int], trump_suit: int, winner_leads: bool,
+    rng: random.Random
+) -> List[int]:
+
+    """
+    Plays a round at random, seat 0 leading the first trick.
+
+    :param hands: The bitmask of the hand of each seat, emptied in place.
+    :type hands: List[int]
+    :param trump_suit: The index of the trump suit.
+    :type trump_suit: int
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if seat 0 leads every trick.
+    :type winner_leads: bool
+    :param rng: The random number generator.
+    :type rng: random.Random
+
+    :return: The number of tricks won by each seat.
+    :rtype: List[int]
+    """
+
+    n_seats = len(hands)
+    offsets = [beats_offset(suit, trump_suit) for suit in range(N_SUITS)]
+    rand = rng.random
+    wins = [0] * n_seats
+    leader = 0
+    while hands[leader]:
+
+        lead_suit = best = position = offset = 0
+        for turn in range(n_seats):
+
+            player = (leader + turn) % n_seats
+            moves = hand = hands[player]
+            if turn:
+                moves = hand & SUIT_MASKS[lead_suit] or hand
+
+            if moves & (moves - 1):
+                draw = int(rand() * bin(moves).count('1'))
+                while draw:
+                    moves &= moves - 1
+                    draw -= 1
+            index = (moves & -moves).bit_length() - 1
+
+            hands[player] = hand ^ (1 << index)
+            if not turn:
+                lead_suit = index // N_VALUES
+                offset = offsets[lead_suit]
+                best = index
+            elif BEATS[offset + index * N_CARDS + best]:
+                best, position = index, turn
+
+        winner = (leader + position) % n_seats
+        wins[winner] += 1
+        if winner_leads:
+            leader = winner
+
+    return wins
+
+
+def _indices_to_mask(indices: Iterable[int]) -> int:
+
+    """
+    Builds the bitmask of a set of card indices.
+
+    :param indices: The indices of the cards.
+    :type indices: Iterable[int]
+
+    :return: The bitmask of the cards.
+    :rtype: int
+    """
+
+    mask = 0
+    for index in indices:
+        mask |= 1 << index
+
+    return mask
+
+
+def simulate_expected_tricks(
+    n_players_range: Iterable[int], n_deals: int,
+    seed: Optional[int] = None, winner_leads: bool = False
+) -> ExpectedTricksTable:
+
+    """
+    Builds a table by playing random deals at random, for every number of
+    players and every number of cards of a game (see `GameEngine.play_game`).
+
+    :param n_players_range: The numbers of players.
+    :type n_players_range: Iterable[int]
+    :param n_deals: The number of deals of each number of players and of
+                    cards.
+    :type n_deals: int
+    :param seed: Seed for the random number generator.
+    :type seed: Optional[int]
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the round leads every trick,
+                         like in `GameEngine`.
+    :type winner_leads: bool
+
+    :return: The table.
+    :rtype: ExpectedTricksTable
+
+    :raises ValueError: If a number of players is smaller than 2 or greater
+                        than 51, or if `n_deals` is smaller than 1.
+    """
+
+    if n_deals < 1:
+        raise ValueError("`n_deals` should be greater than 0")
+
+    rng = random.Random(seed)
+    deck = list(range(N_CARDS))
+    totals: Dict[Signature, List[int]] = dict()
+    for n_players in n_players_range:
+
+        if not 2 <= n_players <= 51:
+            raise ValueError("`n_players` should be between 2 and 51")
+
+        for n_cards in range(1, 51 // n_players + 1):
+            for _ in range(n_deals):
+
+                rng.shuffle(deck)
+                hands = [
+                    _indices_to_mask(deck[start:start + n_cards])
+                    for start in range(0, n_players * n_cards, n_cards)
+                ]
+                trump_suit = card_suit(deck[n_players * n_cards])
+                signatures = [
+                    hand_signature(hand, trump_suit, seat, n_players)
+                    for seat, hand in enumerate(hands)
+                ]
+                wins = _play_out(hands, trump_suit, winner_leads, rng)
+                for signature, n_wins in zip(signatures, wins):
+                    total = totals.setdefault(signature, [0, 0])
+                    total[0] += n_wins
+                    total[1] += 1
+
+    return ExpectedTricksTable({
+        signature: (n_wins / count, count)
+        for signature, (n_wins, count) in totals.items()
+    })
+
+
+class HandStrengthBidSelectionStrategy(AbstractBidSelectionStrategy):
+
+    """
+    Strategy bidding the number of tricks the hand is expected to win, looked
+    up in an `ExpectedTricksTable`.
+
+    The strategy needs the current round, so the player has to be notified
+    of the game state (see `AbstractPlayer.notified_events`). The number of
+    players is read from the previous round when it isn't given.
+
+    :param table: The table of expected tricks, None for the table shipped
+                  with the package, loaded on the first bid.
+    :type table: Optional[ExpectedTricksTable]
+    :param n_players: The number of players, None to read it from the
+                      previous round.
+    :type n_players: Optional[int]
+
+    :Example:
+        >>> player = Player(
+        ...     1, RandomCardSelectionStrategy(),
+        ...     HandStrengthBidSelectionStrategy(n_players=4)
+        ... )
+    """
+
+    def __init__(
+        self, table: Optional[ExpectedTricksTable] = None,
+        n_players: Optional[int] = None
+    ):
+
+        self._table = table
+        self._n_players = n_players
+
+    def select_bid(
+        self, hand: List[Card], authorised_bids: List[int],
+        game_state: GameState
+    ) -> Optional[int]:
+
+        """
+        Selects the authorised bid closest to the expected number of tricks,
+        the lowest one on a tie.
+
+        :param hand: The current hand of the player.
+        :type hand: List[Card]
+        :param authorised_bids: Bids that are allowed to be played based on
+                                the game rules.
+        :type authorised_bids: List[int]
+        :param game_state: The current state of the game.
+        :type game_state: GameState
+        :return: The selected bid or None if no bid can be selected.
+        :rtype: Optional[int]
+
+        :raises ValueError: If there is no current round, or if the number of
+                            players isn't given and there is no previous
+                            round.
+        """
+
+        if len(authorised_bids) < 2:
+            return authorised_bids[0] if authorised_bids else None
+
+        game_round = game_state.current_round
+        if game_round is None:
+            raise ValueError("`game_state` should have a current round")
+
+        n_players = self._n_players
+        if n_players is None:
+            if not game_state.rounds:
+                raise ValueError(
+                    "`n_players` should be given for the first round"
+                )
+            n_players = len(game_state.rounds[-1].bid_by_player_id)
+
+        if self._table is None:
+            self._table = load_default_table()
+
+        expected = self._table.expected_tricks(hand_signature(
+            cards_to_mask(hand), card_suit(card_to_index(
+                game_round.trump_card
+            )), len(game_round.bid_by_player_id), n_players
+        ))
+
+        return min(authorised_bids, key=lambda bid: (abs(bid - expected), bid))
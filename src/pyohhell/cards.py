@@ -0,0 +1,485 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Compact integer representation of the cards used on the engine hot path.
+
+Each card of the 52 cards deck is encoded as an integer between 0 and 51:
+``suit * 13 + rank`` where ``suit`` is the value of the `Suit` enum and
+``rank`` goes from 0 (two) to 12 (ace). A set of cards, like a hand, is then
+stored as a 64-bit bitmask where bit ``i`` is set when card ``i`` is in the
+set.
+
+`Card` objects are only used at the edges of the engine (players, strategies,
+public API). The 52 canonical `Card` objects of `CARDS` are the ones dealt by
+the engine, which makes their conversion to an index a single dictionary
+lookup.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pydecklib.card import Card, Suit, Value
+
+
+# `Card` equality only tells suits apart when the suits are ordered. The
+# engine itself never compares `Card` objects, this is set once at import so
+# that it never has to be touched at runtime.
+Card.suit_ordered = True
+
+N_SUITS = 4
+N_VALUES = 13
+N_CARDS = N_SUITS * N_VALUES
+
+SUITS = tuple(sorted(Suit, key=lambda suit: suit.value))
+VALUES = (
+    Value.TWO, Value.THREE, Value.FOUR, Value.FIVE, Value.SIX, Value.SEVEN,
+    Value.EIGHT, Value.NINE, Value.TEN, Value.JACK, Value.QUEEN, Value.KING,
+    Value.ACE
+)
+
+CARDS = tuple(Card(suit, value) for suit in SUITS for value in VALUES)
+
+SUIT_MASKS = tuple(
+    ((1 << N_VALUES) - 1) << (suit * N_VALUES) for suit in range(N_SUITS)
+)
+FULL_MASK = (1 << N_CARDS) - 1
+
+_SUIT_OFFSETS = {suit: suit.value * N_VALUES for suit in SUITS}
+_VALUE_RANKS = {value: rank for rank, value in enumerate(VALUES)}
+_INDEX_BY_CARD_ID = {id(card): index for index, card in enumerate(CARDS)}
+
+
+def card_to_index(card: Card) -> int:
+
+    """
+    Encodes a card as an integer between 0 and 51.
+
+    :param card: The card to encode.
+    :type card: Card
+
+    :return: The index of the card.
+    :rtype: int
+
+    :Example:
+        >>> card_to_index(Card(Suit.HEARTS, Value.FOUR))
+        15
+    """
+
+    index = _INDEX_BY_CARD_ID.get(id(card))
+    if index is None or CARDS[index] is not card:
+        index = _SUIT_OFFSETS[card.suit] + _VALUE_RANKS[card.value]
+
+    return index
+
+
+def index_to_card(index: int) -> Card:
+
+    """
+    Decodes an index into its canonical card.
+
+    :param index: The index of the card, between 0 and 51.
+    :type index: int
+
+    :return: The canonical card of the index.
+    :rtype: Card
+    """
+
+    return CARDS[index]
+
+
+def suit_index(suit: Suit) -> int:
+
+    """
+    Encodes a suit as an integer between 0 and 3.
+
+    :param suit: The suit to encode.
+    :type suit: Suit
+
+    :return: The index of the suit.
+    :rtype: int
+    """
+
+    return _SUIT_OFFSETS[suit] // N_VALUES
+
+
+def card_suit(index: int) -> int:
+
+    """
+    The suit index of a card index.
+
+    :param index: The index of the card.
+    :type index: int
+
+    :return: The index of the suit of the card.
+    :rtype: int
+    """
+
+    return index // N_VALUES
+
+
+def card_rank(index: int) -> int:
+
+    """
+    The rank of a card index within its suit, from 0 (two) to 12 (ace).
+
+    :param index: The index of the card.
+    :type index: int
+
+    :return: The rank of the card.
+    :rtype: int
+    """
+
+    return index % N_VALUES
+
+
+def cards_to_mask(cards: Iterable[Card]) -> int:
+
+    """
+    Encodes a collection of cards as a bitmask.
+
+    :param cards: The cards to encode.
+    :type cards: Iterable[Card]
+
+    :return: The bitmask of the cards.
+    :rtype: int
+
+    :Example:
+        >>> cards_to_mask([
+        ...     Card(Suit.SPADES, Value.TWO), Card(Suit.SPADES, Value.FOUR)
+        ... ])
+        5
+    """
+
+    mask = 0
+    for card in cards:
+        mask |= 1 << card_to_index(card)
+
+    return mask
+
+
+def mask_to_indices(mask: int) -> List[int]:
+
+    """
+    Decodes a bitmask into the sorted list of its card indices.
+
+    :param mask: The bitmask to decode.
+    :type mask: int
+
+    :return: The card indices of the bitmask, in increasing order.
+    :rtype: List[int]
+    """
+
+    indices = list()
+    while mask:
+        lowest_bit = mask & -mask
+        indices.append(lowest_bit.bit_length() - 1)
+        mask ^= lowest_bit
+
+    return indices
+
+
+def mask_to_cards(mask: int) -> List[Card]:
+
+    """
+    Decodes a bitmask into the list of its canonical cards.
+
+    :param mask: The bitmask to decode.
+    :type mask: int
+
+    :return: The cards of the bitmask, sorted by index.
+    :rtype: List[Card]
+    """
+
+    return [CARDS[index] for index in mask_to_indices(mask)]
+
+
+class Hand:
+
+    """
+    The cards held by a player, in the order they were added, bucketed by
+    suit and mirrored by a bitmask: the authorised cards are found, a card is
+    looked up and removed without scanning the hand.
+
+    :param cards: The cards of the hand.
+    :type cards: Iterable[Card]
+
+    :raises ValueError: If a card is given twice.
+
+    :Example:
+        >>> hand = Hand([
+        ...     Card(Suit.HEARTS, Value.ACE), Card(Suit.SPADES, Value.KING),
+        ...     Card(Suit.HEARTS, Value.TEN)
+        ... ])
+        >>> hand.authorised_cards(Suit.HEARTS)
+        [Card(Suit.HEARTS, Value.ACE), Card(Suit.HEARTS, Value.TEN)]
+    """
+
+    __slots__ = ('_cards', '_suits', '_mask', '_list')
+
+    def __init__(self, cards: Iterable[Card] = ()):
+
+        # the cards by index, all of them and by suit, in insertion order
+        self._cards: Dict[int, Card] = dict()
+        self._suits = tuple(dict() for _ in range(N_SUITS))
+        self._mask = 0
+        self._list: Optional[List[Card]] = None
+
+        for card in cards:
+            self.add(card)
+
+    @property
+    def mask(self) -> int:
+
+        """
+        The bitmask of the cards of the hand.
+
+        :return: The bitmask of the hand.
+        :rtype: int
+        """
+
+        return self._mask
+
+    @property
+    def cards(self) -> List[Card]:
+
+        """
+        The cards of the hand, in the order they were added. The list is
+        built again only after the hand changes, and shouldn't be modified.
+
+        :return: The cards of the hand.
+        :rtype: List[Card]
+        """
+
+        if self._list is None:
+            self._list = list(self._cards.values())
+
+        return self._list
+
+    def add(self, card: Card):
+
+        """
+        Adds a card to the hand.
+
+        :param card: The card to add.
+        :type card: Card
+
+        :raises ValueError: If the card is already in the hand.
+        """
+
+        index = card_to_index(card)
+        if self._mask >> index & 1:
+            raise ValueError("`card` is already in the hand")
+
+        self._cards[index] = card
+        self._suits[index // N_VALUES][index] = card
+        self._mask |= 1 << index
+        self._list = None
+
+    def remove(self, card: Card):
+
+        """
+        Removes a card from the hand.
+
+        :param card: The card to remove.
+        :type card: Card
+
+        :raises ValueError: If the card isn't in the hand.
+        """
+
+        index = card_to_index(card)
+        if not self._mask >> index & 1:
+            raise ValueError("`card` isn't in the hand")
+
+        del self._cards[index]
+        del self._suits[index // N_VALUES][index]
+        self._mask ^= 1 << index
+        self._list = None
+
+    def authorised_cards(self, trick_suit: Optional[Suit]) -> List[Card]:
+
+        """
+        The cards of the hand allowed in a trick: the cards of the suit of
+        the trick if the hand has some, every card otherwise (see
+        `game_engine.get_authorised_cards`).
+
+        :param trick_suit: The suit of the current trick.
+        :type trick_suit: Optional[Suit]
+
+        :return: The authorised cards, in the order they were added.
+        :rtype: List[Card]
+        """
+
+        if trick_suit is not None:
+            suit_cards = self._suits[_SUIT_OFFSETS[trick_suit] // N_VALUES]
+            if suit_cards:
+                return list(suit_cards.values())
+
+        return self.cards
+
+    def authorised_mask(self, trick_suit: Optional[Suit]) -> int:
+
+        """
+        Bitmask counterpart of `authorised_cards`.
+
+        :param trick_suit: The suit of the current trick.
+        :type trick_suit: Optional[Suit]
+
+        :return: The bitmask of the authorised cards.
+        :rtype: int
+        """
+
+        if trick_suit is not None:
+            suit_mask = self._mask & SUIT_MASKS[
+                _SUIT_OFFSETS[trick_suit] // N_VALUES
+            ]
+            if suit_mask:
+                return suit_mask
+
+        return self._mask
+
+    def __contains__(self, card: Card) -> bool:
+
+        return bool(self._mask >> card_to_index(card) & 1)
+
+    def __iter__(self) -> Iterator[Card]:
+
+        return iter(self.cards)
+
+    def __len__(self) -> int:
+
+        return len(self._cards)
+
+
+def count_cards(mask: int) -> int:
+
+    """
+    Counts the cards of a bitmask.
+
+    :param mask: The bitmask.
+    :type mask: int
+
+    :return: The number of cards in the bitmask.
+    :rtype: int
+    """
+
+    return bin(mask).count('1')
+
+
+def _build_beats_table() -> bytes:
+
+    """
+    Builds the table telling whether a card beats another one in a trick.
+
+    Within a trick, trump cards beat every other card, cards of the lead suit
+    beat the cards of the other suits and cards of the same suit are compared
+    on their rank. The cards of the other suits never win a trick, so they
+    don't beat any card.
+
+    :return: The flattened table, indexed by `beats_offset` plus
+             ``card * N_CARDS + other_card``.
+    :rtype: bytes
+    """
+
+    table = bytearray(N_SUITS * N_SUITS * N_CARDS * N_CARDS)
+    for lead_suit in range(N_SUITS):
+        for trump_suit in range(N_SUITS):
+
+            keys = list()
+            for index in range(N_CARDS):
+                suit, rank = divmod(index, N_VALUES)
+                if suit == trump_suit:
+                    keys.append(rank + 2 * N_VALUES)
+                elif suit == lead_suit:
+                    keys.append(rank + N_VALUES)
+                else:
+                    keys.append(-1)
+
+            offset = beats_offset(lead_suit, trump_suit)
+            for index, key in enumerate(keys):
+                row = offset + index * N_CARDS
+                for other_index, other_key in enumerate(keys):
+                    table[row + other_index] = key > other_key
+
+    return bytes(table)
+
+
+def beats_offset(lead_suit: int, trump_suit: int) -> int:
+
+    """
+    The offset of the (lead suit, trump suit) block in `BEATS`.
+
+    :param lead_suit: The index of the lead suit of the trick.
+    :type lead_suit: int
+    :param trump_suit: The index of the trump suit of the round.
+    :type trump_suit: int
+
+    :return: The offset of the block.
+    :rtype: int
+    """
+
+    return (lead_suit * N_SUITS + trump_suit) * N_CARDS * N_CARDS
+
+
+def beats(
+    lead_suit: int, trump_suit: int, index: int, other_index: int
+) -> bool:
+
+    """
+    Tells whether a card beats another one in a trick.
+
+    :param lead_suit: The index of the lead suit of the trick.
+    :type lead_suit: int
+    :param trump_suit: The index of the trump suit of the round.
+    :type trump_suit: int
+    :param index: The index of the card.
+    :type index: int
+    :param other_index: The index of the other card.
+    :type other_index: int
+
+    :return: True if the card beats the other card.
+    :rtype: bool
+
+    :Example:
+        >>> # three of spades against ace of hearts, hearts lead, spades trump
+        >>> beats(1, 0, 1, 25)
+        True
+    """
+
+    return bool(
+        BEATS[
+            beats_offset(lead_suit, trump_suit) + index * N_CARDS + other_index
+        ]
+    )
+
+
+def trick_winner_position(card_indices: List[int], trump_suit: int) -> int:
+
+    """
+    Finds the position of the winning card of a trick in a single pass over
+    the played cards.
+
+    :param card_indices: The indices of the cards of the trick, in the order
+                         they were played.
+    :type card_indices: List[int]
+    :param trump_suit: The index of the trump suit of the round.
+    :type trump_suit: int
+
+    :return: The position of the winning card in `card_indices`.
+    :rtype: int
+    """
+
+    best_index = card_indices[0]
+    offset = beats_offset(best_index // N_VALUES, trump_suit)
+    best_position = 0
+    for position in range(1, len(card_indices)):
+        index = card_indices[position]
+        if BEATS[offset + index * N_CARDS + best_index]:
+            best_index = index
+            best_position = position
+
+    return best_position
+
+
+BEATS = _build_beats_table()
@@ -0,0 +1,299 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union
+)
+import logging
+
+from pydecklib.card import Card
+
+
+class GameStarted(NamedTuple):
+
+    """
+    A game is about to be played.
+
+    :param seed: The seed of the game, None for an unseeded game.
+    :param player_ids: The identifiers of the players, in seat order.
+    """
+
+    seed: Optional[int]
+    player_ids: Tuple[int, ...]
+
+
+class RoundStarted(NamedTuple):
+
+    """
+    A round has been dealt.
+
+    :param round_id: The identifier of the round.
+    :param n_cards: The number of cards dealt to each player.
+    :param trump_card: The card defining the trump suit of the round.
+    """
+
+    round_id: int
+    n_cards: int
+    trump_card: Card
+
+
+class BidMade(NamedTuple):
+
+    """
+    A player has made its bid.
+
+    :param round_id: The identifier of the round.
+    :param player_id: The identifier of the player.
+    :param bid: The bid of the player.
+    """
+
+    round_id: int
+    player_id: int
+    bid: int
+
+
+class CardPlayed(NamedTuple):
+
+    """
+    A player has played a card in a trick.
+
+    :param round_id: The identifier of the round.
+    :param trick_id: The identifier of the trick.
+    :param player_id: The identifier of the player.
+    :param card: The card played.
+    """
+
+    round_id: int
+    trick_id: int
+    player_id: int
+    card: Card
+
+
+class TrickWon(NamedTuple):
+
+    """
+    A trick is complete and has been won by a player.
+
+    :param round_id: The identifier of the round.
+    :param trick_id: The identifier of the trick.
+    :param player_id: The identifier of the winner of the trick.
+    :param card: The winning card.
+    """
+
+    round_id: int
+    trick_id: int
+    player_id: int
+    card: Card
+
+
+class RoundScored(NamedTuple):
+
+    """
+    A round is over and its points have been attributed.
+
+    :param round_id: The identifier of the round.
+    :param points_by_player_id: The points scored by each player in the round.
+    """
+
+    round_id: int
+    points_by_player_id: Dict[int, int]
+
+
+class GameScored(NamedTuple):
+
+    """
+    A game is over.
+
+    :param points_by_player_id: The points scored by each player in the game.
+    """
+
+    points_by_player_id: Dict[int, int]
+
+
+Event = Union[
+    GameStarted, RoundStarted, BidMade, CardPlayed, TrickWon, RoundScored,
+    GameScored
+]
+EventSink = Callable[[Event], None]
+
+EVENT_TYPES = (
+    GameStarted, RoundStarted, BidMade, CardPlayed, TrickWon, RoundScored,
+    GameScored
+)
+
+
+class EventStream:
+
+    """
+    Dispatches the events of a game to the attached sinks.
+
+    A sink can be attached for a subset of the event types only. The emitter
+    can ask whether an event type has any sink, and skip building the events
+    nobody listens to:
+
+    >>> if event_stream.wants(BidMade):
+    ...     event_stream.emit(BidMade(round_id, player_id, bid))
+
+    :Example:
+        >>> event_stream = EventStream()
+        >>> sink = RecordingSink()
+        >>> event_stream.attach(sink)
+        >>> event_stream.emit(BidMade(0, 1, 0))
+        >>> sink.events
+        [BidMade(round_id=0, player_id=1, bid=0)]
+        >>> event_stream.detach(sink)
+    """
+
+    def __init__(self):
+
+        self._sinks: List[Tuple[EventSink, Tuple[Type[Event], ...]]] = list()
+        self._sinks_by_event_type: Dict[Type[Event], List[EventSink]] = {
+            event_type: list() for event_type in EVENT_TYPES
+        }
+
+    @property
+    def sinks(self) -> List[EventSink]:
+
+        """
+        The sinks attached to the stream.
+
+        :return: The attached sinks, in attachment order.
+        :rtype: List[EventSink]
+        """
+
+        return [sink for sink, _ in self._sinks]
+
+    def attach(
+        self, sink: EventSink,
+        event_types: Optional[Iterable[Type[Event]]] = None
+    ):
+
+        """
+        Attaches a sink to the stream.
+
+        :param sink: A callable taking an event.
+        :type sink: EventSink
+        :param event_types: The types of the events sent to the sink, None for
+                            every type.
+        :type event_types: Optional[Iterable[Type[Event]]]
+
+        :raises ValueError: If one of the event types is unknown.
+        """
+
+        event_types = EVENT_TYPES if event_types is None \
+            else tuple(event_types)
+        if not set(event_types).issubset(EVENT_TYPES):
+            raise ValueError("`event_types` should only contain event types")
+
+        self._sinks.append((sink, event_types))
+        self._dispatch()
+
+    def detach(self, sink: EventSink):
+
+        """
+        Detaches a sink from the stream.
+
+        :param sink: A sink attached to the stream.
+        :type sink: EventSink
+
+        :raises ValueError: If the sink isn't attached to the stream.
+        """
+
+        if sink not in self.sinks:
+            raise ValueError("`sink` isn't attached to the stream")
+
+        self._sinks = [(s, types) for s, types in self._sinks if s != sink]
+        self._dispatch()
+
+    def _dispatch(self):
+
+        """
+        Rebuilds the sinks of each event type from the attached sinks.
+        """
+
+        self._sinks_by_event_type = {
+            event_type: [
+                sink for sink, event_types in self._sinks
+                if event_type in event_types
+            ]
+            for event_type in EVENT_TYPES
+        }
+
+    def wants(self, event_type: Type[Event]) -> bool:
+
+        """
+        Tells whether at least one sink is attached for an event type.
+
+        :param event_type: The type of event.
+        :type event_type: Type[Event]
+
+        :return: True if the events of this type have a sink.
+        :rtype: bool
+        """
+
+        return bool(self._sinks_by_event_type[event_type])
+
+    def emit(self, event: Event):
+
+        """
+        Sends an event to the sinks attached for its type.
+
+        :param event: The event to send.
+        :type event: Event
+        """
+
+        for sink in self._sinks_by_event_type[type(event)]:
+            sink(event)
+
+    def __bool__(self) -> bool:
+
+        return bool(self._sinks)
+
+
+class RecordingSink:
+
+    """
+    Sink keeping every event it receives, e.g. to trace a game.
+    """
+
+    def __init__(self):
+
+        self.events: List[Event] = list()
+
+    def __call__(self, event: Event):
+
+        self.events.append(event)
+
+
+class LoggingSink:
+
+    """
+    Sink writing every event it receives to a logger.
+
+    :param logger: The logger to write to, the root logger if None.
+    :type logger: Optional[logging.Logger]
+    :param level: The level of the log records.
+    :type level: int
+    """
+
+    def __init__(
+        self, logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO
+    ):
+
+        self._logger = logger if logger is not None else logging.getLogger()
+        self._level = level
+
+    def __call__(self, event: Event):
+
+        self._logger.log(self._level, "%r", event)
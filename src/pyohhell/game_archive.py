@@ -0,0 +1,419 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Append-only archive of game records, with a memory-mapped index.
+
+An archive is made of two files: the data file, holding the records of the
+games one after the other (see `game_record`), and the index file (the data
+file path suffixed with `.idx`), holding one fixed-size entry per game. The
+identifier of a game is the position of its entry in the index.
+
+An index entry holds the offset and the length of the record, the seed of the
+game and a 64-bit mask of its players. Both files are memory-mapped: nothing
+is loaded or parsed when an archive is opened.
+
+The lookups by seed and by player go through in-memory posting lists built
+from the index on the first lookup and kept up to date by the appends: the
+games of each seed, and the games of each bit of the players masks. A
+lookup by player then only reads the records of the games sharing the bit of
+the player, to tell it apart from the other players with this bit.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import mmap
+import os
+import struct
+
+from src.pyohhell.game_record import read_record_header
+
+
+# offset, length, flags, seed and players mask of a record
+_INDEX_ENTRY = struct.Struct('<QIIqQ')
+_SEEDED = 1
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _players_mask(player_ids: Tuple[int, ...]) -> int:
+
+    """
+    Computes the mask of a set of players, with one bit per player id modulo
+    64. A game whose mask misses the bit of a player can't involve it.
+
+    :param player_ids: The identifiers of the players.
+    :type player_ids: Tuple[int, ...]
+
+    :return: The 64-bit mask of the players.
+    :rtype: int
+    """
+
+    mask = 0
+    for player_id in player_ids:
+        mask |= 1 << (player_id % 64)
+
+    return mask
+
+
+def _mask_bits(mask: int) -> Iterator[int]:
+
+    """
+    Iterates over the bits set in a mask.
+
+    :param mask: The mask.
+    :type mask: int
+
+    :return: An iterator over the positions of the bits set, in increasing
+             order.
+    :rtype: Iterator[int]
+    """
+
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+class GameArchive:
+
+    """
+    Append-only archive of game records.
+
+    :param path: The path of the data file, the index file path is suffixed
+                 with `.idx`.
+    :type path: str
+    :param mode: 'r' to read an existing archive, 'a' to append to an
+                 archive, created if it doesn't exist.
+    :type mode: str
+
+    :raises ValueError: If the mode is unknown.
+
+    :Example:
+        >>> with GameArchive('games.ohr', 'a') as archive:
+        ...     game_engine.events.attach(
+        ...         GameRecorder(archive.append), RECORDED_EVENT_TYPES
+        ...     )
+        ...     for seed in range(1000):
+        ...         game_engine.play_game(seed)
+        >>> with GameArchive('games.ohr') as archive:
+        ...     game_ids = [
+        ...         game_id for game_id, record in archive.scan(player_id=3)
+        ...         if any(
+        ...             game_round.round_id == 10 and
+        ...             game_round.bid_by_player_id[3] == 0
+        ...             for game_round in iter_record_rounds(record)
+        ...         )
+        ...     ]
+    """
+
+    def __init__(self, path: str, mode: str = 'r'):
+
+        if mode not in ('r', 'a'):
+            raise ValueError("`mode` should be 'r' or 'a'")
+
+        self._path = path
+        self._index_path = path + '.idx'
+        self._mode = mode
+
+        self._data_file = None
+        self._index_file = None
+        if mode == 'a':
+            self._data_file = open(self._path, 'ab')
+            self._index_file = open(self._index_path, 'ab')
+            index_size = self._index_file.seek(0, os.SEEK_END)
+        else:
+            index_size = os.path.getsize(self._index_path)
+
+        # an entry partially written by an interrupted append is ignored
+        self._n_games = index_size // _INDEX_ENTRY.size
+        if mode == 'a':
+            self._data_size = self._truncate_interrupted_append()
+        else:
+            self._data_size = os.path.getsize(self._path)
+
+        self._data_map: Optional[mmap.mmap] = None
+        self._index_map: Optional[mmap.mmap] = None
+
+        # posting lists, built on the first lookup
+        self._game_ids_by_seed: Optional[Dict[int, List[int]]] = None
+        self._game_ids_by_player_bit: Optional[List[List[int]]] = None
+
+    def _truncate_interrupted_append(self) -> int:
+
+        """
+        Drops what an interrupted append left after the last complete game,
+        a partial index entry or an orphaned record, so that the next games
+        are appended right after it.
+
+        :return: The size of the data file.
+        :rtype: int
+        """
+
+        data_size = 0
+        if self._n_games:
+            with open(self._index_path, 'rb') as index_file:
+                index_file.seek((self._n_games - 1) * _INDEX_ENTRY.size)
+                offset, length, *_ = _INDEX_ENTRY.unpack(
+                    index_file.read(_INDEX_ENTRY.size)
+                )
+            data_size = offset + length
+
+        self._index_file.truncate(self._n_games * _INDEX_ENTRY.size)
+        self._data_file.truncate(data_size)
+
+        return data_size
+
+    def __len__(self) -> int:
+
+        return self._n_games
+
+    def append(self, record: bytes) -> int:
+
+        """
+        Appends the record of a game to the archive.
+
+        :param record: The game record.
+        :type record: bytes
+
+        :return: The identifier of the game in the archive.
+        :rtype: int
+
+        :raises ValueError: If the archive isn't opened for appending, if the
+                            data isn't a game record or if the seed of the
+                            game doesn't fit in 64 bits.
+        """
+
+        if self._mode != 'a':
+            raise ValueError("the archive isn't opened for appending")
+
+        seed, player_ids, _ = read_record_header(record)
+        if seed is not None and not _INT64_MIN <= seed <= _INT64_MAX:
+            raise ValueError("the seed of `record` should fit in 64 bits")
+
+        self._data_file.write(record)
+        self._index_file.write(_INDEX_ENTRY.pack(
+            self._data_size, len(record),
+            0 if seed is None else _SEEDED,
+            0 if seed is None else seed,
+            _players_mask(player_ids)
+        ))
+        self._data_size += len(record)
+        self._n_games += 1
+
+        game_id = self._n_games - 1
+        if self._game_ids_by_seed is not None and seed is not None:
+            self._game_ids_by_seed.setdefault(seed, []).append(game_id)
+        if self._game_ids_by_player_bit is not None:
+            for bit in _mask_bits(_players_mask(player_ids)):
+                self._game_ids_by_player_bit[bit].append(game_id)
+
+        # the maps no longer cover the whole files
+        self._unmap()
+
+        return self._n_games - 1
+
+    def flush(self):
+
+        """
+        Writes the appended games to the files.
+        """
+
+        if self._mode == 'a':
+            self._data_file.flush()
+            self._index_file.flush()
+
+    def _map(self) -> Tuple[mmap.mmap, mmap.mmap]:
+
+        """
+        Maps the data and the index files in memory, if they aren't yet.
+
+        :return: The maps of the data and the index files.
+        :rtype: Tuple[mmap.mmap, mmap.mmap]
+        """
+
+        if self._index_map is None:
+            self.flush()
+            with open(self._path, 'rb') as data_file:
+                self._data_map = mmap.mmap(
+                    data_file.fileno(), self._data_size,
+                    access=mmap.ACCESS_READ
+                )
+            with open(self._index_path, 'rb') as index_file:
+                self._index_map = mmap.mmap(
+                    index_file.fileno(), self._n_games * _INDEX_ENTRY.size,
+                    access=mmap.ACCESS_READ
+                )
+
+        return self._data_map, self._index_map
+
+    def _unmap(self):
+
+        """
+        Closes the maps of the data and the index files, if they are open.
+        """
+
+        if self._index_map is not None:
+            self._data_map.close()
+            self._index_map.close()
+        self._data_map = None
+        self._index_map = None
+
+    def _build_posting_lists(self):
+
+        """
+        Builds the posting lists from the index, if they aren't yet.
+        """
+
+        if self._game_ids_by_seed is not None:
+            return
+
+        game_ids_by_seed: Dict[int, List[int]] = dict()
+        game_ids_by_player_bit: List[List[int]] = [[] for _ in range(64)]
+        if self._n_games:
+            _, index_map = self._map()
+            entries = _INDEX_ENTRY.iter_unpack(index_map)
+            for game_id, (_, _, flags, seed, players_mask) in \
+                    enumerate(entries):
+                if flags & _SEEDED:
+                    game_ids_by_seed.setdefault(seed, []).append(game_id)
+                for bit in _mask_bits(players_mask):
+                    game_ids_by_player_bit[bit].append(game_id)
+
+        self._game_ids_by_seed = game_ids_by_seed
+        self._game_ids_by_player_bit = game_ids_by_player_bit
+
+    def __getitem__(self, game_id: int) -> bytes:
+
+        """
+        Reads the record of a game.
+
+        :param game_id: The identifier of the game.
+        :type game_id: int
+
+        :return: The game record.
+        :rtype: bytes
+
+        :raises IndexError: If the archive has no such game.
+        """
+
+        if not 0 <= game_id < self._n_games:
+            raise IndexError("`game_id` out of range")
+
+        data_map, index_map = self._map()
+        offset, length, _, _, _ = _INDEX_ENTRY.unpack_from(
+            index_map, game_id * _INDEX_ENTRY.size
+        )
+
+        return data_map[offset:offset + length]
+
+    def scan(
+        self, seed: Optional[int] = None, player_id: Optional[int] = None
+    ) -> Iterator[Tuple[int, bytes]]:
+
+        """
+        Iterates over the games of the archive, optionally filtered on their
+        seed and on one of their players. Only the records of the matching
+        games are read.
+
+        :param seed: The seed of the games, None for any seed.
+        :type seed: Optional[int]
+        :param player_id: The identifier of a player of the games, None for
+                          any players.
+        :type player_id: Optional[int]
+
+        :return: An iterator over the identifiers and the records of the
+                 games archived when the scan starts, in the order they
+                 were appended.
+        :rtype: Iterator[Tuple[int, bytes]]
+        """
+
+        game_ids = self._find(seed, player_id)
+        for game_id in game_ids:
+            yield game_id, self[game_id]
+
+    def _find(
+        self, seed: Optional[int], player_id: Optional[int]
+    ) -> List[int]:
+
+        """
+        Finds the games with a seed and a player.
+
+        :param seed: The seed of the games, None for any seed.
+        :type seed: Optional[int]
+        :param player_id: The identifier of a player of the games, None for
+                          any players.
+        :type player_id: Optional[int]
+
+        :return: The identifiers of the games, in increasing order.
+        :rtype: List[int]
+        """
+
+        if seed is None and player_id is None:
+            return list(range(self._n_games))
+
+        self._build_posting_lists()
+        if player_id is None:
+            return list(self._game_ids_by_seed.get(seed, ()))
+
+        game_ids = self._game_ids_by_player_bit[player_id % 64]
+        if seed is not None:
+            seed_game_ids = set(self._game_ids_by_seed.get(seed, ()))
+            game_ids = [
+                game_id for game_id in game_ids if game_id in seed_game_ids
+            ]
+
+        return [
+            game_id for game_id in game_ids
+            if player_id in read_record_header(self[game_id]).player_ids
+        ]
+
+    def find_by_seed(self, seed: int) -> Iterator[int]:
+
+        """
+        Finds the games played with a seed.
+
+        :param seed: The seed of the games.
+        :type seed: int
+
+        :return: An iterator over the identifiers of the games.
+        :rtype: Iterator[int]
+        """
+
+        return iter(self._find(seed, None))
+
+    def find_by_player(self, player_id: int) -> Iterator[int]:
+
+        """
+        Finds the games played by a player.
+
+        :param player_id: The identifier of the player.
+        :type player_id: int
+
+        :return: An iterator over the identifiers of the games.
+        :rtype: Iterator[int]
+        """
+
+        return iter(self._find(None, player_id))
+
+    def close(self):
+
+        """
+        Writes the appended games to the files and closes the archive.
+        """
+
+        self._unmap()
+        if self._mode == 'a':
+            self._data_file.close()
+            self._index_file.close()
+            self._mode = 'r'
+
+    def __enter__(self) -> GameArchive:
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
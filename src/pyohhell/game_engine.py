@@ -3,14 +3,26 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from itertools import cycle
 import logging
+import random
 
 from pydecklib.card import Card, Suit
-from pydecklib.deck import Deck
 
+from src.pyohhell.cards import CARDS, SUIT_MASKS, card_to_index, suit_index
+from src.pyohhell.events import (
+    BidMade,
+    CardPlayed,
+    EventStream,
+    GameScored,
+    GameStarted,
+    RoundScored,
+    RoundStarted,
+    TrickWon
+)
 from src.pyohhell.player import AbstractPlayer
+from src.pyohhell.rng import player_seed, round_seed
 from src.pyohhell.game_state import (
     AbstractPointAttributionStrategy,
     GameState,
@@ -57,6 +69,40 @@ def get_authorised_cards(
     return cards
 
 
+def get_authorised_mask(hand_mask: int, trick_suit: Optional[Suit]) -> int:
+
+    """
+    Bitmask counterpart of `get_authorised_cards`: determines the authorised
+    cards of a hand encoded as a bitmask.
+
+    :param hand_mask: The bitmask of the cards available to the player.
+    :type hand_mask: int
+    :param trick_suit: The suit of the current trick.
+    :type trick_suit: Optional[Suit]
+
+    :return: The bitmask of the authorised cards.
+    :rtype: int
+
+    :Example:
+        >>> hand_mask = cards_to_mask([
+        ...     Card(Suit.HEARTS, Value.ACE),
+        ...     Card(Suit.SPADES, Value.KING),
+        ... ])
+        >>> get_authorised_mask(hand_mask, Suit.HEARTS) == cards_to_mask([
+        ...     Card(Suit.HEARTS, Value.ACE)
+        ... ])
+        True
+    """
+
+    if trick_suit:
+        trick_suit_mask = hand_mask & SUIT_MASKS[suit_index(trick_suit)]
+
+        if trick_suit_mask:
+            return trick_suit_mask
+
+    return hand_mask
+
+
 def get_authorised_bids(
     n_cards: int, total_bid: int, last_player: bool
 ) -> List[int]:
@@ -91,6 +137,14 @@ def get_authorised_bids(
     return authorised_bids
 
 
+# canonical cards in the order used by `Deck.initialise`
+_DECK_CARDS = tuple(
+    CARDS[card_to_index(Card(suit, value))]
+    for suit in Suit
+    for value in Value
+)
+
+
 class GameEngine:
 
     """
@@ -103,6 +157,12 @@ class GameEngine:
     :param point_attribution_strategy: The strategy used for attributing points
                                        to players.
     :type point_attribution_strategy: AbstractPointAttributionStrategy
+    :param resolve_forced_moves: True to play the moves of the players with a
+                                 single authorised card or bid without asking
+                                 them, see `_forced_card`. The strategies
+                                 then draw fewer random numbers, so a seed
+                                 gives other games than with False.
+    :type resolve_forced_moves: bool
 
     :Example:
         >>> game_engine = GameEngine()
@@ -115,22 +175,53 @@ class GameEngine:
     """
 
     def __init__(
-        self, point_attribution_strategy: AbstractPointAttributionStrategy
+        self, point_attribution_strategy: AbstractPointAttributionStrategy,
+        resolve_forced_moves: bool = False
     ):
 
-        Card.suit_ordered = True
-        self._deck = Deck()
+        # the deck is a single buffer of canonical cards, reshuffled in place
+        # at every round
+        self._deck: List[Card] = list(_DECK_CARDS)
+        self._random = random.Random()
         self._players = list()
 
         self._point_attribution_strategy = point_attribution_strategy
 
         self._game_state = GameState()
 
+        self._events = EventStream()
+
+        # the forced moves only notify the players of the game state once
+        # before the next decision or at the end of the trick
+        self._resolve_forced_moves = resolve_forced_moves
+        self._notification_pending = False
+
+    @property
+    def events(self) -> EventStream:
+
+        """
+        The stream of the events of the games played by the engine. Nothing
+        is built for the events while no sink is attached to it.
+
+        :return: The event stream of the engine.
+        :rtype: EventStream
+
+        :Example:
+            >>> game_engine = GameEngine()
+            >>> game_engine.events.attach(LoggingSink())
+        """
+
+        return self._events
+
     def subscribe_player(self, player: AbstractPlayer):
 
         """
         Subscribes a player to the game.
 
+        A player using the delta protocol (see
+        `AbstractPlayer.notified_events`) gets the game state right away and
+        is then only notified of the events it asked for.
+
         :param player: The player to be added to the game.
         :type player: AbstractPlayer
 
@@ -140,8 +231,12 @@ class GameEngine:
             >>> game_engine.subscribe_player(player)
         """
 
+        notified_events = player.notified_events
         self._players.append(player)
-        logging.info(f"Player {player.id} added")
+        if notified_events is not None:
+            player.update_game_state(self._game_state)
+            self._events.attach(player.notify, notified_events)
+        logging.info("Player %s added", player.id)
 
     def unsubscribe_player(self, player: AbstractPlayer):
 
@@ -158,30 +253,116 @@ class GameEngine:
             >>> game_engine.unsubscribe_player(player)
         """
 
+        for p in self._players:
+            if p.id == player.id and p.notified_events is not None:
+                self._events.detach(p.notify)
         self._players = [p for p in self._players if p.id != player.id]
-        logging.info(f"Player {player.id} removed")
+        logging.info("Player %s removed", player.id)
 
     def notify_game_state(self):
 
         """
-        Notifies all subscribed players about the current game state.
+        Notifies the subscribed players about the current game state, except
+        the ones using the delta protocol.
         """
 
+        self._notification_pending = False
         for player in self._players:
-            player.update_game_state(self._game_state)
+            if player.notified_events is None:
+                player.update_game_state(self._game_state)
+
+    def _flush_notifications(self):
+
+        """
+        Notifies the players of the game state if forced moves were played
+        since the last notification.
+        """
+
+        if self._notification_pending:
+            self.notify_game_state()
+
+    def _forced_bid(self, authorised_bids: List[int]) -> Optional[int]:
+
+        """
+        Finds the bid of a player who has a single authorised bid, like the
+        last bidder of a round of one card, when the forced moves are
+        resolved by the engine.
+
+        :param authorised_bids: The bids the player is allowed to make.
+        :type authorised_bids: List[int]
+
+        :return: The forced bid, or None if the player has to decide.
+        :rtype: Optional[int]
+        """
+
+        if self._resolve_forced_moves and len(authorised_bids) == 1:
+            return authorised_bids[0]
+
+        return None
+
+    def _forced_card(
+        self, player: AbstractPlayer, authorised_cards: List[Card]
+    ) -> Optional[Card]:
+
+        """
+        Plays the card of a player who has a single authorised card, like
+        every player in the last trick of a round, when the forced moves are
+        resolved by the engine: the card is removed from the hand of the
+        player without calling its strategy.
+
+        :param player: The player to play.
+        :type player: AbstractPlayer
+        :param authorised_cards: The cards the player is allowed to play.
+        :type authorised_cards: List[Card]
+
+        :return: The forced card, or None if the player has to decide.
+        :rtype: Optional[Card]
+        """
+
+        if self._resolve_forced_moves and len(authorised_cards) == 1:
+            card = authorised_cards[0]
+            player.remove_from_hand(card)
+
+            return card
+
+        return None
+
+    def _shuffle_deck(self, seed: Optional[int] = None):
+
+        """
+        Resets the deck buffer to the canonical cards and shuffles it in
+        place, drawing the permutation of the whole round at once.
+
+        The cards are laid out in the same order as `Deck.initialise`, so a
+        given seed gives the same deal, but the dealt cards are the canonical
+        ones of `CARDS` whose integer encoding is a single lookup. The shuffle
+        uses a generator owned by the engine rather than the global `random`
+        state, so engines running in different threads don't interfere.
+
+        :param seed: The seed of the shuffle, None to draw from the generator
+                     of the engine.
+        :type seed: Optional[int]
+        """
+
+        rng = self._random if seed is None else random.Random(seed)
+        self._deck[:] = _DECK_CARDS
+        rng.shuffle(self._deck)
 
     def _distribute_cards(self, n_cards: int):
 
         """
         Distributes a specific number of cards to each player.
 
+        The cards are dealt one at a time to each player in turn from the top
+        of the deck, so the hand of each player is a single slice of the deck.
+
         :param n_cards: The number of cards to distribute to each player.
         :type n_cards: int
         """
 
-        for _ in range(n_cards):
-            for player in self._players:
-                card = list(self._deck.draw())[0]
+        n_players = len(self._players)
+        for player_idx, player in enumerate(self._players):
+            for card in self._deck[player_idx:n_players*n_cards:n_players]:
                 player.add_to_hand(card)
 
     def _ordered_players(self, first_playerd_idx: int):
@@ -201,11 +382,37 @@ class GameEngine:
             self._players[:first_playerd_idx]
         )
 
+    def _start_game(self, seed: Optional[int]):
+
+        """
+        Starts a game: reseeds every player with its own stream derived from
+        the seed of the game, so that a seeded game doesn't depend on the
+        games the players played before.
+
+        :param seed: The seed of the game, None to leave the players as they
+                     are.
+        :type seed: Optional[int]
+        """
+
+        if seed is not None:
+            for player in self._players:
+                player.reseed(player_seed(seed, player.id))
+
+        if self._events.wants(GameStarted):
+            self._events.emit(GameStarted(
+                seed, tuple(player.id for player in self._players)
+            ))
+
     def play_game(self, seed: Optional[int] = None):
 
         """
         Plays the entire game, going through all the rounds.
 
+        Each round is dealt and each player decides from its own random
+        stream, all derived from the seed of the game (see `rng`): a game is
+        fully determined by its seed, and any single game of a simulation can
+        be replayed on its own.
+
         :param seed: The seed value for random operations, such as shuffling.
         :type seed: Optional[int]
 
@@ -225,17 +432,15 @@ class GameEngine:
         players_idx = cycle(range(len(self._players)))
         max_n_cards = 51 // len(self._players)
 
+        self._start_game(seed)
         for round_idx in range(max_n_cards):
 
-            self._deck.initialise(shuffle=True, seed=seed)
+            self._shuffle_deck(round_seed(seed, round_idx))
             first_player_idx = next(players_idx)
             self.play_round(round_idx, round_idx+1, first_player_idx)
             self._game_state.store_current_round()
 
-        points_by_player_id = self._game_state.get_points_by_player_id()
-        logging.info(f"Points: {points_by_player_id}")
-
-        return points_by_player_id
+        return self._end_game()
 
     def play_round(self, round_id: int, n_cards: int, first_player_idx: int):
 
@@ -253,81 +458,205 @@ class GameEngine:
         :rtype: Dict[int, int]
         """
 
-        logging.info(f"Round {round_id} | starting")
-        logging.info(f"Round {round_id} | {n_cards} cards played")
+        game_round = self._start_round(round_id, n_cards)
+
+        # make bids
+        for i, player in enumerate(self._ordered_players(first_player_idx)):
+            autorised_bids = get_authorised_bids(
+                n_cards, game_round.total_bid, i+1 == len(self._players)
+            )
+            bid = self._forced_bid(autorised_bids)
+            forced = bid is not None
+            if not forced:
+                self._flush_notifications()
+                bid = player.make_bid(autorised_bids)
+            self._add_bid(game_round, player, bid, forced)
+
+        # play tricks
+        for trick_idx in range(n_cards):
+
+            self._play_trick(trick_idx, first_player_idx)
+
+        return self._end_round(game_round)
+
+    def _play_trick(self, trick_id: int, first_player_idx: int):
+
+        """
+        Plays a single trick within a round.
+
+        :param trick_id: The identifier for the trick.
+        :type trick_id: int
+        :param first_player_idx: The index of the first player in this trick.
+        :type first_player_idx: int
+        """
+
+        # play cards
+        trick = self._start_trick(trick_id)
+        for player in self._ordered_players(first_player_idx):
+
+            authorised_cards = player.authorised_cards(trick.suit)
+            played_card = self._forced_card(player, authorised_cards)
+            forced = played_card is not None
+            if not forced:
+                self._flush_notifications()
+                played_card = player.play_card(authorised_cards)
+            self._add_card(trick, player, played_card, forced)
+
+        self._end_trick(trick)
+        self._flush_notifications()
+
+    def _start_round(self, round_id: int, n_cards: int) -> Round:
+
+        """
+        Deals the cards of a round and makes it the current round.
+
+        :param round_id: The identifier for the round.
+        :type round_id: int
+        :param n_cards: The number of cards to be played in this round.
+        :type n_cards: int
+
+        :return: The new current round.
+        :rtype: Round
+        """
 
         # distribute_card
         self._distribute_cards(n_cards)
 
-        trump_card = list(self._deck.draw())[0]
-        logging.info(f"Round {round_id} | trump card: {trump_card}")
+        trump_card = self._deck[len(self._players) * n_cards]
+        if self._events.wants(RoundStarted):
+            self._events.emit(RoundStarted(round_id, n_cards, trump_card))
         game_round = Round(
             round_id, trump_card, self._point_attribution_strategy
         )
         self._game_state.current_round = game_round
         self.notify_game_state()
 
-        # make bids
-        for i, player in enumerate(self._ordered_players(first_player_idx)):
-            autorised_bids = get_authorised_bids(
-                n_cards, game_round.total_bid, i+1 == len(self._players)
-            )
-            bid = player.make_bid(autorised_bids)
-            game_round.add_bid(player.id, bid)
+        return game_round
+
+    def _add_bid(
+        self, game_round: Round, player: AbstractPlayer, bid: int,
+        forced: bool = False
+    ):
+
+        """
+        Records the bid of a player in the current round.
+
+        :param game_round: The current round.
+        :type game_round: Round
+        :param player: The player making the bid.
+        :type player: AbstractPlayer
+        :param bid: The bid of the player.
+        :type bid: int
+        :param forced: True if the bid was forced, in which case the players
+                       are notified of the game state later.
+        :type forced: bool
+        """
+
+        game_round.add_bid(player.id, bid)
+        if forced:
+            self._notification_pending = True
+        else:
             self.notify_game_state()
+        if self._events.wants(BidMade):
+            self._events.emit(BidMade(game_round.id, player.id, bid))
 
-        logging.info(
-            f"Round {round_id} | bid round done ("
-            f"{game_round.bid_by_player_id})"
-        )
-        logging.info(
-            f"Round {round_id} | total bid: {game_round.total_bid}"
-        )
+    def _end_round(self, game_round: Round) -> Dict[int, int]:
 
-        # play tricks
-        for trick_idx in range(n_cards):
+        """
+        Stores the current round and attributes its points.
 
-            self._play_trick(trick_idx, first_player_idx)
+        :param game_round: The current round.
+        :type game_round: Round
+
+        :return: The points scored in this round by each player.
+        :rtype: Dict[int, int]
+        """
 
         self._game_state.store_current_round()
 
         round_points = game_round.get_points_by_player_id()
-        logging.info(f"Round {round_id} | points: {round_points}")
-        logging.info(f"Round {n_cards} | ending")
+        if self._events.wants(RoundScored):
+            self._events.emit(RoundScored(game_round.id, dict(round_points)))
 
         return round_points
 
-    def _play_trick(self, trick_id: int, first_player_idx: int):
+    def _start_trick(self, trick_id: int) -> Trick:
 
         """
-        Plays a single trick within a round.
+        Makes a new trick the current trick of the current round.
 
         :param trick_id: The identifier for the trick.
         :type trick_id: int
-        :param first_player_idx: The index of the first player in this trick.
-        :type first_player_idx: int
+
+        :return: The new current trick.
+        :rtype: Trick
         """
 
-        logging.info(
-            f"Round {self._game_state.current_round.id} | trick {trick_id} | "
-            f"starting"
-        )
-        # play cards
         trick = Trick(trick_id)
         self._game_state.current_round.current_trick = trick
-        for player in self._ordered_players(first_player_idx):
 
-            authorised_cards = get_authorised_cards(player.hand, trick.suit)
-            played_card = player.play_card(authorised_cards)
-            trick.add_player_card(player.id, played_card)
+        return trick
+
+    def _add_card(
+        self, trick: Trick, player: AbstractPlayer, card: Card,
+        forced: bool = False
+    ):
+
+        """
+        Records the card played by a player in the current trick.
+
+        :param trick: The current trick.
+        :type trick: Trick
+        :param player: The player playing the card.
+        :type player: AbstractPlayer
+        :param card: The card played.
+        :type card: Card
+        :param forced: True if the card was forced, in which case the players
+                       are notified of the game state later.
+        :type forced: bool
+        """
+
+        trick.add_player_card(player.id, card)
+        if forced:
+            self._notification_pending = True
+        else:
             self.notify_game_state()
-            logging.info(
-                f"Round {self._game_state.current_round.id} | trick {trick_id}"
-                f" | player {player.id} played {played_card}"
+        if self._events.wants(CardPlayed):
+            self._events.emit(CardPlayed(
+                self._game_state.current_round.id, trick.id, player.id, card
+            ))
+
+    def _end_trick(self, trick: Trick):
+
+        """
+        Stores the current trick of the current round.
+
+        :param trick: The current trick.
+        :type trick: Trick
+        """
+
+        game_round = self._game_state.current_round
+        game_round.store_current_trick()
+
+        if self._events.wants(TrickWon):
+            winner_id, winning_card = trick.get_winner(
+                game_round.trump_card.suit
             )
-        self._game_state.current_round.store_current_trick()
+            self._events.emit(TrickWon(
+                game_round.id, trick.id, winner_id, winning_card
+            ))
 
-        logging.info(
-            f"Round {self._game_state.current_round.id} | trick {trick_id} | "
-            f"ending"
-        )
+    def _end_game(self) -> Dict[int, int]:
+
+        """
+        Computes the final points of the game.
+
+        :return: The final points scored by each player.
+        :rtype: Dict[int, int]
+        """
+
+        points_by_player_id = self._game_state.get_points_by_player_id()
+        if self._events.wants(GameScored):
+            self._events.emit(GameScored(dict(points_by_player_id)))
+
+        return points_by_player_id
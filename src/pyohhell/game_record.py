@@ -0,0 +1,404 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Compact binary records of the games, and their replay.
+
+A record holds everything needed to rebuild the game state of a game, and
+nothing more: the seed, the seats, and for each round its trump card, the
+bids and the cards played. Integers are LEB128 varints (zigzag encoded when
+they may be negative) and cards are single bytes holding their index in
+`cards.CARDS`, so a game between 4 players fits in about 500 bytes.
+
+Layout of a record::
+
+    magic       b'OHR' and the format version
+    seed        varint, 0 for an unseeded game, else zigzag(seed) + 1
+    players     varint count, then the zigzag ids in seat order
+    rounds      until the end of the record:
+        round id        varint
+        number of cards varint
+        trump card      byte
+        first bidder    varint seat, then one varint bid per seat
+        tricks          for each trick, the varint seat of the leader then
+                        one card byte per seat
+"""
+
+from __future__ import annotations
+
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+
+from src.pyohhell.cards import CARDS, card_to_index
+from src.pyohhell.events import (
+    BidMade,
+    CardPlayed,
+    Event,
+    GameScored,
+    GameStarted,
+    RoundStarted
+)
+from src.pyohhell.game_state import (
+    AbstractPointAttributionStrategy,
+    DefaultPointAttributionStrategy,
+    GameState,
+    Round,
+    Trick
+)
+
+
+RECORD_MAGIC = b'OHR\x01'
+
+# the event types a `GameRecorder` has to be attached for
+RECORDED_EVENT_TYPES = (GameStarted, RoundStarted, BidMade, CardPlayed,
+                        GameScored)
+
+
+def _write_varint(buffer: bytearray, value: int):
+
+    """
+    Appends a non-negative integer to a buffer as a LEB128 varint.
+
+    :param buffer: The buffer to append to.
+    :type buffer: bytearray
+    :param value: The integer to append.
+    :type value: int
+
+    :raises ValueError: If the integer is negative.
+    """
+
+    if value < 0:
+        raise ValueError("`value` should be greater or equal to 0")
+
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(record: bytes, offset: int) -> Tuple[int, int]:
+
+    """
+    Reads a LEB128 varint from a record.
+
+    :param record: The record to read from.
+    :type record: bytes
+    :param offset: The offset of the varint in the record.
+    :type offset: int
+
+    :return: The integer and the offset following the varint.
+    :rtype: Tuple[int, int]
+
+    :raises ValueError: If the record ends in the middle of the varint.
+    """
+
+    value = 0
+    shift = 0
+    try:
+        while True:
+            byte = record[offset]
+            offset += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value, offset
+            shift += 7
+    except IndexError:
+        raise ValueError("`record` is truncated") from None
+
+
+def _zigzag(value: int) -> int:
+
+    """
+    Maps a signed integer to a non-negative one, small in absolute value
+    mapping to small.
+
+    :param value: The signed integer.
+    :type value: int
+
+    :return: The zigzag encoded integer.
+    :rtype: int
+    """
+
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+
+    """
+    Inverse of `_zigzag`.
+
+    :param value: The zigzag encoded integer.
+    :type value: int
+
+    :return: The signed integer.
+    :rtype: int
+    """
+
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+class RecordHeader(NamedTuple):
+
+    """
+    The header of a game record.
+
+    :param seed: The seed of the game, None for an unseeded game.
+    :param player_ids: The identifiers of the players, in seat order.
+    :param offset: The offset of the first round in the record.
+    """
+
+    seed: Optional[int]
+    player_ids: Tuple[int, ...]
+    offset: int
+
+
+def read_record_header(record: bytes) -> RecordHeader:
+
+    """
+    Reads the header of a game record, without decoding its rounds.
+
+    :param record: The game record.
+    :type record: bytes
+
+    :return: The header of the record.
+    :rtype: RecordHeader
+
+    :raises ValueError: If the data isn't a game record.
+    """
+
+    if record[:len(RECORD_MAGIC)] != RECORD_MAGIC:
+        raise ValueError("`record` isn't a game record")
+
+    offset = len(RECORD_MAGIC)
+    seed, offset = _read_varint(record, offset)
+    seed = None if seed == 0 else _unzigzag(seed - 1)
+
+    n_players, offset = _read_varint(record, offset)
+    player_ids = list()
+    for _ in range(n_players):
+        player_id, offset = _read_varint(record, offset)
+        player_ids.append(_unzigzag(player_id))
+
+    return RecordHeader(seed, tuple(player_ids), offset)
+
+
+class GameRecorder:
+
+    """
+    Sink writing a compact record of every game played by an engine.
+
+    The record is written as the events arrive, and is complete once the game
+    is scored.
+
+    :param on_record: A callable taking each complete record, e.g.
+                      `GameArchive.append`. The records are kept in `records`
+                      if None.
+    :type on_record: Optional[Callable[[bytes], object]]
+
+    :Example:
+        >>> recorder = GameRecorder()
+        >>> game_engine.events.attach(recorder, RECORDED_EVENT_TYPES)
+        >>> game_engine.play_game(seed=42)
+        >>> game_state = replay_game(recorder.records[-1])
+    """
+
+    def __init__(self, on_record: Optional[Callable[[bytes], object]] = None):
+
+        self.records: List[bytes] = list()
+        self._on_record = on_record
+
+        self._buffer = bytearray()
+        self._seat_by_player_id: Dict[int, int] = dict()
+        self._n_players = 0
+        self._n_bids = 0
+        self._n_cards = 0
+
+    def __call__(self, event: Event):
+
+        if isinstance(event, CardPlayed):
+            if self._n_cards % self._n_players == 0:
+                _write_varint(
+                    self._buffer, self._seat_by_player_id[event.player_id]
+                )
+            self._buffer.append(card_to_index(event.card))
+            self._n_cards += 1
+
+        elif isinstance(event, BidMade):
+            if self._n_bids == 0:
+                _write_varint(
+                    self._buffer, self._seat_by_player_id[event.player_id]
+                )
+            _write_varint(self._buffer, event.bid)
+            self._n_bids += 1
+
+        elif isinstance(event, RoundStarted):
+            _write_varint(self._buffer, event.round_id)
+            _write_varint(self._buffer, event.n_cards)
+            self._buffer.append(card_to_index(event.trump_card))
+            self._n_bids = 0
+            self._n_cards = 0
+
+        elif isinstance(event, GameStarted):
+            self._start_record(event.seed, event.player_ids)
+
+        elif isinstance(event, GameScored):
+            if self._on_record is None:
+                self.records.append(bytes(self._buffer))
+            else:
+                self._on_record(bytes(self._buffer))
+
+    def _start_record(self, seed: Optional[int], player_ids: Tuple[int, ...]):
+
+        """
+        Starts the record of a new game with its header.
+
+        :param seed: The seed of the game, None for an unseeded game.
+        :type seed: Optional[int]
+        :param player_ids: The identifiers of the players, in seat order.
+        :type player_ids: Tuple[int, ...]
+        """
+
+        self._buffer = bytearray(RECORD_MAGIC)
+        _write_varint(self._buffer, 0 if seed is None else _zigzag(seed) + 1)
+        _write_varint(self._buffer, len(player_ids))
+        for player_id in player_ids:
+            _write_varint(self._buffer, _zigzag(player_id))
+
+        self._seat_by_player_id = {
+            player_id: seat for seat, player_id in enumerate(player_ids)
+        }
+        self._n_players = len(player_ids)
+
+
+class RecordedRound(NamedTuple):
+
+    """
+    A round decoded from a game record, with the cards as their index in
+    `cards.CARDS`.
+
+    :param round_id: The identifier of the round.
+    :param trump_index: The index of the trump card.
+    :param bid_by_player_id: The bid of each player, in bidding order.
+    :param tricks: The (player id, card index) pairs of each trick, in
+                   playing order.
+    """
+
+    round_id: int
+    trump_index: int
+    bid_by_player_id: Dict[int, int]
+    tricks: Tuple[Tuple[Tuple[int, int], ...], ...]
+
+
+def iter_record_rounds(record: bytes) -> Iterator[RecordedRound]:
+
+    """
+    Decodes the rounds of a game record one at a time, e.g. to filter games
+    on their bids without rebuilding their game state.
+
+    :param record: The game record.
+    :type record: bytes
+
+    :return: An iterator over the rounds of the game.
+    :rtype: Iterator[RecordedRound]
+
+    :raises ValueError: If the data isn't a complete game record.
+
+    :Example:
+        >>> any(
+        ...     game_round.round_id == 10 and
+        ...     game_round.bid_by_player_id.get(3) == 0
+        ...     for game_round in iter_record_rounds(record)
+        ... )
+        False
+    """
+
+    _, player_ids, offset = read_record_header(record)
+    n_players = len(player_ids)
+    # the players in seat order starting from each seat
+    seatings = [
+        player_ids[seat:] + player_ids[:seat] for seat in range(n_players)
+    ]
+
+    while offset < len(record):
+
+        round_id, offset = _read_varint(record, offset)
+        n_cards, offset = _read_varint(record, offset)
+        if offset + 1 > len(record):
+            raise ValueError("`record` is truncated")
+        trump_index = record[offset]
+        offset += 1
+
+        bid_by_player_id = dict()
+        seat, offset = _read_varint(record, offset)
+        for player_id in seatings[seat]:
+            bid_by_player_id[player_id], offset = \
+                _read_varint(record, offset)
+
+        tricks = list()
+        for _ in range(n_cards):
+            seat, offset = _read_varint(record, offset)
+            card_indices = record[offset:offset + n_players]
+            if len(card_indices) < n_players:
+                raise ValueError("`record` is truncated")
+            offset += n_players
+            tricks.append(tuple(zip(seatings[seat], card_indices)))
+
+        yield RecordedRound(
+            round_id, trump_index, bid_by_player_id, tuple(tricks)
+        )
+
+
+def replay_game(
+    record: bytes,
+    point_attribution_strategy: AbstractPointAttributionStrategy =
+    DefaultPointAttributionStrategy()
+) -> GameState:
+
+    """
+    Rebuilds the game state of a recorded game, without going through the
+    players and their strategies.
+
+    :param record: The game record.
+    :type record: bytes
+    :param point_attribution_strategy: The strategy used for attributing
+                                       points to players.
+    :type point_attribution_strategy: AbstractPointAttributionStrategy
+
+    :return: The game state at the end of the game.
+    :rtype: GameState
+
+    :raises ValueError: If the data isn't a complete game record.
+
+    :Example:
+        >>> game_state = replay_game(recorder.records[0])
+        >>> game_state.get_points_by_player_id()
+        {1: 35, 2: -76}
+    """
+
+    game_state = GameState()
+    for recorded_round in iter_record_rounds(record):
+
+        game_round = Round(
+            recorded_round.round_id, CARDS[recorded_round.trump_index],
+            point_attribution_strategy
+        )
+        for player_id, bid in recorded_round.bid_by_player_id.items():
+            game_round.add_bid(player_id, bid)
+
+        for trick_id, trick in enumerate(recorded_round.tricks):
+            game_round.current_trick = Trick(trick_id, tuple(
+                (player_id, CARDS[index]) for player_id, index in trick
+            ))
+            game_round.store_current_trick()
+
+        game_state.current_round = game_round
+        game_state.store_current_round()
+
+    return game_state
@@ -5,10 +5,25 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Union
 
 from pydecklib.card import Card, Suit, Value
 
+from src.pyohhell.cards import (
+    CARDS,
+    card_to_index,
+    suit_index,
+    trick_winner_position
+)
+from src.pyohhell.zobrist import (
+    bid_key,
+    played_card_key,
+    round_hash,
+    trick_card_key,
+    trump_key,
+    wins_key
+)
+
 
 class GameState:
 
@@ -40,11 +55,33 @@ class GameState:
         {1: -1, 2: 4}
     """
 
+    __slots__ = (
+        '_rounds', '_current_round', '_points_by_player_id', '_hash'
+    )
+
     def __init__(self, rounds: Tuple[Round, ...] = tuple()):
 
-        self._rounds: List[Round] = list(rounds)
+        self._rounds: List[Round] = list()
         self._current_round: Optional[Round] = None
 
+        # running total and hash, updated when rounds are stored
+        self._points_by_player_id: Dict[int, int] = defaultdict(int)
+        self._hash = 0
+        for _round in rounds:
+            self._store_round(_round)
+
+    @property
+    def rounds(self) -> Tuple[Round, ...]:
+
+        """
+        The rounds stored in the game, in playing order.
+
+        :return: The stored rounds.
+        :rtype: Tuple[Round, ...]
+        """
+
+        return tuple(self._rounds)
+
     @property
     def current_round(self) -> Optional[Round]:
 
@@ -85,14 +122,29 @@ class GameState:
         """
 
         if self._current_round:
-            self._rounds.append(self._current_round)
+            self._store_round(self._current_round)
         self._current_round = None
 
+    def _store_round(self, _round: Round) -> None:
+
+        """
+        Appends a round to the game's round list and adds its points to the
+        running total of each player.
+
+        :param _round: The round to store.
+        :type _round: Round
+        """
+
+        self._hash ^= round_hash(len(self._rounds), _round.zobrist_hash)
+        self._rounds.append(_round)
+        for player_id, points in _round.get_points_by_player_id().items():
+            self._points_by_player_id[player_id] += points
+
     def get_points_by_player_id(self) -> Dict[int, int]:
 
         """
-        Calculates the total points scored by each player across all rounds in
-        the game.
+        Calculates the total points scored by each player across all stored
+        rounds in the game.
 
         :return: A dictionary mapping player IDs to their total points.
         :rtype: defaultdict[int, int]
@@ -116,13 +168,26 @@ class GameState:
             {1: -1, 2: 4}
         """
 
-        total_points_by_player_id = defaultdict(int)
-        for _round in self._rounds:
-            round_points_by_player_id = _round.get_points_by_player_id()
-            for player_id, points in round_points_by_player_id.items():
-                total_points_by_player_id[player_id] += points
+        return defaultdict(int, self._points_by_player_id)
+
+    @property
+    def zobrist_hash(self) -> int:
 
-        return total_points_by_player_id
+        """
+        The Zobrist hash of the game: the hashes of its stored rounds and of
+        its current round (see `Round.zobrist_hash`), each mixed with its
+        index in the game, combined.
+
+        :return: The 64-bit hash of the game.
+        :rtype: int
+        """
+
+        if self._current_round is None:
+            return self._hash
+
+        return self._hash ^ round_hash(
+            len(self._rounds), self._current_round.zobrist_hash
+        )
 
     def __eq__(self, other: GameState):
 
@@ -255,6 +320,12 @@ class Round:
         >>> {1: -1, 2: 4}
     """
 
+    __slots__ = (
+        '_id', '_trump_card', '_tricks', '_current_trick',
+        '_bid_by_player_id', '_point_attribution_strategy', '_total_bid',
+        '_wins_by_player_id', '_hash', '_moves'
+    )
+
     def __init__(
         self, _id: int, trump_card: Card,
         point_attribution_strategy: AbstractPointAttributionStrategy =
@@ -269,6 +340,20 @@ class Round:
         self._bid_by_player_id = dict()
         self._point_attribution_strategy = point_attribution_strategy
 
+        # running totals, updated when bids are added and tricks are stored
+        self._total_bid = 0
+        self._wins_by_player_id = defaultdict(int)
+        # hash of the round but its current trick
+        self._hash = trump_key(_id, card_to_index(trump_card))
+
+        # moves applied with `apply_move`, with what `undo_move` needs to
+        # revert them: (player id, bid or card, whether the move started the
+        # trick, whether it completed the trick, id of the winner if it did);
+        # created on the first move, as most rounds are never searched
+        self._moves: Optional[List[
+            Tuple[int, Union[int, Card], bool, bool, Optional[int]]
+        ]] = None
+
     @property
     def id(self) -> int:
 
@@ -281,6 +366,30 @@ class Round:
 
         return self._id
 
+    @property
+    def trump_card(self) -> Card:
+
+        """
+        The card that defines the trump suit of the round.
+
+        :return: The trump card of the round.
+        :rtype: Card
+        """
+
+        return self._trump_card
+
+    @property
+    def tricks(self) -> Tuple[Trick, ...]:
+
+        """
+        The tricks stored in the round, in playing order.
+
+        :return: The stored tricks.
+        :rtype: Tuple[Trick, ...]
+        """
+
+        return tuple(self._tricks)
+
     @property
     def current_trick(self) -> Optional[Trick]:
 
@@ -309,7 +418,8 @@ class Round:
 
         """
         Stores the current trick in the round's trick list and resets the
-        current trick.
+        current trick. The winner of the trick is resolved once, when it is
+        stored.
 
         :Example:
             >>> _round = Round(1, Card(Suit.DIAMONDS, Value.TWO))
@@ -321,8 +431,71 @@ class Round:
         """
 
         if self._current_trick:
-            self._tricks.append(self._current_trick)
+            self._store_trick()
+        self._current_trick = None
+
+    def _store_trick(self) -> Optional[int]:
+
+        """
+        Stores the current trick and counts its winner.
+
+        :return: The id of the winner, None if the trick is empty.
+        :rtype: Optional[int]
+        """
+
+        trick = self._current_trick
+        self._tricks.append(trick)
         self._current_trick = None
+        self._toggle_played_cards(trick)
+
+        winner_id, _ = trick.get_winner(self._trump_card.suit)
+        if winner_id is None:
+            return None
+
+        n_wins = self._wins_by_player_id[winner_id]
+        self._wins_by_player_id[winner_id] = n_wins + 1
+        self._hash ^= wins_key(winner_id, n_wins) ^ \
+            wins_key(winner_id, n_wins + 1)
+
+        return winner_id
+
+    def _unstore_trick(self, winner_id: Optional[int]):
+
+        """
+        Makes the last stored trick the current trick again, reverting
+        `_store_trick`.
+
+        :param winner_id: The id of the winner when it was stored.
+        :type winner_id: Optional[int]
+        """
+
+        trick = self._tricks.pop()
+        self._current_trick = trick
+        self._toggle_played_cards(trick)
+
+        if winner_id is None:
+            return
+
+        n_wins = self._wins_by_player_id[winner_id]
+        if n_wins == 1:
+            del self._wins_by_player_id[winner_id]
+        else:
+            self._wins_by_player_id[winner_id] = n_wins - 1
+        self._hash ^= wins_key(winner_id, n_wins) ^ \
+            wins_key(winner_id, n_wins - 1)
+
+    def _toggle_played_cards(self, trick: Trick):
+
+        """
+        Adds the cards of a trick to the hash of the stored cards, or removes
+        them if they are in it.
+
+        :param trick: The trick.
+        :type trick: Trick
+        """
+
+        for player_id, card in trick.player_ids_cards:
+            self._hash ^= played_card_key(player_id, card_to_index(card))
 
     @property
     def bid_by_player_id(self) -> Dict[int, int]:
@@ -346,7 +519,7 @@ class Round:
         :rtype: int
         """
 
-        return sum(self._bid_by_player_id.values())
+        return self._total_bid
 
     def add_bid(self, player_id: int, bid: int):
 
@@ -366,23 +539,109 @@ class Round:
         if player_id is not None and bid is not None and \
                 player_id not in self._bid_by_player_id:
             self._bid_by_player_id[player_id] = bid
+            self._total_bid += bid
+            self._hash ^= bid_key(player_id, bid)
+
+    def apply_move(self, player_id: int, move: Union[int, Card]):
+
+        """
+        Applies a move in place: a bid if `move` is an integer, a card played
+        in the current trick otherwise. The trick is started if there is no
+        current trick, and stored once every player who bid has played.
+
+        Every applied move can be reverted exactly with `undo_move`, so that
+        a search can explore the moves from a round without copying it. The
+        hands of the players aren't part of the round and are kept by the
+        search.
+
+        :param player_id: The ID of the player making the move.
+        :type player_id: int
+        :param move: The bid or the card.
+        :type move: Union[int, Card]
+
+        :raises ValueError: If the player id is missing, if the bid isn't an
+                            integer, if the player bids twice or after the
+                            first card, or if the player plays without
+                            having bid.
+
+        :Example:
+            >>> _round = Round(1, Card(Suit.DIAMONDS, Value.TWO))
+            >>> _round.apply_move(1, 0)
+            >>> _round.apply_move(2, 1)
+            >>> _round.apply_move(1, Card(Suit.SPADES, Value.TEN))
+            >>> _round.apply_move(2, Card(Suit.DIAMONDS, Value.JACK))
+            >>> _round.get_wins_by_player_id()
+            {2: 1}
+            >>> _round.undo_move()
+            >>> _round.current_trick.player_ids_cards
+            ((1, 🂪),)
+        """
+
+        if player_id is None:
+            raise ValueError("`player_id` should be given")
+        if self._moves is None:
+            self._moves = list()
+
+        if not isinstance(move, Card):
+            if not isinstance(move, int):
+                raise ValueError("`move` should be a bid or a card")
+            if player_id in self._bid_by_player_id:
+                raise ValueError("`player_id` has already bid")
+            if self._tricks or self._current_trick is not None and \
+                    self._current_trick.n_cards:
+                raise ValueError("the bids should precede the cards")
+            self.add_bid(player_id, move)
+            self._moves.append((player_id, move, False, False, None))
+            return
+
+        if player_id not in self._bid_by_player_id:
+            raise ValueError("`player_id` should bid before playing")
+
+        started = self._current_trick is None
+        if started:
+            self._current_trick = Trick(len(self._tricks))
+        trick = self._current_trick
+        trick.add_player_card(player_id, move)
+
+        completed = trick.n_cards >= len(self._bid_by_player_id)
+        winner_id = self._store_trick() if completed else None
+        self._moves.append((player_id, move, started, completed, winner_id))
+
+    def undo_move(self):
+
+        """
+        Reverts the last move applied with `apply_move`.
+
+        :raises ValueError: If there is no move to undo.
+        """
+
+        if not self._moves:
+            raise ValueError("there is no move to undo")
+
+        player_id, move, started, completed, winner_id = self._moves.pop()
+        if not isinstance(move, Card):
+            del self._bid_by_player_id[player_id]
+            self._total_bid -= move
+            self._hash ^= bid_key(player_id, move)
+            return
+
+        if completed:
+            self._unstore_trick(winner_id)
+        self._current_trick.pop_player_card()
+        if started:
+            self._current_trick = None
 
     def get_wins_by_player_id(self):
 
         """
-        Determines the number of tricks won by each player in the round.
+        Determines the number of tricks won by each player in the stored
+        tricks of the round.
 
         :return: A dictionary mapping player IDs to the number of tricks won.
         :rtype: defaultdict[int, int]
         """
 
-        wins_by_player = defaultdict(int)
-        for trick in self._tricks:
-            winner_id, card = trick.get_winner(self._trump_card.suit)
-            if winner_id:
-                wins_by_player[winner_id] += 1
-
-        return wins_by_player
+        return defaultdict(int, self._wins_by_player_id)
 
     def get_points_by_player_id(self) -> Dict[int, int]:
 
@@ -415,18 +674,44 @@ class Round:
 
         return points_by_players
 
+    @property
+    def zobrist_hash(self) -> int:
+
+        """
+        The Zobrist hash of the round, maintained as the bids are added and
+        the cards are played: the XOR of the keys of its trump card, bids,
+        stored cards, wins and current trick cards (see `zobrist`). Two rounds
+        in the same state have the same hash.
+
+        :return: The 64-bit hash of the round.
+        :rtype: int
+
+        :Example:
+            >>> _round = Round(1, Card(Suit.DIAMONDS, Value.TWO))
+            >>> before = _round.zobrist_hash
+            >>> _round.add_bid(player_id=1, bid=1)
+            >>> _round.zobrist_hash == before ^ bid_key(1, 1)
+            True
+        """
+
+        if self._current_trick is None:
+            return self._hash
+
+        return self._hash ^ self._current_trick.zobrist_hash
+
     def __eq__(self, other):
 
         if not isinstance(other, Round):
             return False
 
-        skipped_attrs = ['_point_attribution_strategy']
-
-        for attr, value in vars(self).items():
-            if getattr(other, attr, None) != value \
-                    and attr not in skipped_attrs:
-                return False
-        return True
+        # the other attributes follow from these ones
+        return (
+            self._id == other._id and
+            self._trump_card == other._trump_card and
+            self._bid_by_player_id == other._bid_by_player_id and
+            self._tricks == other._tricks and
+            self._current_trick == other._current_trick
+        )
 
 
 class Trick:
@@ -455,14 +740,21 @@ class Trick:
         >>> (3, 🃅)
     """
 
+    __slots__ = ('_id', '_player_ids', '_cards', '_hash')
+
     def __init__(
         self, _id: int,
         player_ids_cards: Tuple[Tuple[int, Card], ...] = tuple()
     ):
 
         self._id = _id
-        Card.suit_ordered = True
-        self._player_ids_cards = list(player_ids_cards)
+        # the players and the indices of their cards (see `cards`), in
+        # playing order
+        self._player_ids: List[int] = list()
+        self._cards = bytearray()
+        self._hash = 0
+        for player_id, card in player_ids_cards:
+            self.add_player_card(player_id, card)
 
     @property
     def id(self) -> int:
@@ -476,6 +768,58 @@ class Trick:
 
         return self._id
 
+    @property
+    def player_ids_cards(self) -> Tuple[Tuple[int, Card], ...]:
+
+        """
+        The cards played in the trick with the players who played them, in
+        playing order.
+
+        :return: The (player id, card) pairs of the trick.
+        :rtype: Tuple[Tuple[int, Card], ...]
+        """
+
+        return tuple(zip(
+            self._player_ids, [CARDS[index] for index in self._cards]
+        ))
+
+    @property
+    def player_ids(self) -> Tuple[int, ...]:
+
+        """
+        The players who played in the trick, in playing order.
+
+        :return: The player ids.
+        :rtype: Tuple[int, ...]
+        """
+
+        return tuple(self._player_ids)
+
+    @property
+    def n_cards(self) -> int:
+
+        """
+        The number of cards played in the trick.
+
+        :return: The number of cards.
+        :rtype: int
+        """
+
+        return len(self._cards)
+
+    @property
+    def card_indices(self) -> bytes:
+
+        """
+        The indices of the cards played in the trick (see
+        `cards.card_to_index`), in playing order.
+
+        :return: The card indices.
+        :rtype: bytes
+        """
+
+        return bytes(self._cards)
+
     @property
     def suit(self) -> Optional[Suit]:
 
@@ -487,8 +831,8 @@ class Trick:
         :rtype: Optional[Suit]
         """
 
-        if self._player_ids_cards:
-            return self._player_ids_cards[0][1].suit
+        if self._cards:
+            return CARDS[self._cards[0]].suit
         else:
             return None
 
@@ -507,7 +851,40 @@ class Trick:
             >>> trick.add_player_card(3, Card(Suit.DIAMONDS, Value.FIVE))
         """
 
-        self._player_ids_cards.append((player_id, card))
+        index = card_to_index(card)
+        self._hash ^= trick_card_key(len(self._cards), player_id, index)
+        self._player_ids.append(player_id)
+        self._cards.append(index)
+
+    def pop_player_card(self) -> Tuple[int, Card]:
+
+        """
+        Removes the last card played in the trick.
+
+        :return: The (player id, card) pair removed.
+        :rtype: Tuple[int, Card]
+
+        :raises IndexError: If the trick is empty.
+        """
+
+        player_id = self._player_ids.pop()
+        index = self._cards.pop()
+        self._hash ^= trick_card_key(len(self._cards), player_id, index)
+
+        return player_id, CARDS[index]
+
+    @property
+    def zobrist_hash(self) -> int:
+
+        """
+        The Zobrist hash of the trick: the XOR of the keys of its cards, with
+        the player and the position of each card.
+
+        :return: The 64-bit hash of the trick.
+        :rtype: int
+        """
+
+        return self._hash
 
     def get_winner(self, trump_suit: Suit) -> Tuple[
         Optional[int], Optional[Card]
@@ -537,22 +914,16 @@ class Trick:
         >>> (3, 🃅)
     """
 
-        if self._player_ids_cards:
-
-            cards = [card for player, card in self._player_ids_cards]
-            suit_ranking = {
-                suit: (
-                    2 if suit == trump_suit
-                    else 1 if suit == self.suit else 0
-                )
-                for suit in Suit
-            }
-            Card.suit_ranking = suit_ranking
+        if self._cards:
 
-            best_card = max(cards)
-            best_card_idx = cards.index(best_card)
+            best_card_idx = trick_winner_position(
+                self._cards, suit_index(trump_suit)
+            )
 
-            return self._player_ids_cards[best_card_idx]
+            return (
+                self._player_ids[best_card_idx],
+                CARDS[self._cards[best_card_idx]]
+            )
 
         else:
             return None, None
@@ -561,7 +932,8 @@ class Trick:
         if not isinstance(other, Trick):
             return False
 
-        for attr, value in vars(self).items():
-            if getattr(other, attr, None) != value:
-                return False
-        return True
+        return (
+            self._id == other._id and
+            self._player_ids == other._player_ids and
+            self._cards == other._cards
+        )
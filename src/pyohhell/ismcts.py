@@ -0,0 +1,899 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Information set Monte Carlo tree search (ISMCTS) for selecting the card to
+play.
+
+The player doesn't see the hands of the other players, only the cards
+played, so the search is run over the positions consistent with what it has
+seen. Each iteration deals the unseen cards at random to the other players,
+with the number of cards each one still holds and without giving a player a
+card of a suit it has shown to be void in, and then:
+
+- walks down a single tree shared by all the deals, choosing the moves with
+  UCB1 among the ones legal in the deal (single observer ISMCTS);
+- adds one node to the tree and plays the rest of the round at random;
+- updates the nodes of the walk with the points of the player who chose
+  each move, so that every player plays for its own points.
+
+The bids are chosen from the distribution of the tricks won by the player
+over random deals and random playouts (`rollout`), the bid with the best
+expected points being kept.
+
+The hands are bitmasks and the tricks are won following `BEATS`, which keeps
+an iteration in the tens of microseconds.
+"""
+
+from __future__ import annotations
+
+from math import log, sqrt
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import random
+import time
+
+from pydecklib.card import Card
+
+from src.pyohhell.cards import (
+    BEATS,
+    FULL_MASK,
+    N_CARDS,
+    N_SUITS,
+    N_VALUES,
+    SUIT_MASKS,
+    beats_offset,
+    card_suit,
+    card_to_index,
+    cards_to_mask,
+    count_cards,
+    trick_winner_position
+)
+from src.pyohhell.game_state import (
+    AbstractPointAttributionStrategy,
+    DefaultPointAttributionStrategy,
+    GameState
+)
+from src.pyohhell.player import (
+    AbstractBidSelectionStrategy,
+    AbstractCardSelectionStrategy
+)
+
+
+class Observation(NamedTuple):
+
+    """
+    What a player knows of the current round when it has to play, with the
+    seats numbered in bidding order.
+
+    :param seat: The seat of the player.
+    :param hand: The bitmask of the hand of the player.
+    :param unseen: The bitmask of the cards the player hasn't seen, held by
+                   the other players or not dealt.
+    :param n_cards: The number of cards each seat holds.
+    :param voids: The bitmask of the suits each seat is known to be void in.
+    :param leader: The seat leading the current trick.
+    :param trick: The indices of the cards played in the current trick.
+    :param wins: The number of tricks each seat has won in the round.
+    :param rewards: The reward of each seat for each final number of tricks
+                    won, between 0 and 1.
+    :param trump_suit: The index of the trump suit.
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the round leads every trick.
+    """
+
+    seat: int
+    hand: int
+    unseen: int
+    n_cards: Tuple[int, ...]
+    voids: Tuple[int, ...]
+    leader: int
+    trick: Tuple[int, ...]
+    wins: Tuple[int, ...]
+    rewards: Tuple[Tuple[float, ...], ...]
+    trump_suit: int
+    winner_leads: bool
+
+
+def observe(
+    hand: List[Card], game_state: GameState,
+    point_attribution_strategy: AbstractPointAttributionStrategy =
+    DefaultPointAttributionStrategy(),
+    winner_leads: bool = False
+) -> Observation:
+
+    """
+    Extracts what a player knows of the current round from its hand and the
+    game state, when it has to play a card.
+
+    The seats are numbered in bidding order, the player who bid first
+    leading the first trick. The points of a player are assumed to only
+    depend on its own bid and tricks, like with
+    `DefaultPointAttributionStrategy`.
+
+    :param hand: The hand of the player.
+    :type hand: List[Card]
+    :param game_state: The game state, with the bids of every player.
+    :type game_state: GameState
+    :param point_attribution_strategy: The strategy used for attributing
+                                       points to players.
+    :type point_attribution_strategy: AbstractPointAttributionStrategy
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the round leads every trick,
+                         like in `GameEngine`.
+    :type winner_leads: bool
+
+    :return: The observation of the player.
+    :rtype: Observation
+
+    :raises ValueError: If there is no current round or no bid.
+    """
+
+    game_round = game_state.current_round
+    if game_round is None or not game_round.bid_by_player_id:
+        raise ValueError("`game_state` should have a round with bids")
+
+    player_ids = list(game_round.bid_by_player_id)
+    seat_by_player_id = {
+        player_id: seat for seat, player_id in enumerate(player_ids)
+    }
+    n_players = len(player_ids)
+    trump_index = card_to_index(game_round.trump_card)
+    trump_suit = card_suit(trump_index)
+
+    tricks = game_round.tricks
+    current_trick = game_round.current_trick
+    trick_player_ids = () if current_trick is None \
+        else current_trick.player_ids
+    trick = () if current_trick is None \
+        else tuple(current_trick.card_indices)
+
+    # the cards seen, and the suits the players didn't follow
+    seen = cards_to_mask(hand) | 1 << trump_index
+    voids = [0] * n_players
+    for past_trick in tricks + (() if current_trick is None
+                                else (current_trick,)):
+        card_indices = past_trick.card_indices
+        if not card_indices:
+            continue
+        lead_suit = card_suit(card_indices[0])
+        for player_id, index in zip(past_trick.player_ids, card_indices):
+            seen |= 1 << index
+            if card_suit(index) != lead_suit:
+                voids[seat_by_player_id[player_id]] |= 1 << lead_suit
+
+    if trick_player_ids:
+        leader = seat_by_player_id[trick_player_ids[0]]
+    elif winner_leads and tricks:
+        winner_id, _ = tricks[-1].get_winner(game_round.trump_card.suit)
+        leader = seat_by_player_id[winner_id]
+    else:
+        leader = 0
+    seat = (leader + len(trick)) % n_players
+
+    n_tricks = len(tricks) + len(hand)
+    n_cards = tuple(
+        len(hand) - ((s - leader) % n_players < len(trick))
+        for s in range(n_players)
+    )
+
+    wins_by_player_id = game_round.get_wins_by_player_id()
+    rewards = list()
+    for player_id in player_ids:
+        bid = game_round.bid_by_player_id[player_id]
+        points = [
+            point_attribution_strategy.attribute_points(
+                {player_id: n_wins}, {player_id: bid}
+            )[player_id]
+            for n_wins in range(n_tricks + 1)
+        ]
+        low, high = min(points), max(points)
+        rewards.append(tuple(
+            (p - low) / (high - low) if high > low else 0.5 for p in points
+        ))
+
+    return Observation(
+        seat, cards_to_mask(hand), FULL_MASK & ~seen, n_cards, tuple(voids),
+        leader, trick,
+        tuple(wins_by_player_id[player_id] for player_id in player_ids),
+        tuple(rewards), trump_suit, winner_leads
+    )
+
+
+def observe_bidding(
+    hand: List[Card], game_state: GameState, n_players: int,
+    winner_leads: bool = False
+) -> Observation:
+
+    """
+    Extracts what a player knows of the current round from its hand and the
+    game state, when it has to bid.
+
+    The seats are numbered in bidding order, so the player sits after the
+    players who already bid. The bids of the players after it aren't known,
+    so the observation has no rewards.
+
+    :param hand: The hand of the player.
+    :type hand: List[Card]
+    :param game_state: The game state, with the bids made so far.
+    :type game_state: GameState
+    :param n_players: The number of players in the round.
+    :type n_players: int
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the round leads every trick,
+                         like in `GameEngine`.
+    :type winner_leads: bool
+
+    :return: The observation of the player.
+    :rtype: Observation
+
+    :raises ValueError: If there is no current round or if every player
+                        already bid.
+    """
+
+    game_round = game_state.current_round
+    if game_round is None:
+        raise ValueError("`game_state` should have a current round")
+
+    player_ids = list(game_round.bid_by_player_id)
+    if len(player_ids) >= n_players:
+        raise ValueError(
+            "`n_players` should be greater than the number of bids"
+        )
+
+    trump_index = card_to_index(game_round.trump_card)
+    seen = cards_to_mask(hand) | 1 << trump_index
+
+    return Observation(
+        len(player_ids), cards_to_mask(hand), FULL_MASK & ~seen,
+        (len(hand),) * n_players, (0,) * n_players, 0, (), (0,) * n_players,
+        (), card_suit(trump_index), winner_leads
+    )
+
+
+def _draw(cards: List[int], n_draws: int, rng: random.Random) -> int:
+
+    """
+    Moves cards drawn at random to the front of a list, with a partial
+    Fisher-Yates shuffle.
+
+    :param cards: The indices of the cards to draw from, shuffled in place.
+    :type cards: List[int]
+    :param n_draws: The number of cards to draw.
+    :type n_draws: int
+    :param rng: The random number generator.
+    :type rng: random.Random
+
+    :return: The bitmask of the cards drawn.
+    :rtype: int
+    """
+
+    rand = rng.random
+    n_cards = len(cards)
+    drawn = 0
+    for i in range(n_draws):
+        j = i + int(rand() * (n_cards - i))
+        cards[i], cards[j] = cards[j], cards[i]
+        drawn |= 1 << cards[i]
+
+    return drawn
+
+
+class _Dealer:
+
+    """
+    Deals the unseen cards of an observation, the constraints being
+    prepared once for all the deals of a search.
+
+    :param observation: The observation of the player.
+    :type observation: Observation
+    """
+
+    __slots__ = ('_seat', '_hand', '_n_seats', '_unseen', '_constrained',
+                 '_free', '_all_free')
+
+    def __init__(self, observation: Observation):
+
+        self._seat = observation.seat
+        self._hand = observation.hand
+        self._n_seats = len(observation.n_cards)
+        self._unseen = [
+            index for index in range(N_CARDS)
+            if observation.unseen >> index & 1
+        ]
+
+        # the seats void in some suit, the ones with the fewest cards to
+        # choose from first, and the other seats
+        self._constrained: List[Tuple[int, int, int]] = list()
+        self._free: List[Tuple[int, int]] = list()
+        self._all_free: List[Tuple[int, int]] = list()
+        for seat, (n_cards, voids) in enumerate(
+            zip(observation.n_cards, observation.voids)
+        ):
+            if seat == self._seat or not n_cards:
+                continue
+            self._all_free.append((seat, n_cards))
+            void_mask = 0
+            for suit in range(N_SUITS):
+                if voids >> suit & 1:
+                    void_mask |= SUIT_MASKS[suit]
+            if void_mask & observation.unseen:
+                self._constrained.append((seat, n_cards, void_mask))
+            else:
+                self._free.append((seat, n_cards))
+        self._constrained.sort(key=lambda constraint: count_cards(
+            observation.unseen & ~constraint[2]
+        ))
+
+    def __call__(self, rng: random.Random) -> List[int]:
+
+        """
+        Deals the unseen cards at random.
+
+        :param rng: The random number generator.
+        :type rng: random.Random
+
+        :return: The bitmask of the hand of each seat.
+        :rtype: List[int]
+        """
+
+        hands = [0] * self._n_seats
+        hands[self._seat] = self._hand
+        pool = list(self._unseen)
+        free = self._free
+
+        for seat, n_cards, void_mask in self._constrained:
+            allowed = [index for index in pool if not void_mask >> index & 1]
+            if len(allowed) < n_cards:
+                # the voids can't all be kept, they are ignored
+                for constrained_seat, _, _ in self._constrained:
+                    hands[constrained_seat] = 0
+                pool = list(self._unseen)
+                free = self._all_free
+                break
+            hand = hands[seat] = _draw(allowed, n_cards, rng)
+            pool = [index for index in pool if not hand >> index & 1]
+
+        _draw(pool, sum(n_cards for _, n_cards in free), rng)
+        start = 0
+        for seat, n_cards in free:
+            hand = 0
+            for index in pool[start:start + n_cards]:
+                hand |= 1 << index
+            hands[seat] = hand
+            start += n_cards
+
+        return hands
+
+
+def deal(observation: Observation, rng: random.Random) -> List[int]:
+
+    """
+    Deals the unseen cards at random to the other seats, consistently with
+    the observation: each seat gets the number of cards it holds and, as far
+    as possible, no card of a suit it is void in.
+
+    :param observation: The observation of the player.
+    :type observation: Observation
+    :param rng: The random number generator.
+    :type rng: random.Random
+
+    :return: The bitmask of the hand of each seat.
+    :rtype: List[int]
+    """
+
+    return _Dealer(observation)(rng)
+
+
+class _Node:
+
+    """
+    Node of the search tree, reached by a move of a seat.
+    """
+
+    __slots__ = ('children', 'visits', 'reward', 'available')
+
+    def __init__(self):
+
+        self.children: Dict[int, _Node] = dict()
+        self.visits = 0
+        self.reward = 0.
+        self.available = 1
+
+
+def search(
+    observation: Observation, n_iterations: Optional[int] = 200,
+    time_limit: Optional[float] = None,
+    rng: Optional[random.Random] = None, exploration: float = 0.7
+) -> Dict[int, Tuple[int, float]]:
+
+    """
+    Runs ISMCTS from the observation of a player.
+
+    :param observation: The observation of the player.
+    :type observation: Observation
+    :param n_iterations: The number of iterations, None for no limit.
+    :type n_iterations: Optional[int]
+    :param time_limit: The time after which the search stops, in seconds,
+                       None for no limit.
+    :type time_limit: Optional[float]
+    :param rng: The random number generator.
+    :type rng: Optional[random.Random]
+    :param exploration: The exploration constant of UCB1.
+    :type exploration: float
+
+    :return: The number of visits and the total reward of each card the
+             player can play, by card index.
+    :rtype: Dict[int, Tuple[int, float]]
+
+    :raises ValueError: If there is neither an iteration nor a time limit.
+    """
+
+    if n_iterations is None and time_limit is None:
+        raise ValueError(
+            "`n_iterations` or `time_limit` should be given"
+        )
+    if rng is None:
+        rng = random.Random()
+
+    n_seats = len(observation.n_cards)
+    trump_suit = observation.trump_suit
+    offsets = [beats_offset(suit, trump_suit) for suit in range(N_SUITS)]
+    rewards = observation.rewards
+    winner_leads = observation.winner_leads
+
+    # the state at the root, the current trick being played
+    root_trick = list(observation.trick)
+    root_best = root_position = 0
+    if root_trick:
+        root_position = trick_winner_position(root_trick, trump_suit)
+        root_best = root_trick[root_position]
+    root_offset = offsets[root_trick[0] // N_VALUES] if root_trick else 0
+
+    dealer = _Dealer(observation)
+    rand = rng.random
+    root = _Node()
+    deadline = None if time_limit is None \
+        else time.perf_counter() + time_limit
+    iteration = 0
+    while n_iterations is None or iteration < n_iterations:
+
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        iteration += 1
+
+        hands = dealer(rng)
+        wins = list(observation.wins)
+        leader = observation.leader
+        trick = list(root_trick)
+        best, position, offset = root_best, root_position, root_offset
+
+        node = root
+        path: List[Tuple[_Node, int]] = list()
+        expanding = True
+        while True:
+
+            player = (leader + len(trick)) % n_seats
+            hand = hands[player]
+            if not hand:
+                break
+
+            moves = hand
+            if trick:
+                moves = hand & SUIT_MASKS[trick[0] // N_VALUES] or hand
+
+            if expanding:
+                # the moves of the node legal in this deal
+                children = node.children
+                untried = list()
+                chosen = None
+                best_score = -1.
+                remaining = moves
+                while remaining:
+                    card = remaining & -remaining
+                    remaining ^= card
+                    index = card.bit_length() - 1
+                    child = children.get(index)
+                    if child is None:
+                        untried.append(index)
+                        continue
+                    child.available += 1
+                    if not untried:
+                        score = child.reward / child.visits + exploration * \
+                            sqrt(log(child.available) / child.visits)
+                        if score > best_score:
+                            best_score = score
+                            chosen = index
+                if untried:
+                    index = untried[int(rand() * len(untried))]
+                    node = children[index] = _Node()
+                    expanding = False
+                else:
+                    index = chosen
+                    node = children[index]
+                path.append((node, player))
+
+            else:
+                # random playout
+                if moves & (moves - 1):
+                    draw = int(rand() * bin(moves).count('1'))
+                    while draw:
+                        moves &= moves - 1
+                        draw -= 1
+                index = (moves & -moves).bit_length() - 1
+
+            hands[player] = hand ^ (1 << index)
+            if not trick:
+                offset = offsets[index // N_VALUES]
+                best, position = index, 0
+            elif BEATS[offset + index * N_CARDS + best]:
+                best, position = index, len(trick)
+            trick.append(index)
+
+            if len(trick) == n_seats:
+                winner = (leader + position) % n_seats
+                wins[winner] += 1
+                if winner_leads:
+                    leader = winner
+                trick = list()
+
+        for node, player in path:
+            node.visits += 1
+            node.reward += rewards[player][wins[player]]
+
+    return {
+        index: (child.visits, child.reward)
+        for index, child in root.children.items()
+    }
+
+
+def rollout(
+    observation: Observation, n_iterations: Optional[int] = 1000,
+    time_limit: Optional[float] = None, rng: Optional[random.Random] = None
+) -> List[int]:
+
+    """
+    Deals the unseen cards at random and plays the rest of the round at
+    random, counting the tricks won by the player.
+
+    :param observation: The observation of the player.
+    :type observation: Observation
+    :param n_iterations: The number of playouts, None for no limit.
+    :type n_iterations: Optional[int]
+    :param time_limit: The time after which the playouts stop, in seconds,
+                       None for no limit.
+    :type time_limit: Optional[float]
+    :param rng: The random number generator.
+    :type rng: Optional[random.Random]
+
+    :return: The number of playouts ending with each number of tricks won by
+             the player, from 0 to the number of tricks of the round.
+    :rtype: List[int]
+
+    :raises ValueError: If there is neither an iteration nor a time limit.
+    """
+
+    if n_iterations is None and time_limit is None:
+        raise ValueError(
+            "`n_iterations` or `time_limit` should be given"
+        )
+    if rng is None:
+        rng = random.Random()
+
+    n_seats = len(observation.n_cards)
+    seat = observation.seat
+    winner_leads = observation.winner_leads
+    offsets = [
+        beats_offset(suit, observation.trump_suit) for suit in range(N_SUITS)
+    ]
+
+    root_trick = list(observation.trick)
+    root_best = root_position = 0
+    if root_trick:
+        root_position = trick_winner_position(
+            root_trick, observation.trump_suit
+        )
+        root_best = root_trick[root_position]
+    root_offset = offsets[root_trick[0] // N_VALUES] if root_trick else 0
+
+    n_tricks = observation.wins[seat] + observation.n_cards[seat]
+    counts = [0] * (n_tricks + 1)
+    dealer = _Dealer(observation)
+    rand = rng.random
+    deadline = None if time_limit is None \
+        else time.perf_counter() + time_limit
+    iteration = 0
+    while n_iterations is None or iteration < n_iterations:
+
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        iteration += 1
+
+        hands = dealer(rng)
+        wins = observation.wins[seat]
+        leader = observation.leader
+        trick = list(root_trick)
+        best, position, offset = root_best, root_position, root_offset
+        while True:
+
+            player = (leader + len(trick)) % n_seats
+            moves = hand = hands[player]
+            if not hand:
+                break
+            if trick:
+                moves = hand & SUIT_MASKS[trick[0] // N_VALUES] or hand
+
+            if moves & (moves - 1):
+                draw = int(rand() * bin(moves).count('1'))
+                while draw:
+                    moves &= moves - 1
+                    draw -= 1
+            index = (moves & -moves).bit_length() - 1
+
+            hands[player] = hand ^ (1 << index)
+            if not trick:
+                offset = offsets[index // N_VALUES]
+                best, position = index, 0
+            elif BEATS[offset + index * N_CARDS + best]:
+                best, position = index, len(trick)
+            trick.append(index)
+
+            if len(trick) == n_seats:
+                winner = (leader + position) % n_seats
+                if winner == seat:
+                    wins += 1
+                if winner_leads:
+                    leader = winner
+                trick = list()
+
+        counts[wins] += 1
+
+    return counts
+
+
+class ISMCTSCardSelectionStrategy(AbstractCardSelectionStrategy):
+
+    """
+    Strategy selecting the card played most often by an information set
+    Monte Carlo tree search, within an iteration or a time budget.
+
+    The strategy needs the whole game state, so the player has to be
+    notified of it (see `AbstractPlayer.notified_events`).
+
+    :param n_iterations: The number of iterations of a search, None for no
+                         limit.
+    :type n_iterations: Optional[int]
+    :param time_limit: The time after which a search stops, in seconds, None
+                       for no limit.
+    :type time_limit: Optional[float]
+    :param point_attribution_strategy: The strategy used for attributing
+                                       points to players.
+    :type point_attribution_strategy: AbstractPointAttributionStrategy
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the round leads every trick,
+                         like in `GameEngine`.
+    :type winner_leads: bool
+    :param seed: Seed for the random number generator.
+    :type seed: Optional[int]
+
+    :raises ValueError: If there is neither an iteration nor a time limit.
+
+    :Example:
+        >>> player = Player(
+        ...     1, ISMCTSCardSelectionStrategy(n_iterations=500),
+        ...     RandomBidSelectionStrategy()
+        ... )
+    """
+
+    def __init__(
+        self, n_iterations: Optional[int] = 200,
+        time_limit: Optional[float] = None,
+        point_attribution_strategy: AbstractPointAttributionStrategy =
+        DefaultPointAttributionStrategy(),
+        winner_leads: bool = False, seed: Optional[int] = None
+    ):
+
+        if n_iterations is None and time_limit is None:
+            raise ValueError(
+                "`n_iterations` or `time_limit` should be given"
+            )
+
+        self._n_iterations = n_iterations
+        self._time_limit = time_limit
+        self._point_attribution_strategy = point_attribution_strategy
+        self._winner_leads = winner_leads
+        self._random = random.Random(seed)
+
+    def select_card(
+        self, hand: List[Card], authorised_cards: List[Card],
+        game_state: GameState
+    ) -> Optional[Card]:
+
+        """
+        Selects the card played most often by the search.
+
+        :param hand: The current hand of the player.
+        :type hand: List[Card]
+        :param authorised_cards: Cards that are allowed to be played based on
+                                 the game rules.
+        :type authorised_cards: List[Card]
+        :param game_state: The current state of the game.
+        :type game_state: GameState
+        :return: The selected card or None if no card can be selected.
+        :rtype: Optional[Card]
+        """
+
+        if len(authorised_cards) < 2:
+            return authorised_cards[0] if authorised_cards else None
+
+        observation = observe(
+            hand, game_state, self._point_attribution_strategy,
+            self._winner_leads
+        )
+        stats = self._search(observation)
+
+        return max(
+            authorised_cards,
+            key=lambda card: stats.get(card_to_index(card), (0, 0.))
+        )
+
+    def _search(
+        self, observation: Observation
+    ) -> Dict[int, Tuple[int, float]]:
+
+        """
+        Runs the search of a decision.
+
+        :param observation: The observation of the player.
+        :type observation: Observation
+
+        :return: The number of visits and the total reward of each card, by
+                 card index.
+        :rtype: Dict[int, Tuple[int, float]]
+        """
+
+        return search(
+            observation, self._n_iterations, self._time_limit, self._random
+        )
+
+    def reseed(self, seed: int):
+
+        """
+        :param seed: The new seed of the random number generator.
+        :type seed: int
+        """
+
+        self._random.seed(seed)
+
+
+class ISMCTSBidSelectionStrategy(AbstractBidSelectionStrategy):
+
+    """
+    Strategy selecting the bid with the best expected points over random
+    playouts of the round (see `rollout`), within an iteration or a time
+    budget.
+
+    The strategy needs the whole game state, so the player has to be
+    notified of it (see `AbstractPlayer.notified_events`). The number of
+    players is read from the previous round when it isn't given.
+
+    :param n_iterations: The number of playouts of a decision, None for no
+                         limit.
+    :type n_iterations: Optional[int]
+    :param time_limit: The time after which the playouts of a decision stop,
+                       in seconds, None for no limit.
+    :type time_limit: Optional[float]
+    :param n_players: The number of players, None to read it from the
+                      previous round.
+    :type n_players: Optional[int]
+    :param point_attribution_strategy: The strategy used for attributing
+                                       points to players.
+    :type point_attribution_strategy: AbstractPointAttributionStrategy
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the round leads every trick,
+                         like in `GameEngine`.
+    :type winner_leads: bool
+    :param seed: Seed for the random number generator.
+    :type seed: Optional[int]
+
+    :raises ValueError: If there is neither an iteration nor a time limit.
+
+    :Example:
+        >>> player = Player(
+        ...     1, ISMCTSCardSelectionStrategy(),
+        ...     ISMCTSBidSelectionStrategy(n_players=4)
+        ... )
+    """
+
+    def __init__(
+        self, n_iterations: Optional[int] = 1000,
+        time_limit: Optional[float] = None, n_players: Optional[int] = None,
+        point_attribution_strategy: AbstractPointAttributionStrategy =
+        DefaultPointAttributionStrategy(),
+        winner_leads: bool = False, seed: Optional[int] = None
+    ):
+
+        if n_iterations is None and time_limit is None:
+            raise ValueError(
+                "`n_iterations` or `time_limit` should be given"
+            )
+
+        self._n_iterations = n_iterations
+        self._time_limit = time_limit
+        self._n_players = n_players
+        self._point_attribution_strategy = point_attribution_strategy
+        self._winner_leads = winner_leads
+        self._random = random.Random(seed)
+
+    def select_bid(
+        self, hand: List[Card], authorised_bids: List[int],
+        game_state: GameState
+    ) -> Optional[int]:
+
+        """
+        Selects the bid with the best expected points over the playouts.
+
+        :param hand: The current hand of the player.
+        :type hand: List[Card]
+        :param authorised_bids: Bids that are allowed to be played based on
+                                the game rules.
+        :type authorised_bids: List[int]
+        :param game_state: The current state of the game.
+        :type game_state: GameState
+        :return: The selected bid or None if no bid can be selected.
+        :rtype: Optional[int]
+
+        :raises ValueError: If the number of players isn't given and there
+                            is no previous round.
+        """
+
+        if len(authorised_bids) < 2:
+            return authorised_bids[0] if authorised_bids else None
+
+        n_players = self._n_players
+        if n_players is None:
+            if not game_state.rounds:
+                raise ValueError(
+                    "`n_players` should be given for the first round"
+                )
+            n_players = len(game_state.rounds[-1].bid_by_player_id)
+
+        observation = observe_bidding(
+            hand, game_state, n_players, self._winner_leads
+        )
+        counts = self._rollout(observation)
+
+        def expected_points(bid: int) -> int:
+            return sum(
+                count * self._point_attribution_strategy.attribute_points(
+                    {0: n_wins}, {0: bid}
+                )[0]
+                for n_wins, count in enumerate(counts) if count
+            )
+
+        return max(authorised_bids, key=expected_points)
+
+    def _rollout(self, observation: Observation) -> List[int]:
+
+        """
+        Runs the playouts of a decision.
+
+        :param observation: The observation of the player.
+        :type observation: Observation
+
+        :return: The number of playouts ending with each number of tricks won
+                 by the player.
+        :rtype: List[int]
+        """
+
+        return rollout(
+            observation, self._n_iterations, self._time_limit, self._random
+        )
+
+    def reseed(self, seed: int):
+
+        """
+        :param seed: The new seed of the random number generator.
+        :type seed: int
+        """
+
+        self._random.seed(seed)
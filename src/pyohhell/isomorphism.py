@@ -0,0 +1,201 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Suit isomorphism: positions that only differ by a renaming of the suits.
+
+The four suits play the same role except for the trump suit and, within a
+trick, the suit led. Renaming the other suits (and the trump and lead suits
+together with them) gives a position with the same outcome, so caches and
+tables only need to hold one position of each class: the canonical one,
+where the trump suit is suit 0, the suit led is suit 1 and the other suits
+come next, ordered by the cards each seat holds in them. A class holds up to
+6 positions with the trump suit fixed, and up to 24 over all trump suits.
+
+The canonical position comes with the permutation applied, to map the moves
+found in it back to the original position (see `invert_permutation`).
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Sequence, Tuple
+
+from src.pyohhell.cards import N_SUITS, N_VALUES, SUIT_MASKS
+
+
+_SUIT_MASK = SUIT_MASKS[0]
+
+Permutation = Tuple[int, ...]
+
+
+class CanonicalPosition(NamedTuple):
+
+    """
+    The canonical representative of a position, the trump suit being suit 0
+    and the suit led, if not the trump suit, suit 1.
+
+    :param hands: The bitmask of the hand of each seat.
+    :param trick: The indices of the cards played in the current trick.
+    :param played: The bitmask of the cards played in the previous tricks.
+    :param permutation: The canonical suit of each original suit.
+    """
+
+    hands: Tuple[int, ...]
+    trick: Tuple[int, ...]
+    played: int
+    permutation: Permutation
+
+
+def permute_mask(mask: int, permutation: Permutation) -> int:
+
+    """
+    Renames the suits of the cards of a bitmask.
+
+    :param mask: The bitmask of the cards.
+    :type mask: int
+    :param permutation: The new suit of each suit.
+    :type permutation: Permutation
+
+    :return: The bitmask of the renamed cards.
+    :rtype: int
+
+    :Example:
+        >>> # the two of spades (suit 0) becomes the two of diamonds (suit 2)
+        >>> permute_mask(1, (2, 1, 0, 3)) == 1 << 26
+        True
+    """
+
+    permuted = 0
+    for suit, new_suit in enumerate(permutation):
+        permuted |= (mask >> (suit * N_VALUES) & _SUIT_MASK) << \
+            (new_suit * N_VALUES)
+
+    return permuted
+
+
+def permute_index(index: int, permutation: Permutation) -> int:
+
+    """
+    Renames the suit of a card.
+
+    :param index: The index of the card (see `cards.card_to_index`).
+    :type index: int
+    :param permutation: The new suit of each suit.
+    :type permutation: Permutation
+
+    :return: The index of the renamed card.
+    :rtype: int
+    """
+
+    suit, rank = divmod(index, N_VALUES)
+
+    return permutation[suit] * N_VALUES + rank
+
+
+def invert_permutation(permutation: Permutation) -> Permutation:
+
+    """
+    The permutation undoing a permutation of the suits.
+
+    :param permutation: The new suit of each suit.
+    :type permutation: Permutation
+
+    :return: The original suit of each new suit.
+    :rtype: Permutation
+
+    :Example:
+        >>> invert_permutation((2, 0, 1, 3))
+        (1, 2, 0, 3)
+    """
+
+    inverse = [0] * len(permutation)
+    for suit, new_suit in enumerate(permutation):
+        inverse[new_suit] = suit
+
+    return tuple(inverse)
+
+
+def canonical_permutation(
+    masks: Sequence[int], fixed_suits: Sequence[int] = ()
+) -> Permutation:
+
+    """
+    The permutation giving the canonical renaming of the suits of a set of
+    bitmasks: the fixed suits become suits 0, 1, ... in order, and the other
+    suits follow, by decreasing pattern of cards over the bitmasks. Two sets
+    of bitmasks get the same renamed bitmasks if and only if they differ by
+    a renaming of the suits keeping the fixed suits in order.
+
+    :param masks: The bitmasks, e.g. the hands of the seats.
+    :type masks: Sequence[int]
+    :param fixed_suits: The suits with a role of their own, e.g. the trump
+                        suit, without duplicates.
+    :type fixed_suits: Sequence[int]
+
+    :return: The new suit of each suit.
+    :rtype: Permutation
+
+    :raises ValueError: If a fixed suit isn't a suit or is repeated.
+    """
+
+    if len(set(fixed_suits)) != len(fixed_suits) or \
+            not all(0 <= suit < N_SUITS for suit in fixed_suits):
+        raise ValueError("`fixed_suits` should be distinct suit indices")
+
+    free_suits = sorted(
+        (suit for suit in range(N_SUITS) if suit not in fixed_suits),
+        key=lambda suit: tuple(
+            mask >> (suit * N_VALUES) & _SUIT_MASK for mask in masks
+        ),
+        reverse=True
+    )
+
+    permutation = [0] * N_SUITS
+    for new_suit, suit in enumerate((*fixed_suits, *free_suits)):
+        permutation[suit] = new_suit
+
+    return tuple(permutation)
+
+
+def canonicalise(
+    hands: Sequence[int], trump_suit: int, trick: Sequence[int] = (),
+    played: int = 0
+) -> CanonicalPosition:
+
+    """
+    Maps a position of a round to the canonical position of its class.
+
+    :param hands: The bitmask of the hand of each seat.
+    :type hands: Sequence[int]
+    :param trump_suit: The index of the trump suit.
+    :type trump_suit: int
+    :param trick: The indices of the cards played in the current trick.
+    :type trick: Sequence[int]
+    :param played: The bitmask of the cards played in the previous tricks,
+                   if they matter to the cache.
+    :type played: int
+
+    :return: The canonical position and the permutation applied.
+    :rtype: CanonicalPosition
+
+    :Example:
+        >>> position = canonicalise(hands, trump_suit)
+        >>> card = position_card_cache[position.hands]
+        >>> permute_index(card, invert_permutation(position.permutation))
+    """
+
+    fixed_suits = [trump_suit]
+    if trick and trick[0] // N_VALUES != trump_suit:
+        fixed_suits.append(trick[0] // N_VALUES)
+
+    masks = list(hands)
+    for index in trick:
+        masks.append(1 << index)
+    masks.append(played)
+    permutation = canonical_permutation(masks, fixed_suits)
+
+    return CanonicalPosition(
+        tuple(permute_mask(hand, permutation) for hand in hands),
+        tuple(permute_index(index, permutation) for index in trick),
+        permute_mask(played, permutation), permutation
+    )
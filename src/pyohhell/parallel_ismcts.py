@@ -0,0 +1,557 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+ISMCTS card and bid strategies running their searches on a persistent pool
+of worker processes.
+
+A decision is split into one task per worker, each running an independent
+search (root parallelisation) with its own stream of random numbers; the
+statistics of the root moves are then summed before choosing. The workers
+are started once, warmed up (modules imported, caches filled) and reused by
+every decision, so a decision only pays for sending the observation and
+receiving the statistics.
+
+With a time limit, the tasks stop a margin before the deadline of the
+decision, so that the results are back in time; the tasks still running at
+the deadline are left out of the merge. The tasks are given the absolute
+`time.monotonic` time to stop at, the clock being shared by the processes,
+so the time a task waits for its worker isn't added to its search.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import atexit
+import logging
+import os
+import random
+import time
+
+from src.pyohhell.game_state import (
+    AbstractPointAttributionStrategy,
+    DefaultPointAttributionStrategy
+)
+from src.pyohhell.ismcts import (
+    ISMCTSBidSelectionStrategy,
+    ISMCTSCardSelectionStrategy,
+    Observation,
+    rollout,
+    search
+)
+from src.pyohhell.rng import derive_seed
+
+
+# the part of the time limit of a decision kept for sending the tasks and
+# merging their results, and its minimum in seconds
+_DEADLINE_MARGIN = 0.05
+_MIN_DEADLINE_MARGIN = 0.002
+
+
+def _warm_up_worker():
+
+    """
+    Initialises a worker process: runs a tiny search and a few playouts so
+    that the modules are imported and their caches filled before the first
+    decision.
+    """
+
+    observation = Observation(
+        0, 1, 2, (1, 1), (0, 0), 0, (), (0, 0), ((0., 1.), (0., 1.)), 0,
+        False
+    )
+    search(observation, 2, rng=random.Random(0))
+    rollout(observation, 2, rng=random.Random(0))
+
+
+def _ping() -> int:
+
+    """
+    Task used to start the workers of a pool.
+
+    :return: The process id of the worker.
+    :rtype: int
+    """
+
+    return os.getpid()
+
+
+def _time_left(task_deadline: Optional[float]) -> Optional[float]:
+
+    """
+    The time left to a task before its deadline.
+
+    :param task_deadline: The `time.monotonic` time at which the task stops,
+                          None for no limit.
+    :type task_deadline: Optional[float]
+
+    :return: The time left, in seconds, None for no limit.
+    :rtype: Optional[float]
+    """
+
+    if task_deadline is None:
+        return None
+
+    return max(task_deadline - time.monotonic(), 0.)
+
+
+def _search_task(
+    observation: Observation, n_iterations: Optional[int],
+    task_deadline: Optional[float], seed: int, exploration: float
+) -> Dict[int, Tuple[int, float]]:
+
+    """
+    Runs the ISMCTS of a task (see `ismcts.search`).
+    """
+
+    return search(
+        observation, n_iterations, _time_left(task_deadline),
+        random.Random(seed), exploration
+    )
+
+
+def _rollout_task(
+    observation: Observation, n_iterations: Optional[int],
+    task_deadline: Optional[float], seed: int
+) -> List[int]:
+
+    """
+    Runs the playouts of a task (see `ismcts.rollout`).
+    """
+
+    return rollout(
+        observation, n_iterations, _time_left(task_deadline),
+        random.Random(seed)
+    )
+
+
+def merge_search_stats(
+    stats: Sequence[Dict[int, Tuple[int, float]]]
+) -> Dict[int, Tuple[int, float]]:
+
+    """
+    Sums the statistics of the root moves of independent searches.
+
+    :param stats: The number of visits and the total reward of each card, by
+                  card index, one dictionary per search.
+    :type stats: Sequence[Dict[int, Tuple[int, float]]]
+
+    :return: The summed number of visits and total reward of each card.
+    :rtype: Dict[int, Tuple[int, float]]
+
+    :Example:
+        >>> merge_search_stats([{3: (2, 1.)}, {3: (1, .5), 7: (1, 0.)}])
+        {3: (3, 1.5), 7: (1, 0.0)}
+    """
+
+    merged: Dict[int, Tuple[int, float]] = dict()
+    for task_stats in stats:
+        for index, (visits, reward) in task_stats.items():
+            total_visits, total_reward = merged.get(index, (0, 0.))
+            merged[index] = (total_visits + visits, total_reward + reward)
+
+    return merged
+
+
+def merge_rollout_counts(counts: Sequence[List[int]]) -> List[int]:
+
+    """
+    Sums the counts of tricks won of independent playouts.
+
+    :param counts: The number of playouts ending with each number of tricks
+                   won, one list per task.
+    :type counts: Sequence[List[int]]
+
+    :return: The summed counts.
+    :rtype: List[int]
+    """
+
+    merged: List[int] = list()
+    for task_counts in counts:
+        if len(task_counts) > len(merged):
+            merged += [0] * (len(task_counts) - len(merged))
+        for n_wins, count in enumerate(task_counts):
+            merged[n_wins] += count
+
+    return merged
+
+
+class RolloutPool:
+
+    """
+    Persistent pool of warmed up worker processes running the tasks of the
+    searches, shared by any number of strategies.
+
+    The processes are started on the first decision (or by `start`) and kept
+    until `close`; the pool can also be used as a context manager. With a
+    single worker, the tasks run in the current process.
+
+    :param workers: The number of worker processes, None to use the number
+                    of CPUs.
+    :type workers: Optional[int]
+
+    :raises ValueError: If `workers` is smaller than 1.
+
+    :Example:
+        >>> with RolloutPool(workers=4) as pool:
+        ...     player = Player(
+        ...         1, ParallelISMCTSCardSelectionStrategy(
+        ...             time_limit=0.1, pool=pool
+        ...         ),
+        ...         ParallelISMCTSBidSelectionStrategy(
+        ...             time_limit=0.1, n_players=4, pool=pool
+        ...         )
+        ...     )
+        ...     ...
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+
+        if workers is not None and workers < 1:
+            raise ValueError("`workers` should be greater than 0")
+
+        self._workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def workers(self) -> int:
+
+        """
+        The number of workers, and of tasks per decision.
+
+        :return: The number of workers.
+        :rtype: int
+        """
+
+        return self._workers
+
+    def start(self):
+
+        """
+        Starts and warms up the worker processes, if they aren't running.
+        """
+
+        if self._executor is not None or self._workers == 1:
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._workers, initializer=_warm_up_worker
+        )
+        # the executor starts its processes on demand
+        for future in [
+            self._executor.submit(_ping) for _ in range(self._workers)
+        ]:
+            future.result()
+
+    def run(
+        self, function: Callable[..., Any], tasks: Sequence[Tuple],
+        deadline: Optional[float] = None
+    ) -> List[Any]:
+
+        """
+        Runs tasks on the workers and returns the results of the ones done by
+        the deadline.
+
+        :param function: The module level function running a task.
+        :type function: Callable[..., Any]
+        :param tasks: The arguments of each task.
+        :type tasks: Sequence[Tuple]
+        :param deadline: The `time.monotonic` time after which the results
+                         aren't waited for, None to wait for all of them.
+        :type deadline: Optional[float]
+
+        :return: The results of the tasks done, in the order of `tasks`.
+        :rtype: List[Any]
+        """
+
+        if self._workers == 1:
+            return [function(*task) for task in tasks]
+
+        self.start()
+        futures = [self._executor.submit(function, *task) for task in tasks]
+        timeout = None if deadline is None \
+            else max(deadline - time.monotonic(), 0.)
+        done, _ = wait(futures, timeout, FIRST_EXCEPTION)
+
+        return [future.result() for future in futures if future in done]
+
+    def close(self):
+
+        """
+        Stops the worker processes. The pool restarts them if it is used
+        again.
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> RolloutPool:
+
+        self.start()
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.close()
+
+
+_default_pool: Optional[RolloutPool] = None
+
+
+def default_pool() -> RolloutPool:
+
+    """
+    The pool shared by the strategies created without a pool, with a worker
+    per CPU. It is created on first use and closed when the interpreter
+    exits.
+
+    :return: The default pool.
+    :rtype: RolloutPool
+    """
+
+    global _default_pool
+
+    if _default_pool is None:
+        _default_pool = RolloutPool()
+        atexit.register(_default_pool.close)
+
+    return _default_pool
+
+
+def _task_budgets(
+    pool: RolloutPool, n_iterations: Optional[int],
+    time_limit: Optional[float]
+) -> Tuple[List[Optional[int]], Optional[float], Optional[float]]:
+
+    """
+    Splits the budget of a decision between the tasks.
+
+    :param pool: The pool running the tasks.
+    :type pool: RolloutPool
+    :param n_iterations: The number of iterations of the decision, None for
+                         no limit.
+    :type n_iterations: Optional[int]
+    :param time_limit: The time limit of the decision, in seconds, None for
+                       no limit.
+    :type time_limit: Optional[float]
+
+    :return: The number of iterations of each task, the `time.monotonic`
+             time at which the tasks stop and the deadline of the decision.
+    :rtype: Tuple[List[Optional[int]], Optional[float], Optional[float]]
+    """
+
+    n_tasks = pool.workers
+    if n_iterations is None:
+        iterations = [None] * n_tasks
+    else:
+        iterations = [
+            n_iterations // n_tasks + (task < n_iterations % n_tasks)
+            for task in range(n_tasks)
+        ]
+
+    if time_limit is None:
+        return iterations, None, None
+
+    deadline = time.monotonic() + time_limit
+    task_deadline = deadline - max(
+        time_limit * _DEADLINE_MARGIN, _MIN_DEADLINE_MARGIN
+    )
+
+    return iterations, task_deadline, deadline
+
+
+class ParallelISMCTSCardSelectionStrategy(ISMCTSCardSelectionStrategy):
+
+    """
+    `ISMCTSCardSelectionStrategy` running one search per worker of a
+    `RolloutPool` and selecting the card with the most visits over all the
+    searches.
+
+    For a given seed, the selected cards only depend on the number of
+    workers when the searches are limited by iterations.
+
+    :param n_iterations: The number of iterations of a decision, split
+                         between the workers, None for no limit.
+    :type n_iterations: Optional[int]
+    :param time_limit: The time given to a decision, in seconds, None for no
+                       limit.
+    :type time_limit: Optional[float]
+    :param point_attribution_strategy: The strategy used for attributing
+                                       points to players.
+    :type point_attribution_strategy: AbstractPointAttributionStrategy
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the round leads every trick,
+                         like in `GameEngine`.
+    :type winner_leads: bool
+    :param seed: Seed for the random number generator.
+    :type seed: Optional[int]
+    :param pool: The pool running the searches, None for the pool shared by
+                 the strategies (see `default_pool`).
+    :type pool: Optional[RolloutPool]
+    :param exploration: The exploration constant of UCB1.
+    :type exploration: float
+
+    :raises ValueError: If there is neither an iteration nor a time limit.
+    """
+
+    def __init__(
+        self, n_iterations: Optional[int] = None,
+        time_limit: Optional[float] = 0.1,
+        point_attribution_strategy: AbstractPointAttributionStrategy =
+        DefaultPointAttributionStrategy(),
+        winner_leads: bool = False, seed: Optional[int] = None,
+        pool: Optional[RolloutPool] = None, exploration: float = 0.7
+    ):
+
+        super().__init__(
+            n_iterations, time_limit, point_attribution_strategy,
+            winner_leads, seed
+        )
+
+        self._pool = default_pool() if pool is None else pool
+        self._exploration = exploration
+
+    @property
+    def pool(self) -> RolloutPool:
+
+        """
+        The pool running the searches.
+
+        :return: The pool.
+        :rtype: RolloutPool
+        """
+
+        return self._pool
+
+    def _search(
+        self, observation: Observation
+    ) -> Dict[int, Tuple[int, float]]:
+
+        """
+        Runs the searches of a decision on the pool and merges them.
+
+        :param observation: The observation of the player.
+        :type observation: Observation
+
+        :return: The number of visits and the total reward of each card, by
+                 card index.
+        :rtype: Dict[int, Tuple[int, float]]
+        """
+
+        iterations, task_deadline, deadline = _task_budgets(
+            self._pool, self._n_iterations, self._time_limit
+        )
+        seed = self._random.getrandbits(64)
+        tasks = [
+            (observation, n_iterations, task_deadline,
+             derive_seed(seed, task), self._exploration)
+            for task, n_iterations in enumerate(iterations)
+        ]
+
+        stats = merge_search_stats(
+            self._pool.run(_search_task, tasks, deadline)
+        )
+        if not stats:
+            logging.warning(
+                "No search iteration was done by the deadline, playing the "
+                "first authorised card"
+            )
+
+        return stats
+
+
+class ParallelISMCTSBidSelectionStrategy(ISMCTSBidSelectionStrategy):
+
+    """
+    `ISMCTSBidSelectionStrategy` running the playouts of a decision on the
+    workers of a `RolloutPool`.
+
+    :param n_iterations: The number of playouts of a decision, split between
+                         the workers, None for no limit.
+    :type n_iterations: Optional[int]
+    :param time_limit: The time given to a decision, in seconds, None for no
+                       limit.
+    :type time_limit: Optional[float]
+    :param n_players: The number of players, None to read it from the
+                      previous round.
+    :type n_players: Optional[int]
+    :param point_attribution_strategy: The strategy used for attributing
+                                       points to players.
+    :type point_attribution_strategy: AbstractPointAttributionStrategy
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the round leads every trick,
+                         like in `GameEngine`.
+    :type winner_leads: bool
+    :param seed: Seed for the random number generator.
+    :type seed: Optional[int]
+    :param pool: The pool running the playouts, None for the pool shared by
+                 the strategies (see `default_pool`).
+    :type pool: Optional[RolloutPool]
+
+    :raises ValueError: If there is neither an iteration nor a time limit.
+    """
+
+    def __init__(
+        self, n_iterations: Optional[int] = None,
+        time_limit: Optional[float] = 0.1, n_players: Optional[int] = None,
+        point_attribution_strategy: AbstractPointAttributionStrategy =
+        DefaultPointAttributionStrategy(),
+        winner_leads: bool = False, seed: Optional[int] = None,
+        pool: Optional[RolloutPool] = None
+    ):
+
+        super().__init__(
+            n_iterations, time_limit, n_players, point_attribution_strategy,
+            winner_leads, seed
+        )
+
+        self._pool = default_pool() if pool is None else pool
+
+    @property
+    def pool(self) -> RolloutPool:
+
+        """
+        The pool running the playouts.
+
+        :return: The pool.
+        :rtype: RolloutPool
+        """
+
+        return self._pool
+
+    def _rollout(self, observation: Observation) -> List[int]:
+
+        """
+        Runs the playouts of a decision on the pool and merges them.
+
+        :param observation: The observation of the player.
+        :type observation: Observation
+
+        :return: The number of playouts ending with each number of tricks won
+                 by the player.
+        :rtype: List[int]
+        """
+
+        iterations, task_deadline, deadline = _task_budgets(
+            self._pool, self._n_iterations, self._time_limit
+        )
+        seed = self._random.getrandbits(64)
+        tasks = [
+            (observation, n_iterations, task_deadline,
+             derive_seed(seed, task))
+            for task, n_iterations in enumerate(iterations)
+        ]
+
+        counts = merge_rollout_counts(
+            self._pool.run(_rollout_task, tasks, deadline)
+        )
+        if not any(counts):
+            logging.warning(
+                "No playout was done by the deadline, making the first "
+                "authorised bid"
+            )
+
+        return counts
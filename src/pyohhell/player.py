@@ -3,13 +3,16 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple, Optional
+from typing import Iterable, List, Tuple, Optional, Type
 from abc import abstractmethod, ABC
 import random
 
-from pydecklib.card import Card
+from pydecklib.card import Card, Suit
 
+from src.pyohhell.cards import Hand, cards_to_mask
+from src.pyohhell.events import Event
 from src.pyohhell.game_state import GameState
+from src.pyohhell.rng import derive_seed
 
 
 class AbstractCardSelectionStrategy:
@@ -41,6 +44,19 @@ class AbstractCardSelectionStrategy:
 
         pass
 
+    def reseed(self, seed: int):
+
+        """
+        Reseeds the random number generator of the strategy, if it uses one.
+        The engine reseeds the strategies at the start of a seeded game, so
+        that the game only depends on its seed.
+
+        :param seed: The new seed.
+        :type seed: int
+        """
+
+        pass
+
 
 class RandomCardSelectionStrategy(AbstractCardSelectionStrategy):
 
@@ -55,7 +71,7 @@ class RandomCardSelectionStrategy(AbstractCardSelectionStrategy):
         :type seed: Optional[int]
         """
 
-        self._seed = seed
+        self._random = random.Random(seed)
 
     def select_card(
         self, hand: List[Card], authorised_cards: List[Card],
@@ -77,12 +93,19 @@ class RandomCardSelectionStrategy(AbstractCardSelectionStrategy):
         """
 
         if authorised_cards:
-            if self._seed:
-                random.seed(self._seed)
-            return random.choice(authorised_cards)
+            return self._random.choice(authorised_cards)
         else:
             return None
 
+    def reseed(self, seed: int):
+
+        """
+        :param seed: The new seed of the random number generator.
+        :type seed: int
+        """
+
+        self._random.seed(seed)
+
 
 class FirstCardSelectionStrategy(AbstractCardSelectionStrategy):
 
@@ -144,6 +167,19 @@ class AbstractBidSelectionStrategy:
 
         pass
 
+    def reseed(self, seed: int):
+
+        """
+        Reseeds the random number generator of the strategy, if it uses one.
+        The engine reseeds the strategies at the start of a seeded game, so
+        that the game only depends on its seed.
+
+        :param seed: The new seed.
+        :type seed: int
+        """
+
+        pass
+
 
 class RandomBidSelectionStrategy(AbstractBidSelectionStrategy):
 
@@ -158,7 +194,7 @@ class RandomBidSelectionStrategy(AbstractBidSelectionStrategy):
         :type seed: Optional[int]
         """
 
-        self._seed = seed
+        self._random = random.Random(seed)
 
     def select_bid(
         self, hand: List[Card], authorised_bids: List[int],
@@ -180,12 +216,19 @@ class RandomBidSelectionStrategy(AbstractBidSelectionStrategy):
         """
 
         if authorised_bids:
-            if self._seed:
-                random.seed(self._seed)
-            return random.choice(authorised_bids)
+            return self._random.choice(authorised_bids)
         else:
             return None
 
+    def reseed(self, seed: int):
+
+        """
+        :param seed: The new seed of the random number generator.
+        :type seed: int
+        """
+
+        self._random.seed(seed)
+
 
 class FirstBidSelectionStrategy(AbstractBidSelectionStrategy):
 
@@ -228,8 +271,12 @@ class AbstractPlayer(ABC):
     Properties:
         id: Unique identifier for the player.
         hand: Current set of cards held by the player.
+        notified_events: Event types the player is notified of, None to
+                         receive the whole game state after every move.
     """
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def id(self) -> int:
@@ -256,6 +303,49 @@ class AbstractPlayer(ABC):
 
         pass
 
+    @property
+    def notified_events(self) -> Optional[Tuple[Type[Event], ...]]:
+
+        """
+        Property representing the event types the player is notified of.
+
+        By default (None), the engine calls `update_game_state` after every
+        bid and every card played. A player returning a tuple of event types
+        opts in to the delta protocol instead: it gets the game state once
+        when it subscribes, and then only the events of these types through
+        `notify`. An empty tuple means no notification at all, which suits
+        stateless players.
+
+        :return: The event types the player is notified of, or None.
+        :rtype: Optional[Tuple[Type[Event], ...]]
+        """
+
+        return None
+
+    def notify(self, event: Event):
+
+        """
+        Notify the player of an event of one of its `notified_events` types.
+
+        :param event: The event that just happened.
+        :type event: Event
+        """
+
+        pass
+
+    def reseed(self, seed: int):
+
+        """
+        Reseed the random number generators of the player, if it uses any.
+        The engine reseeds every player at the start of a seeded game with a
+        seed derived from the seed of the game and the player's id.
+
+        :param seed: The new seed.
+        :type seed: int
+        """
+
+        pass
+
     @abstractmethod
     def update_game_state(self, game_state: GameState):
 
@@ -268,6 +358,34 @@ class AbstractPlayer(ABC):
 
         pass
 
+    def remove_from_hand(self, card: Card):
+
+        """
+        Remove a card played on behalf of the player from its hand, e.g. a
+        forced card (see `GameEngine`). By default the card is removed from
+        the list returned by `hand`, players returning a copy override it.
+
+        :param card: The card to remove.
+        :type card: Card
+        :raises ValueError: If the card isn't in the hand.
+        """
+
+        self.hand.remove(card)
+
+    def authorised_cards(self, trick_suit: Optional[Suit]) -> List[Card]:
+
+        """
+        The cards of the player's hand allowed in the current trick (see
+        `game_engine.get_authorised_cards`).
+
+        :param trick_suit: The suit of the current trick.
+        :type trick_suit: Optional[Suit]
+        :return: The authorised cards, in the order of the hand.
+        :rtype: List[Card]
+        """
+
+        return Hand(self.hand).authorised_cards(trick_suit)
+
     @abstractmethod
     def play_card(self, authorised_cards: List[Card]) -> Card:
 
@@ -310,13 +428,19 @@ class Player(AbstractPlayer):
     strategies for card selection and bidding.
     """
 
+    __slots__ = (
+        '_id', '_hand', '_card_selection_strategy',
+        '_bid_selection_strategy', '_game_state', '_notified_events'
+    )
+
     def __init__(
         self, _id: int,
         card_selection_strategy: AbstractCardSelectionStrategy =
         FirstCardSelectionStrategy(),
         bid_selection_strategy: AbstractBidSelectionStrategy =
         FirstBidSelectionStrategy(),
-        initial_hand: Tuple[Card] = tuple()
+        initial_hand: Tuple[Card] = tuple(),
+        notified_events: Optional[Iterable[Type[Event]]] = None
     ):
 
         """
@@ -328,16 +452,22 @@ class Player(AbstractPlayer):
         :type bid_selection_strategy: AbstractBidSelectionStrategy
         :param initial_hand: Initial set of cards for the player's hand.
         :type initial_hand: Tuple[Card]
+        :param notified_events: Event types the player is notified of, None to
+                                receive the whole game state after every
+                                move, see `AbstractPlayer.notified_events`.
+        :type notified_events: Optional[Iterable[Type[Event]]]
         """
         self._id: int = _id
 
-        self._hand: List[Card] = list(initial_hand)
+        self._hand = Hand(initial_hand)
         self._card_selection_strategy: AbstractCardSelectionStrategy = \
             card_selection_strategy
         self._bid_selection_strategy: AbstractBidSelectionStrategy = \
             bid_selection_strategy
 
         self._game_state = GameState()
+        self._notified_events = None if notified_events is None \
+            else tuple(notified_events)
 
     @property
     def id(self) -> int:
@@ -355,13 +485,39 @@ class Player(AbstractPlayer):
     def hand(self) -> List[Card]:
 
         """
-        Property representing the current hand of the player.
+        Property representing the current hand of the player, as a copy:
+        the hand is changed with `add_to_hand` and `remove_from_hand`.
 
         :return: The current set of cards held by the player.
         :rtype: List[Card]
         """
 
-        return self._hand
+        return list(self._hand.cards)
+
+    @property
+    def notified_events(self) -> Optional[Tuple[Type[Event], ...]]:
+
+        """
+        Property representing the event types the player is notified of.
+
+        :return: The event types the player is notified of, or None.
+        :rtype: Optional[Tuple[Type[Event], ...]]
+        """
+
+        return self._notified_events
+
+    def reseed(self, seed: int):
+
+        """
+        Reseed the card and bid selection strategies, with a distinct stream
+        each.
+
+        :param seed: The new seed.
+        :type seed: int
+        """
+
+        self._card_selection_strategy.reseed(derive_seed(seed, 0))
+        self._bid_selection_strategy.reseed(derive_seed(seed, 1))
 
     def add_to_hand(self, card):
 
@@ -370,9 +526,24 @@ class Player(AbstractPlayer):
 
         :param card: The card to add.
         :type card: Card
+        :raises ValueError: If the card is already in the hand.
+        """
+
+        self._hand.add(card)
+
+    def authorised_cards(self, trick_suit: Optional[Suit]) -> List[Card]:
+
+        """
+        The cards of the player's hand allowed in the current trick, taken
+        from the bucket of the suit of the trick.
+
+        :param trick_suit: The suit of the current trick.
+        :type trick_suit: Optional[Suit]
+        :return: The authorised cards, in the order of the hand.
+        :rtype: List[Card]
         """
 
-        self._hand.append(card)
+        return self._hand.authorised_cards(trick_suit)
 
     def update_game_state(self, game_state):
 
@@ -404,12 +575,13 @@ class Player(AbstractPlayer):
 
         if authorised_cards:
 
-            if all(card in self._hand for card in authorised_cards):
+            authorised_mask = cards_to_mask(authorised_cards)
+            if not authorised_mask & ~self._hand.mask:
 
                 played_card = self._card_selection_strategy.select_card(
-                    self._hand, authorised_cards, self._game_state
+                    self._hand.cards, authorised_cards, self._game_state
                 )
-                self._hand.remove(played_card)
+                self.remove_from_hand(played_card)
 
                 return played_card
 
@@ -421,6 +593,18 @@ class Player(AbstractPlayer):
         else:
             raise ValueError("`autorised_cards` shouldn't be empty")
 
+    def remove_from_hand(self, card: Card):
+
+        """
+        Remove a card from the player's hand.
+
+        :param card: The card to remove.
+        :type card: Card
+        :raises ValueError: If the card isn't in the hand.
+        """
+
+        self._hand.remove(card)
+
     def make_bid(self, authorised_bids: List[int]) -> int:
 
         """
@@ -437,7 +621,7 @@ class Player(AbstractPlayer):
 
         if authorised_bids:
             trick_bet = self._bid_selection_strategy.select_bid(
-                self._hand, authorised_bids, self._game_state
+                self._hand.cards, authorised_bids, self._game_state
             )
 
             return trick_bet
@@ -0,0 +1,156 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import List, Optional
+import random
+
+
+_MASK_64 = (1 << 64) - 1
+
+# stream domains, so that the streams of the rounds and of the players of a
+# game never collide
+_ROUND_STREAM = 0
+_PLAYER_STREAM = 1
+
+
+def _splitmix64(x: int) -> int:
+
+    """
+    One step of the SplitMix64 generator: a bijective mix of a 64-bit
+    counter.
+
+    :param x: The 64-bit counter.
+    :type x: int
+
+    :return: The mixed 64-bit value.
+    :rtype: int
+    """
+
+    x = (x + 0x9E3779B97F4A7C15) & _MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK_64
+
+    return x ^ (x >> 31)
+
+
+def derive_seed(seed: int, *keys: int) -> int:
+
+    """
+    Derives the seed of an independent stream from a master seed and a path
+    of keys (e.g. a domain and a round index).
+
+    The derivation is a pure function of its arguments, like a counter-based
+    generator: any stream can be rebuilt on its own, in any process and in
+    any order, without replaying the other streams.
+
+    :param seed: The master seed, only its 64 lowest bits are used.
+    :type seed: int
+    :param keys: The keys identifying the stream.
+    :type keys: int
+
+    :return: The 64-bit seed of the stream.
+    :rtype: int
+
+    :Example:
+        >>> derive_seed(42, 0, 3) == derive_seed(42, 0, 3)
+        True
+        >>> derive_seed(42, 0, 3) == derive_seed(42, 0, 4)
+        False
+    """
+
+    state = _splitmix64(seed & _MASK_64)
+    for key in keys:
+        state = _splitmix64(state ^ (key & _MASK_64))
+
+    return state
+
+
+def derive_seeds(seed: int, count: int, *keys: int) -> List[int]:
+
+    """
+    Derives the seeds of the streams whose path of keys is `keys` followed
+    by each of 0, ..., `count` - 1, sharing the derivation of the common
+    prefix.
+
+    :param seed: The master seed, only its 64 lowest bits are used.
+    :type seed: int
+    :param count: The number of seeds to derive.
+    :type count: int
+    :param keys: The common prefix of the keys identifying the streams.
+    :type keys: int
+
+    :return: The 64-bit seeds, `derive_seed(seed, *keys, i)` at index i.
+    :rtype: List[int]
+
+    :Example:
+        >>> derive_seeds(42, 2, 0) == [derive_seed(42, 0, 0),
+        ...                            derive_seed(42, 0, 1)]
+        True
+    """
+
+    prefix = derive_seed(seed, *keys)
+
+    return [_splitmix64(prefix ^ i) for i in range(count)]
+
+
+def round_seed(seed: Optional[int], round_idx: int) -> Optional[int]:
+
+    """
+    The seed of the deal of a round of a seeded game.
+
+    :param seed: The seed of the game, None for an unseeded game.
+    :type seed: Optional[int]
+    :param round_idx: The index of the round in the game.
+    :type round_idx: int
+
+    :return: The seed of the round, None for an unseeded game.
+    :rtype: Optional[int]
+    """
+
+    if seed is None:
+        return None
+
+    return derive_seed(seed, _ROUND_STREAM, round_idx)
+
+
+def player_seed(seed: Optional[int], player_id: int) -> Optional[int]:
+
+    """
+    The seed of the strategies of a player in a seeded game.
+
+    :param seed: The seed of the game, None for an unseeded game.
+    :type seed: Optional[int]
+    :param player_id: The identifier of the player.
+    :type player_id: int
+
+    :return: The seed of the player, None for an unseeded game.
+    :rtype: Optional[int]
+    """
+
+    if seed is None:
+        return None
+
+    return derive_seed(seed, _PLAYER_STREAM, player_id)
+
+
+def stream(seed: Optional[int], *keys: int) -> random.Random:
+
+    """
+    Builds the generator of an independent stream.
+
+    :param seed: The master seed, None for a generator seeded from the
+                 operating system.
+    :type seed: Optional[int]
+    :param keys: The keys identifying the stream.
+    :type keys: int
+
+    :return: The generator of the stream.
+    :rtype: random.Random
+    """
+
+    if seed is None:
+        return random.Random()
+
+    return random.Random(derive_seed(seed, *keys))
@@ -0,0 +1,174 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor
+)
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Type
+
+from src.pyohhell.game_engine import GameEngine
+
+
+def _play_seeded_game(
+    engine_factory: Callable[[], GameEngine], seed: Optional[int]
+) -> Dict[int, int]:
+
+    """
+    Builds a fresh game engine and plays a single game with it.
+
+    A new engine is built for every game so that no state (game state,
+    players' hands, ...) leaks from one game to the next.
+
+    :param engine_factory: A callable returning a game engine with its players
+                           already subscribed.
+    :type engine_factory: Callable[[], GameEngine]
+    :param seed: The seed of the game.
+    :type seed: Optional[int]
+
+    :return: The points scored by each player in the game.
+    :rtype: Dict[int, int]
+    """
+
+    game_engine = engine_factory()
+
+    return dict(game_engine.play_game(seed))
+
+
+class Simulator:
+
+    """
+    Plays many independent games, optionally across a pool of workers, and
+    aggregates the points scored by each player.
+
+    Each game is played by a fresh engine built by `engine_factory` and is
+    fully determined by its seed, so the same seeds give the same results
+    whatever the number of workers. The workers are processes by default, in
+    which case the factory must be picklable (a module level function or a
+    `functools.partial` of one). Engines don't share any mutable state, so
+    they can also be run on a `ThreadPoolExecutor`, see `ThreadedSimulator`.
+
+    :param engine_factory: A callable returning a game engine with its players
+                           already subscribed.
+    :type engine_factory: Callable[[], GameEngine]
+    :param workers: The number of worker processes, None to use the number of
+                    CPUs and 1 to play all the games in the current process.
+    :type workers: Optional[int]
+    :param chunksize: The number of games sent to a worker at once.
+    :type chunksize: int
+    :param executor_class: The class of the pool running the workers.
+    :type executor_class: Type[Executor]
+
+    :Example:
+        >>> def engine_factory():
+        ...     game_engine = GameEngine(DefaultPointAttributionStrategy())
+        ...     game_engine.subscribe_player(Player(1))
+        ...     game_engine.subscribe_player(Player(2))
+        ...     return game_engine
+        >>> simulator = Simulator(engine_factory, workers=4)
+        >>> simulator.simulate(range(1, 1001))
+        {1: ..., 2: ...}
+    """
+
+    def __init__(
+        self, engine_factory: Callable[[], GameEngine],
+        workers: Optional[int] = None, chunksize: int = 16,
+        executor_class: Type[Executor] = ProcessPoolExecutor
+    ):
+
+        if workers is not None and workers < 1:
+            raise ValueError("`workers` should be greater than 0")
+
+        if chunksize < 1:
+            raise ValueError("`chunksize` should be greater than 0")
+
+        self._engine_factory = engine_factory
+        self._workers = workers
+        self._chunksize = chunksize
+        self._executor_class = executor_class
+
+    def play_games(
+        self, seeds: Iterable[Optional[int]]
+    ) -> List[Dict[int, int]]:
+
+        """
+        Plays one game per seed and returns the points of every game.
+
+        :param seeds: The seeds of the games to play.
+        :type seeds: Iterable[Optional[int]]
+
+        :return: The points scored by each player, one dictionary per game in
+                 the order of `seeds`.
+        :rtype: List[Dict[int, int]]
+        """
+
+        play_game = partial(_play_seeded_game, self._engine_factory)
+
+        if self._workers == 1:
+            return [play_game(seed) for seed in seeds]
+
+        with self._executor_class(max_workers=self._workers) as executor:
+            return list(
+                executor.map(play_game, seeds, chunksize=self._chunksize)
+            )
+
+    def simulate(self, seeds: Iterable[Optional[int]]) -> Dict[int, int]:
+
+        """
+        Plays one game per seed and sums the points of each player over all
+        the games.
+
+        :param seeds: The seeds of the games to play.
+        :type seeds: Iterable[Optional[int]]
+
+        :return: The total points scored by each player.
+        :rtype: Dict[int, int]
+        """
+
+        total_points_by_player_id = defaultdict(int)
+        for points_by_player_id in self.play_games(seeds):
+            for player_id, points in points_by_player_id.items():
+                total_points_by_player_id[player_id] += points
+
+        return dict(total_points_by_player_id)
+
+
+class ThreadedSimulator(Simulator):
+
+    """
+    Simulator running its games on a pool of threads, each thread hosting its
+    own tables.
+
+    Threads let a single process host many tables without pickling the
+    engines, and spread them across cores on free-threaded CPython builds.
+
+    :param engine_factory: A callable returning a game engine with its players
+                           already subscribed.
+    :type engine_factory: Callable[[], GameEngine]
+    :param workers: The number of worker threads, None to let
+                    `ThreadPoolExecutor` choose it and 1 to play all the games
+                    in the current thread.
+    :type workers: Optional[int]
+    :param chunksize: The number of games sent to a worker at once.
+    :type chunksize: int
+
+    :Example:
+        >>> simulator = ThreadedSimulator(engine_factory, workers=8)
+        >>> simulator.simulate(range(1, 1001))
+        {1: ..., 2: ...}
+    """
+
+    def __init__(
+        self, engine_factory: Callable[[], GameEngine],
+        workers: Optional[int] = None, chunksize: int = 16
+    ):
+
+        super().__init__(
+            engine_factory, workers, chunksize,
+            executor_class=ThreadPoolExecutor
+        )
@@ -0,0 +1,558 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Double-dummy solver: the exact number of tricks each seat can take when every
+hand is known.
+
+With more than two players, the number of tricks of a seat is the number it
+can take against all the other seats playing together to minimise it. Each
+seat is solved with its own alpha-beta search over bitmask hands, where:
+
+- the authorised cards follow `get_authorised_mask` and the tricks are won
+  following `BEATS`, like `Trick.get_winner`;
+- the cards of a hand with no remaining card of another hand between them
+  are equivalent, and only one of them is searched;
+- the cards likely to cause a cutoff are searched first;
+- the bounds of the positions at the start of a trick are kept in a
+  transposition table, the cards being replaced by their rank among the
+  remaining cards of their suit and the suits other than the trump suit
+  being sorted, so that positions differing only by the cards already
+  played or by a renaming of the suits are found there.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+from src.pyohhell.cards import (
+    BEATS,
+    N_CARDS,
+    N_SUITS,
+    N_VALUES,
+    SUIT_MASKS,
+    SUITS,
+    beats_offset,
+    count_cards,
+    trick_winner_position
+)
+from src.pyohhell.game_engine import get_authorised_mask
+from src.pyohhell.transposition import TranspositionTable
+
+
+def _equivalence_classes(moves: int, remaining: int) -> List[int]:
+
+    """
+    Keeps one card of each run of moves with no remaining card of another
+    hand between them, as they all lead to the same tricks.
+
+    :param moves: The bitmask of the authorised cards.
+    :type moves: int
+    :param remaining: The bitmask of the cards still in the hands or in the
+                      current trick.
+    :type remaining: int
+
+    :return: The indices of the highest card of each run.
+    :rtype: List[int]
+    """
+
+    cards = list()
+    for suit_mask in SUIT_MASKS:
+
+        suit_moves = moves & suit_mask
+        if not suit_moves:
+            continue
+        if not suit_moves & (suit_moves - 1):
+            cards.append(suit_moves.bit_length() - 1)
+            continue
+
+        in_run = False
+        suit_remaining = remaining & suit_mask
+        while suit_remaining:
+            index = suit_remaining.bit_length() - 1
+            suit_remaining ^= 1 << index
+            if suit_moves >> index & 1:
+                if not in_run:
+                    cards.append(index)
+                in_run = True
+            else:
+                in_run = False
+
+    return cards
+
+
+class _Search:
+
+    """
+    Alpha-beta search of the number of tricks a seat can take.
+
+    :param n_players: The number of players.
+    :type n_players: int
+    :param trump_suit: The index of the trump suit.
+    :type trump_suit: int
+    :param seat: The seat maximising its tricks.
+    :type seat: int
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of a trick leads every trick.
+    :type winner_leads: bool
+    :param table: The table of the bounds of the positions at the start of a
+                  trick, which can be shared between searches.
+    :type table: TranspositionTable
+    """
+
+    def __init__(
+        self, n_players: int, trump_suit: int, seat: int, winner_leads: bool,
+        table: TranspositionTable
+    ):
+
+        self._n_players = n_players
+        self._trump_suit = trump_suit
+        self._seat = seat
+        self._winner_leads = winner_leads
+        self._offsets = [
+            beats_offset(lead_suit, trump_suit) for lead_suit in range(N_SUITS)
+        ]
+        self._lead_suits = [SUITS[suit] for suit in range(N_SUITS)]
+        # the rank of the cards, trumps above the other suits
+        self._strengths = [
+            index % N_VALUES + (N_VALUES if index // N_VALUES == trump_suit
+                                else 0)
+            for index in range(N_CARDS)
+        ]
+
+        # (lower bound, upper bound) of the tricks taken from the start of a
+        # trick, by position key (see `_key`)
+        self._table = table
+        self.n_nodes = 0
+
+    def search(
+        self, hands: List[int], leader: int, remaining: int,
+        alpha: int, beta: int
+    ) -> int:
+
+        """
+        Searches the number of tricks the seat takes from the start of a
+        trick, within an alpha-beta window.
+
+        :param hands: The bitmask of the hand of each seat.
+        :type hands: List[int]
+        :param leader: The seat leading the trick.
+        :type leader: int
+        :param remaining: The bitmask of the cards in the hands.
+        :type remaining: int
+        :param alpha: The value the seat is already sure to get.
+        :type alpha: int
+        :param beta: The value the other seats are already sure to limit the
+                     seat to.
+        :type beta: int
+
+        :return: The number of tricks, exact if within the window, a bound
+                 otherwise.
+        :rtype: int
+        """
+
+        n_tricks = count_cards(hands[leader])
+        if n_tricks == 0:
+            return 0
+
+        key = self._key(hands, leader, remaining)
+        bounds = self._table.get(key)
+        lower, upper = bounds if bounds is not None \
+            else self._bounds(hands, n_tricks)
+        if lower >= beta or lower == upper:
+            return lower
+        if upper <= alpha:
+            return upper
+        alpha = max(alpha, lower)
+        beta = min(beta, upper)
+
+        value = self.play(hands, leader, [], 0, 0, remaining, alpha, beta)
+
+        if value <= alpha:
+            upper = value
+        elif value >= beta:
+            lower = value
+        else:
+            lower = upper = value
+        self._table.store(key, (lower, upper), n_tricks)
+
+        return value
+
+    def _key(
+        self, hands: List[int], leader: int, remaining: int
+    ) -> Tuple[int, ...]:
+
+        """
+        The key of a position at the start of a trick in the transposition
+        table. The cards are replaced by their rank among the remaining cards
+        of their suit, as only the order of the remaining cards matters:
+        positions differing by the cards already played share their key.
+        The suits other than the trump suit are then sorted, as positions
+        differing by a renaming of them have the same value (see
+        `isomorphism`). The key starts with the parameters of the search, so
+        that a table can be shared by searches for other seats and leading
+        rules, and for other trump suits.
+
+        :param hands: The bitmask of the hand of each seat.
+        :type hands: List[int]
+        :param leader: The seat leading the trick.
+        :type leader: int
+        :param remaining: The bitmask of the cards in the hands.
+        :type remaining: int
+
+        :return: The key of the position.
+        :rtype: Tuple[int, ...]
+        """
+
+        suits = list()
+        for suit_mask in SUIT_MASKS:
+            suit_remaining = remaining & suit_mask
+            rank = 0
+            relative_hands = [0] * self._n_players
+            while suit_remaining:
+                card = suit_remaining & -suit_remaining
+                suit_remaining ^= card
+                for seat, hand in enumerate(hands):
+                    if hand & card:
+                        relative_hands[seat] |= 1 << rank
+                        break
+                rank += 1
+            suits.append(tuple(relative_hands))
+
+        trumps = suits.pop(self._trump_suit)
+        suits.sort(reverse=True)
+
+        return (
+            self._seat, self._winner_leads, leader, *trumps, *suits[0],
+            *suits[1], *suits[2]
+        )
+
+    def _bounds(self, hands: List[int], n_tricks: int) -> Tuple[int, int]:
+
+        """
+        Bounds the number of tricks the seat takes from the start of a trick
+        with the top trumps: a trump higher than all the trumps of the other
+        hands wins the trick it is played in.
+
+        :param hands: The bitmask of the hand of each seat.
+        :type hands: List[int]
+        :param n_tricks: The number of tricks left.
+        :type n_tricks: int
+
+        :return: The lower and upper bounds.
+        :rtype: Tuple[int, int]
+        """
+
+        trump_mask = SUIT_MASKS[self._trump_suit]
+        seat_trumps = hands[self._seat] & trump_mask
+        seat_top = seat_trumps.bit_length()
+
+        # the trumps of the seat above every other trump, and the other way
+        # round; the top trumps of distinct hands may fall in the same trick
+        other_trumps = 0
+        upper = n_tricks
+        for seat, hand in enumerate(hands):
+            if seat != self._seat:
+                other_trumps |= hand & trump_mask
+                upper = min(
+                    upper, n_tricks - count_cards(
+                        (hand & trump_mask) >> seat_top
+                    )
+                )
+        lower = count_cards(seat_trumps >> other_trumps.bit_length())
+
+        return lower, upper
+
+    def play(
+        self, hands: List[int], leader: int, trick: List[int], best: int,
+        best_position: int, remaining: int, alpha: int, beta: int
+    ) -> int:
+
+        """
+        Searches the moves of the seat to play in the current trick, or
+        resolves the trick once it is complete.
+
+        :param hands: The bitmask of the hand of each seat.
+        :type hands: List[int]
+        :param leader: The seat leading the current trick.
+        :type leader: int
+        :param trick: The cards played in the current trick.
+        :type trick: List[int]
+        :param best: The card winning the current trick so far.
+        :type best: int
+        :param best_position: The position of this card in the trick.
+        :type best_position: int
+        :param remaining: The bitmask of the cards in the hands and in the
+                          current trick.
+        :type remaining: int
+        :param alpha: The value the seat is already sure to get.
+        :type alpha: int
+        :param beta: The value the other seats are already sure to limit the
+                     seat to.
+        :type beta: int
+
+        :return: The number of tricks, exact if within the window, a bound
+                 otherwise.
+        :rtype: int
+        """
+
+        self.n_nodes += 1
+        n_players = self._n_players
+        n_played = len(trick)
+
+        if n_played == n_players:
+
+            winner = (leader + best_position) % n_players
+            won = winner == self._seat
+            for index in trick:
+                remaining ^= 1 << index
+
+            return won + self.search(
+                hands, winner if self._winner_leads else leader, remaining,
+                alpha - won, beta - won
+            )
+
+        player = (leader + n_played) % n_players
+        hand = hands[player]
+        maximising = player == self._seat
+
+        if trick:
+            offset = self._offsets[trick[0] // N_VALUES]
+            moves = get_authorised_mask(
+                hand, self._lead_suits[trick[0] // N_VALUES]
+            )
+            cards = self._order(
+                _equivalence_classes(moves, remaining), offset, best,
+                maximising or
+                (leader + best_position) % n_players == self._seat
+            )
+        else:
+            cards = sorted(
+                _equivalence_classes(hand, remaining),
+                key=self._strengths.__getitem__, reverse=True
+            )
+
+        value = -1 if maximising else N_CARDS
+        for index in cards:
+
+            if not trick:
+                offset = self._offsets[index // N_VALUES]
+                child_best, child_position = index, 0
+            elif BEATS[offset + index * N_CARDS + best]:
+                child_best, child_position = index, n_played
+            else:
+                child_best, child_position = best, best_position
+
+            hands[player] = hand ^ (1 << index)
+            trick.append(index)
+            child = self.play(
+                hands, leader, trick, child_best, child_position, remaining,
+                alpha, beta
+            )
+            trick.pop()
+
+            if maximising:
+                if child > value:
+                    value = child
+                    if value > alpha:
+                        alpha = value
+            elif child < value:
+                value = child
+                if value < beta:
+                    beta = value
+            if alpha >= beta:
+                break
+
+        hands[player] = hand
+
+        return value
+
+    def _order(
+        self, cards: List[int], offset: int, best: int, beating_first: bool
+    ) -> List[int]:
+
+        """
+        Orders the moves following the lead so that the ones likely to cause
+        a cutoff come first: the seat tries to win the trick as cheaply as
+        possible, the other seats try to beat the seat's card, or else to
+        play low.
+
+        :param cards: The indices of the moves.
+        :type cards: List[int]
+        :param offset: The offset of the block of the lead suit in `BEATS`.
+        :type offset: int
+        :param best: The card winning the current trick so far.
+        :type best: int
+        :param beating_first: True to try the cards beating `best` first.
+        :type beating_first: bool
+
+        :return: The ordered moves.
+        :rtype: List[int]
+        """
+
+        if len(cards) < 2:
+            return cards
+
+        cards.sort(key=self._strengths.__getitem__)
+        beating = [
+            index for index in cards if BEATS[offset + index * N_CARDS + best]
+        ]
+        if not beating or len(beating) == len(cards):
+            return cards
+        losing = [
+            index for index in cards
+            if not BEATS[offset + index * N_CARDS + best]
+        ]
+
+        return beating + losing if beating_first else losing + beating
+
+
+def _check_position(hands: Sequence[int], leader: int, trick: Sequence[int]):
+
+    """
+    Checks that a position is consistent: distinct cards, and one card more
+    in the hands of the seats yet to play in the current trick.
+
+    :raises ValueError: If the position isn't consistent.
+    """
+
+    n_players = len(hands)
+    if n_players < 2:
+        raise ValueError("`hands` should hold at least 2 hands")
+    if not 0 <= leader < n_players:
+        raise ValueError("`leader` should be a seat")
+    if len(trick) >= n_players:
+        raise ValueError("`trick` should hold less cards than players")
+
+    cards = 0
+    n_cards = 0
+    for mask in list(hands) + [1 << index for index in trick]:
+        cards |= mask
+        n_cards += count_cards(mask)
+    if count_cards(cards) != n_cards:
+        raise ValueError("`hands` and `trick` should hold distinct cards")
+
+    n_tricks = count_cards(hands[(leader + len(trick)) % n_players])
+    for position in range(n_players):
+        seat = (leader + position) % n_players
+        expected = n_tricks - (position < len(trick))
+        if count_cards(hands[seat]) != expected:
+            raise ValueError(
+                "`hands` should hold the same number of cards, but for the "
+                "seats who played in `trick`"
+            )
+
+
+def solve_seat(
+    hands: Sequence[int], trump_suit: int, leader: int, seat: int,
+    trick: Sequence[int] = tuple(), winner_leads: bool = False,
+    table: Optional[TranspositionTable] = None
+) -> int:
+
+    """
+    Finds the exact number of tricks a seat can take from a position, against
+    all the other seats.
+
+    :param hands: The bitmask of the hand of each seat (see
+                  `cards.cards_to_mask`), in playing order.
+    :type hands: Sequence[int]
+    :param trump_suit: The index of the trump suit.
+    :type trump_suit: int
+    :param leader: The seat leading the current trick.
+    :type leader: int
+    :param seat: The seat whose tricks are maximised.
+    :type seat: int
+    :param trick: The indices of the cards played in the current trick.
+    :type trick: Sequence[int]
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the current trick leads every
+                         trick of the round, like in `GameEngine`.
+    :type winner_leads: bool
+    :param table: The transposition table of the search, kept between calls
+                  to reuse the positions already searched. A new table is
+                  used if None.
+    :type table: Optional[TranspositionTable]
+
+    :return: The number of tricks the seat takes, the current trick
+             included.
+    :rtype: int
+
+    :raises ValueError: If the position isn't consistent.
+    """
+
+    _check_position(hands, leader, trick)
+    if not 0 <= seat < len(hands):
+        raise ValueError("`seat` should be a seat")
+
+    if table is None:
+        table = TranspositionTable()
+    search = _Search(len(hands), trump_suit, seat, winner_leads, table)
+    n_tricks = count_cards(hands[(leader + len(trick)) % len(hands)]) + \
+        bool(trick)
+    remaining = 0
+    for mask in hands:
+        remaining |= mask
+    if not trick:
+        return search.search(list(hands), leader, remaining, 0, n_tricks)
+
+    best_position = trick_winner_position(list(trick), trump_suit)
+    for index in trick:
+        remaining |= 1 << index
+
+    return search.play(
+        list(hands), leader, list(trick), trick[best_position],
+        best_position, remaining, 0, n_tricks
+    )
+
+
+def solve(
+    hands: Sequence[int], trump_suit: int, leader: int,
+    trick: Sequence[int] = tuple(), winner_leads: bool = False,
+    table: Optional[TranspositionTable] = None
+) -> List[int]:
+
+    """
+    Finds the exact number of tricks each seat can take from a position,
+    against all the other seats.
+
+    :param hands: The bitmask of the hand of each seat (see
+                  `cards.cards_to_mask`), in playing order.
+    :type hands: Sequence[int]
+    :param trump_suit: The index of the trump suit.
+    :type trump_suit: int
+    :param leader: The seat leading the current trick.
+    :type leader: int
+    :param trick: The indices of the cards played in the current trick.
+    :type trick: Sequence[int]
+    :param winner_leads: True if the winner of a trick leads the next one,
+                         False if the leader of the current trick leads every
+                         trick of the round, like in `GameEngine`.
+    :type winner_leads: bool
+    :param table: The transposition table shared by the searches of the
+                  seats, kept between calls to reuse the positions already
+                  searched. A new table is used if None.
+    :type table: Optional[TranspositionTable]
+
+    :return: The number of tricks of each seat, the current trick included.
+    :rtype: List[int]
+
+    :raises ValueError: If the position isn't consistent.
+
+    :Example:
+        >>> hands = [
+        ...     cards_to_mask([Card(Suit.SPADES, Value.ACE)]),
+        ...     cards_to_mask([Card(Suit.HEARTS, Value.TWO)])
+        ... ]
+        >>> solve(hands, trump_suit=suit_index(Suit.HEARTS), leader=0)
+        [0, 1]
+    """
+
+    if table is None:
+        table = TranspositionTable()
+
+    return [
+        solve_seat(
+            hands, trump_suit, leader, seat, trick, winner_leads, table
+        )
+        for seat in range(len(hands))
+    ]
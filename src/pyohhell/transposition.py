@@ -0,0 +1,265 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Transposition table shared by the search-based strategies, holding what is
+known of the positions already searched.
+
+The table holds at most `capacity` entries whatever the number of positions
+stored, so that a bot can keep one table for days. Two replacement policies
+are available:
+
+- 'depth': each key goes to one slot picked by its hash, like in chess
+  engines. A new entry replaces the one in its slot if it comes from a
+  deeper search, or if the entry in the slot dates from a previous search
+  (see `new_search`). Lookups and stores take constant time.
+- 'lru': the least recently used entry is evicted once the table is full.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Sequence, Tuple
+
+from src.pyohhell.isomorphism import Permutation, canonicalise
+
+
+TABLE_POLICIES = ('depth', 'lru')
+
+
+def position_key(
+    hands: Sequence[int], trick: Sequence[int], leader: int, trump_suit: int
+) -> Tuple[int, ...]:
+
+    """
+    Builds the key of a position of a round, from the cards as bitmasks or
+    indices (see `cards`).
+
+    :param hands: The bitmask of the remaining hand of each seat.
+    :type hands: Sequence[int]
+    :param trick: The indices of the cards played in the current trick.
+    :type trick: Sequence[int]
+    :param leader: The seat leading the current trick.
+    :type leader: int
+    :param trump_suit: The index of the trump suit.
+    :type trump_suit: int
+
+    :return: The key of the position.
+    :rtype: Tuple[int, ...]
+    """
+
+    return (trump_suit, leader, len(trick), *trick, *hands)
+
+
+def canonical_position_key(
+    hands: Sequence[int], trick: Sequence[int], leader: int, trump_suit: int
+) -> Tuple[Tuple[int, ...], Permutation]:
+
+    """
+    Builds the key of the canonical position of the class of a position (see
+    `isomorphism`), shared by the positions differing by a renaming of the
+    suits, whatever the trump suit.
+
+    :param hands: The bitmask of the remaining hand of each seat.
+    :type hands: Sequence[int]
+    :param trick: The indices of the cards played in the current trick.
+    :type trick: Sequence[int]
+    :param leader: The seat leading the current trick.
+    :type leader: int
+    :param trump_suit: The index of the trump suit.
+    :type trump_suit: int
+
+    :return: The key of the position, and the permutation of the suits
+             applied to map the moves stored with it back to the position
+             (see `isomorphism.invert_permutation`).
+    :rtype: Tuple[Tuple[int, ...], Permutation]
+    """
+
+    position = canonicalise(hands, trump_suit, trick)
+
+    return (
+        position_key(position.hands, position.trick, leader, 0),
+        position.permutation
+    )
+
+
+class TranspositionTable:
+
+    """
+    Bounded table of the values of the positions searched, with hit and miss
+    statistics.
+
+    :param capacity: The maximum number of entries.
+    :type capacity: int
+    :param policy: The replacement policy, 'depth' or 'lru'.
+    :type policy: str
+
+    :raises ValueError: If the capacity is lower than 1 or if the policy is
+                        unknown.
+
+    :Example:
+        >>> table = TranspositionTable(capacity=1 << 20)
+        >>> key = position_key(hands, trick, leader, trump_suit)
+        >>> value = table.get(key)
+        >>> if value is None:
+        ...     value = search(hands, trick, leader, trump_suit)
+        ...     table.store(key, value, depth=n_tricks)
+        >>> table.hit_rate
+        0.62
+    """
+
+    def __init__(self, capacity: int = 1 << 20, policy: str = 'depth'):
+
+        if capacity < 1:
+            raise ValueError("`capacity` should be greater than 0")
+        if policy not in TABLE_POLICIES:
+            raise ValueError("`policy` should be 'depth' or 'lru'")
+
+        self.capacity = capacity
+        self.policy = policy
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.rejections = 0
+
+        # 'depth': (key, value, depth, search) by slot; 'lru': value by key
+        self._slots: Dict[int, Tuple[Hashable, Any, int, int]] = dict()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._search = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+
+        """
+        Looks a position up.
+
+        :param key: The key of the position.
+        :type key: Hashable
+        :param default: The value returned if the position isn't in the table.
+        :type default: Any
+
+        :return: The value of the position, `default` if it isn't in the
+                 table.
+        :rtype: Any
+        """
+
+        if self.policy == 'depth':
+            entry = self._slots.get(hash(key) % self.capacity)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+
+        elif key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        self.misses += 1
+
+        return default
+
+    def store(self, key: Hashable, value: Any, depth: int = 0):
+
+        """
+        Stores the value of a position, unless the depth-preferred policy
+        keeps the entry of a deeper search in its place.
+
+        :param key: The key of the position.
+        :type key: Hashable
+        :param value: The value of the position.
+        :type value: Any
+        :param depth: The depth of the search the value comes from, e.g. the
+                      number of tricks left.
+        :type depth: int
+        """
+
+        if self.policy == 'depth':
+            slot = hash(key) % self.capacity
+            entry = self._slots.get(slot)
+            if entry is not None and entry[0] != key:
+                if entry[3] == self._search and entry[2] > depth:
+                    self.rejections += 1
+                    return
+                self.evictions += 1
+            self._slots[slot] = (key, value, depth, self._search)
+
+        else:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            elif len(self._entries) >= self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._entries[key] = value
+
+        self.stores += 1
+
+    def new_search(self):
+
+        """
+        Marks the start of a new search: the entries stored so far can be
+        replaced by any entry under the depth-preferred policy, but are still
+        found until then.
+        """
+
+        self._search += 1
+
+    def clear(self):
+
+        """
+        Removes every entry and resets the statistics.
+        """
+
+        self._slots.clear()
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    @property
+    def hit_rate(self) -> float:
+
+        """
+        Returns the share of the lookups that found their position.
+
+        :return: The hit rate, 0 if there was no lookup.
+        :rtype: float
+        """
+
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.
+
+    def stats(self) -> Dict[str, int]:
+
+        """
+        Returns the statistics of the table since its creation or its last
+        clearing.
+
+        :return: The number of entries, hits, misses, stores, evictions and
+                 rejected stores.
+        :rtype: Dict[str, int]
+        """
+
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'rejections': self.rejections
+        }
+
+    def __len__(self) -> int:
+
+        return len(self._slots) + len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+
+        if self.policy == 'depth':
+            entry = self._slots.get(hash(key) % self.capacity)
+            return entry is not None and entry[0] == key
+
+        return key in self._entries
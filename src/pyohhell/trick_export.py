@@ -0,0 +1,358 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Export of finished games to NumPy arrays, with one row per card played.
+
+The rows are built chunk by chunk, a few whole games at a time, and written
+as they come: a structured array to a `.npy` file, or one array per column
+to a `.npz` file. The memory used stays bounded by the chunk size whatever
+the number of games, and the `.npy` file can be memory-mapped back with
+``np.load(path, mmap_mode='r')``.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+from src.pyohhell.cards import (
+    N_VALUES,
+    card_suit,
+    card_to_index,
+    trick_winner_position
+)
+from src.pyohhell.game_state import GameState
+
+
+# game, round, trick and position in the trick of the card played, player
+# who played it, card and lead suit, trump card, bid of the player in the
+# round (-1 if the player didn't bid) and whether the card won the trick
+TRICK_DTYPE = np.dtype([
+    ('game', np.uint32),
+    ('round', np.uint16),
+    ('trick', np.uint8),
+    ('position', np.uint8),
+    ('player', np.int32),
+    ('card', np.uint8),
+    ('lead_suit', np.uint8),
+    ('trump', np.uint8),
+    ('bid', np.int8),
+    ('win', np.bool_)
+])
+
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+def _npy_header(dtype: np.dtype, n_rows: int, size: int = 0) -> bytes:
+
+    """
+    Builds the header of a `.npy` file holding a 1-d array, padded to a
+    multiple of 64 bytes, or to a given size so that it can be rewritten in
+    place once the number of rows is known.
+
+    :param dtype: The type of the array.
+    :type dtype: np.dtype
+    :param n_rows: The number of rows of the array.
+    :type n_rows: int
+    :param size: The size of the header, 0 for the smallest one.
+    :type size: int
+
+    :return: The header.
+    :rtype: bytes
+    """
+
+    header = repr({
+        'descr': np.lib.format.dtype_to_descr(dtype),
+        'fortran_order': False,
+        'shape': (n_rows,)
+    }).encode('latin1')
+    if not size:
+        size = -(-(len(_NPY_MAGIC) + 2 + len(header) + 1) // 64) * 64
+    header_len = size - len(_NPY_MAGIC) - 2
+
+    return (
+        _NPY_MAGIC + struct.pack('<H', header_len) +
+        header.ljust(header_len - 1) + b'\n'
+    )
+
+
+class _TrickColumns:
+
+    """
+    Growing columns of the rows of a chunk: one entry per card for the row
+    columns, one entry per trick for the trick columns.
+    """
+
+    def __init__(self):
+
+        self.cards: List[int] = list()
+        self.players: List[int] = list()
+        self.bids: List[int] = list()
+
+        self.games: List[int] = list()
+        self.rounds: List[int] = list()
+        self.tricks: List[int] = list()
+        self.trumps: List[int] = list()
+        self.n_cards: List[int] = list()
+        self.winners: List[int] = list()
+
+    def add_game(self, game_id: int, game_state: GameState):
+
+        """
+        Adds the rows of the stored rounds of a game.
+
+        :param game_id: The identifier of the game.
+        :type game_id: int
+        :param game_state: The game state.
+        :type game_state: GameState
+        """
+
+        for game_round in game_state.rounds:
+
+            trump = card_to_index(game_round.trump_card)
+            trump_suit = card_suit(trump)
+            bid_by_player_id = game_round.bid_by_player_id
+
+            for trick in game_round.tricks:
+
+                card_indices = trick.card_indices
+                if not card_indices:
+                    continue
+
+                self.cards.extend(card_indices)
+                for player_id in trick.player_ids:
+                    self.players.append(player_id)
+                    self.bids.append(bid_by_player_id.get(player_id, -1))
+
+                self.games.append(game_id)
+                self.rounds.append(game_round.id)
+                self.tricks.append(trick.id)
+                self.trumps.append(trump)
+                self.n_cards.append(len(card_indices))
+                self.winners.append(
+                    trick_winner_position(card_indices, trump_suit)
+                )
+
+    def to_array(self) -> np.ndarray:
+
+        """
+        Builds the rows of the chunk, the trick columns being repeated for
+        each card of the trick.
+
+        :return: The rows, of type `TRICK_DTYPE`.
+        :rtype: np.ndarray
+        """
+
+        n_cards = np.array(self.n_cards, dtype=np.intp)
+        rows = np.empty(len(self.cards), dtype=TRICK_DTYPE)
+
+        rows['game'] = np.repeat(
+            np.array(self.games, dtype=np.uint32), n_cards
+        )
+        rows['round'] = np.repeat(
+            np.array(self.rounds, dtype=np.uint16), n_cards
+        )
+        rows['trick'] = np.repeat(
+            np.array(self.tricks, dtype=np.uint8), n_cards
+        )
+        rows['trump'] = np.repeat(
+            np.array(self.trumps, dtype=np.uint8), n_cards
+        )
+
+        # position of each card in its trick, from the offset of the tricks
+        trick_offsets = np.cumsum(n_cards) - n_cards
+        positions = np.arange(len(self.cards)) - \
+            np.repeat(trick_offsets, n_cards)
+        rows['position'] = positions
+        rows['win'] = positions == np.repeat(
+            np.array(self.winners, dtype=np.intp), n_cards
+        )
+
+        cards = np.array(self.cards, dtype=np.uint8)
+        rows['card'] = cards
+        rows['lead_suit'] = np.repeat(
+            cards[trick_offsets] // N_VALUES, n_cards
+        )
+        rows['player'] = self.players
+        rows['bid'] = self.bids
+
+        return rows
+
+    def __len__(self) -> int:
+
+        return len(self.cards)
+
+
+def iter_trick_chunks(
+    game_states: Iterable[GameState], chunk_size: int = 1 << 16,
+    first_game_id: int = 0
+) -> Iterator[np.ndarray]:
+
+    """
+    Turns finished games into rows, one per card played, yielded by chunks of
+    whole games of about `chunk_size` rows.
+
+    :param game_states: The game states of the finished games.
+    :type game_states: Iterable[GameState]
+    :param chunk_size: The number of rows from which a chunk is yielded.
+    :type chunk_size: int
+    :param first_game_id: The identifier of the first game, the next games
+                          being numbered in order.
+    :type first_game_id: int
+
+    :return: An iterator over the chunks, of type `TRICK_DTYPE`.
+    :rtype: Iterator[np.ndarray]
+
+    :raises ValueError: If `chunk_size` is lower than 1.
+
+    :Example:
+        >>> for chunk in iter_trick_chunks(game_states):
+        ...     bid_model.partial_fit(chunk)
+    """
+
+    if chunk_size < 1:
+        raise ValueError("`chunk_size` should be greater than 0")
+
+    return _iter_trick_chunks(game_states, chunk_size, first_game_id)
+
+
+def _iter_trick_chunks(
+    game_states: Iterable[GameState], chunk_size: int, first_game_id: int
+) -> Iterator[np.ndarray]:
+
+    """
+    Generator of `iter_trick_chunks`, once its arguments are checked.
+    """
+
+    columns = _TrickColumns()
+    for game_id, game_state in enumerate(game_states, first_game_id):
+
+        columns.add_game(game_id, game_state)
+        if len(columns) >= chunk_size:
+            yield columns.to_array()
+            columns = _TrickColumns()
+
+    if len(columns):
+        yield columns.to_array()
+
+
+def _export_npy(chunks: Iterable[np.ndarray], path: str) -> int:
+
+    """
+    Writes the chunks to a `.npy` file holding a single structured array.
+
+    :param chunks: The chunks of rows.
+    :type chunks: Iterable[np.ndarray]
+    :param path: The path of the file.
+    :type path: str
+
+    :return: The number of rows written.
+    :rtype: int
+    """
+
+    # the header is written with room for any number of rows, and rewritten
+    # once the number of rows is known
+    header_size = len(_npy_header(TRICK_DTYPE, 1 << 64))
+
+    n_rows = 0
+    with open(path, 'wb') as file:
+        file.write(_npy_header(TRICK_DTYPE, n_rows, header_size))
+        for chunk in chunks:
+            chunk.tofile(file)
+            n_rows += len(chunk)
+        file.seek(0)
+        file.write(_npy_header(TRICK_DTYPE, n_rows, header_size))
+
+    return n_rows
+
+
+def _export_npz(chunks: Iterable[np.ndarray], path: str) -> int:
+
+    """
+    Writes the chunks to a `.npz` file holding one array per column.
+
+    The columns are streamed to temporary files, and then copied to the
+    members of the archive one after the other.
+
+    :param chunks: The chunks of rows.
+    :type chunks: Iterable[np.ndarray]
+    :param path: The path of the file.
+    :type path: str
+
+    :return: The number of rows written.
+    :rtype: int
+    """
+
+    n_rows = 0
+    with tempfile.TemporaryDirectory() as directory:
+
+        column_paths = {
+            name: os.path.join(directory, name) for name in TRICK_DTYPE.names
+        }
+        column_files = {
+            name: open(column_path, 'wb')
+            for name, column_path in column_paths.items()
+        }
+        try:
+            for chunk in chunks:
+                for name, column_file in column_files.items():
+                    chunk[name].tofile(column_file)
+                n_rows += len(chunk)
+        finally:
+            for column_file in column_files.values():
+                column_file.close()
+
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zip_file:
+            for name, column_path in column_paths.items():
+                with zip_file.open(name + '.npy', 'w', force_zip64=True) \
+                        as member, open(column_path, 'rb') as column_file:
+                    member.write(_npy_header(TRICK_DTYPE[name], n_rows))
+                    shutil.copyfileobj(column_file, member)
+
+    return n_rows
+
+
+def export_tricks(
+    game_states: Iterable[GameState], path: str, chunk_size: int = 1 << 16
+) -> int:
+
+    """
+    Exports finished games to a file, with one row per card played.
+
+    A `.npz` path gives one array per column (``np.load(path)['bid']``), any
+    other path a `.npy` file holding a structured array of type
+    `TRICK_DTYPE`.
+
+    :param game_states: The game states of the finished games.
+    :type game_states: Iterable[GameState]
+    :param path: The path of the file.
+    :type path: str
+    :param chunk_size: The number of rows built at once.
+    :type chunk_size: int
+
+    :return: The number of rows written.
+    :rtype: int
+
+    :raises ValueError: If `chunk_size` is lower than 1.
+
+    :Example:
+        >>> export_tricks(
+        ...     (replay_game(record) for _, record in archive.scan()),
+        ...     'tricks.npy'
+        ... )
+        >>> tricks = np.load('tricks.npy', mmap_mode='r')
+        >>> tricks[tricks['position'] == 0]['win'].mean()
+    """
+
+    chunks = iter_trick_chunks(game_states, chunk_size)
+    if path.endswith('.npz'):
+        return _export_npz(chunks, path)
+
+    return _export_npy(chunks, path)
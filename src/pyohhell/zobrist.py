@@ -0,0 +1,292 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Zobrist keys of the elements of a position.
+
+The hash of a position is the XOR of the keys of its elements, so that adding
+or removing an element updates it in constant time. `Round` and `GameState`
+maintain the hash of their trump card, bids, played cards, current trick and
+wins (see `Round.zobrist_hash`); the hands and the player to move, which they
+don't know, are added by the searches with `hand_card_key` and `to_move_key`.
+
+The keys are 64-bit values derived from fixed seeds with `rng.derive_seed`,
+and so are the same in every process. The keys of the players whose id is
+below `N_TABLE_PLAYERS` are precomputed in flat tables, as they are looked up
+on every move; the other ones are derived on demand.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+from src.pyohhell.cards import N_CARDS
+from src.pyohhell.rng import derive_seed, derive_seeds
+
+
+_ZOBRIST_SEED = 0x5A0B7157
+
+# key domains, so that the keys of distinct elements never collide
+TRUMP = 0
+BID = 1
+TRICK_CARD = 2
+PLAYED_CARD = 3
+WINS = 4
+HAND_CARD = 5
+TO_MOVE = 6
+ROUND = 7
+
+# the players (or rounds, for the trump card, and positions in the trick, for
+# the cards of the current trick) whose keys are precomputed
+N_TABLE_PLAYERS = 16
+
+# the number of keys of a player in a table: a card index, a bid or a number
+# of tricks, all between 0 and N_CARDS
+_N_KEYS = N_CARDS + 1
+
+
+def _key_table(domain: int) -> List[int]:
+
+    """
+    Precomputes the keys of a domain identified by a player id and a value.
+
+    :param domain: The kind of element, e.g. `BID`.
+    :type domain: int
+
+    :return: The flat table, the key of (player_id, value) being at index
+             player_id * _N_KEYS + value.
+    :rtype: List[int]
+    """
+
+    table = []
+    for player_id in range(N_TABLE_PLAYERS):
+        table.extend(derive_seeds(_ZOBRIST_SEED, _N_KEYS, domain, player_id))
+
+    return table
+
+
+_TRUMP_KEYS = _key_table(TRUMP)
+_BID_KEYS = _key_table(BID)
+_TRICK_CARD_KEYS = [
+    key
+    for position in range(N_TABLE_PLAYERS)
+    for player_id in range(N_TABLE_PLAYERS)
+    for key in derive_seeds(
+        _ZOBRIST_SEED, _N_KEYS, TRICK_CARD, position, player_id
+    )
+]
+_PLAYED_CARD_KEYS = _key_table(PLAYED_CARD)
+_WINS_KEYS = _key_table(WINS)
+_HAND_CARD_KEYS = _key_table(HAND_CARD)
+_TO_MOVE_KEYS = derive_seeds(_ZOBRIST_SEED, N_TABLE_PLAYERS, TO_MOVE)
+
+
+def zobrist_key(domain: int, *keys: int) -> int:
+
+    """
+    The key of an element of a position.
+
+    :param domain: The kind of element, e.g. `BID`.
+    :type domain: int
+    :param keys: The integers identifying the element, e.g. a player id and
+                 a bid.
+    :type keys: int
+
+    :return: The 64-bit key.
+    :rtype: int
+    """
+
+    return derive_seed(_ZOBRIST_SEED, domain, *keys)
+
+
+def trump_key(round_id: int, card_index: int) -> int:
+
+    """
+    The key of the trump card of a round.
+
+    :param round_id: The identifier of the round.
+    :type round_id: int
+    :param card_index: The index of the card (see `cards.card_to_index`).
+    :type card_index: int
+
+    :return: The 64-bit key, `zobrist_key(TRUMP, round_id, card_index)`.
+    :rtype: int
+    """
+
+    if 0 <= round_id < N_TABLE_PLAYERS:
+        return _TRUMP_KEYS[round_id * _N_KEYS + card_index]
+
+    return zobrist_key(TRUMP, round_id, card_index)
+
+
+def bid_key(player_id: int, bid: int) -> int:
+
+    """
+    The key of the bid of a player.
+
+    :param player_id: The identifier of the player.
+    :type player_id: int
+    :param bid: The bid.
+    :type bid: int
+
+    :return: The 64-bit key, `zobrist_key(BID, player_id, bid)`.
+    :rtype: int
+    """
+
+    if 0 <= player_id < N_TABLE_PLAYERS:
+        return _BID_KEYS[player_id * _N_KEYS + bid]
+
+    return zobrist_key(BID, player_id, bid)
+
+
+def trick_card_key(position: int, player_id: int, card_index: int) -> int:
+
+    """
+    The key of a card played by a player in the current trick.
+
+    :param position: The position of the card in the trick.
+    :type position: int
+    :param player_id: The identifier of the player.
+    :type player_id: int
+    :param card_index: The index of the card (see `cards.card_to_index`).
+    :type card_index: int
+
+    :return: The 64-bit key, `zobrist_key(TRICK_CARD, position, player_id,
+             card_index)`.
+    :rtype: int
+    """
+
+    if 0 <= position < N_TABLE_PLAYERS and 0 <= player_id < N_TABLE_PLAYERS:
+        return _TRICK_CARD_KEYS[
+            (position * N_TABLE_PLAYERS + player_id) * _N_KEYS + card_index
+        ]
+
+    return zobrist_key(TRICK_CARD, position, player_id, card_index)
+
+
+def played_card_key(player_id: int, card_index: int) -> int:
+
+    """
+    The key of a card played by a player in a finished trick.
+
+    :param player_id: The identifier of the player.
+    :type player_id: int
+    :param card_index: The index of the card (see `cards.card_to_index`).
+    :type card_index: int
+
+    :return: The 64-bit key, `zobrist_key(PLAYED_CARD, player_id,
+             card_index)`.
+    :rtype: int
+    """
+
+    if 0 <= player_id < N_TABLE_PLAYERS:
+        return _PLAYED_CARD_KEYS[player_id * _N_KEYS + card_index]
+
+    return zobrist_key(PLAYED_CARD, player_id, card_index)
+
+
+def round_hash(round_idx: int, zobrist_hash: int) -> int:
+
+    """
+    Mixes the hash of a round with its index in the game, so that identical
+    rounds at distinct indices don't cancel out in the hash of the game.
+
+    :param round_idx: The index of the round in the game.
+    :type round_idx: int
+    :param zobrist_hash: The hash of the round (see `Round.zobrist_hash`).
+    :type zobrist_hash: int
+
+    :return: The 64-bit hash of the round in the game.
+    :rtype: int
+    """
+
+    return derive_seed(_ZOBRIST_SEED, ROUND, round_idx, zobrist_hash)
+
+
+def hand_card_key(player_id: int, card_index: int) -> int:
+
+    """
+    The key of a card in the hand of a player.
+
+    :param player_id: The identifier of the player.
+    :type player_id: int
+    :param card_index: The index of the card (see `cards.card_to_index`).
+    :type card_index: int
+
+    :return: The 64-bit key, `zobrist_key(HAND_CARD, player_id,
+             card_index)`.
+    :rtype: int
+    """
+
+    if 0 <= player_id < N_TABLE_PLAYERS:
+        return _HAND_CARD_KEYS[player_id * _N_KEYS + card_index]
+
+    return zobrist_key(HAND_CARD, player_id, card_index)
+
+
+def hand_hash(player_id: int, mask: int) -> int:
+
+    """
+    The hash of the hand of a player, to be updated with `hand_card_key` as
+    the cards are played.
+
+    :param player_id: The identifier of the player.
+    :type player_id: int
+    :param mask: The bitmask of the hand (see `cards.cards_to_mask`).
+    :type mask: int
+
+    :return: The 64-bit hash.
+    :rtype: int
+    """
+
+    value = 0
+    while mask:
+        card = mask & -mask
+        value ^= hand_card_key(player_id, card.bit_length() - 1)
+        mask ^= card
+
+    return value
+
+
+def to_move_key(player_id: int) -> int:
+
+    """
+    The key of the player to move.
+
+    :param player_id: The identifier of the player.
+    :type player_id: int
+
+    :return: The 64-bit key, `zobrist_key(TO_MOVE, player_id)`.
+    :rtype: int
+
+    :Example:
+        >>> position_hash = _round.zobrist_hash ^ to_move_key(player_id)
+    """
+
+    if 0 <= player_id < N_TABLE_PLAYERS:
+        return _TO_MOVE_KEYS[player_id]
+
+    return zobrist_key(TO_MOVE, player_id)
+
+
+def wins_key(player_id: int, n_wins: int) -> int:
+
+    """
+    The key of the number of tricks won by a player, 0 for no trick so that
+    only the players who won a trick are hashed.
+
+    :param player_id: The identifier of the player.
+    :type player_id: int
+    :param n_wins: The number of tricks won.
+    :type n_wins: int
+
+    :return: The 64-bit key, `zobrist_key(WINS, player_id, n_wins)`.
+    :rtype: int
+    """
+
+    if not n_wins:
+        return 0
+    if 0 <= player_id < N_TABLE_PLAYERS:
+        return _WINS_KEYS[player_id * _N_KEYS + n_wins]
+
+    return zobrist_key(WINS, player_id, n_wins)
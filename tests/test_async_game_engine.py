@@ -0,0 +1,245 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from pydecklib.card import Card, Suit, Value
+import pytest
+
+from src.pyohhell.async_game_engine import (
+    AsyncGameEngine,
+    AsyncPlayerAdapter
+)
+from src.pyohhell.game_engine import GameEngine
+from src.pyohhell.game_state import DefaultPointAttributionStrategy, Round
+from src.pyohhell.player import Player
+
+
+class SlowPlayer(AsyncPlayerAdapter):
+
+    def __init__(self, player, delay):
+
+        super().__init__(player)
+        self._delay = delay
+
+    async def play_card(self, authorised_cards):
+
+        await asyncio.sleep(self._delay)
+        return await super().play_card(authorised_cards)
+
+    async def make_bid(self, authorised_bids):
+
+        await asyncio.sleep(self._delay)
+        return await super().make_bid(authorised_bids)
+
+
+def play_game(n_players, seed):
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    for player_id in range(n_players):
+        game_engine.subscribe_player(Player(player_id))
+
+    return game_engine.play_game(seed)
+
+
+# test async_game_engine_init
+test_values = [0, -1.]
+
+
+@pytest.mark.parametrize('decision_timeout', test_values)
+def test_async_game_engine_init(decision_timeout):
+
+    with pytest.raises(ValueError):
+        AsyncGameEngine(DefaultPointAttributionStrategy(), decision_timeout)
+
+
+# test async_game_engine_play_game
+test_values = [
+    (2, [1], None),
+    (3, [1, 2, 3], None),
+    (4, [1, 2], 10.)
+]
+
+
+@pytest.mark.parametrize('n_players, seeds, decision_timeout', test_values)
+def test_async_game_engine_play_game(n_players, seeds, decision_timeout):
+
+    async def play_tables():
+
+        game_engines = list()
+        for _ in seeds:
+            game_engine = AsyncGameEngine(
+                DefaultPointAttributionStrategy(), decision_timeout
+            )
+            for player_id in range(n_players):
+                game_engine.subscribe_player(
+                    AsyncPlayerAdapter(Player(player_id))
+                )
+            game_engines.append(game_engine)
+
+        return await asyncio.gather(*(
+            game_engine.play_game(seed)
+            for game_engine, seed in zip(game_engines, seeds)
+        ))
+
+    actual = asyncio.run(play_tables())
+    expected = [play_game(n_players, seed) for seed in seeds]
+
+    assert actual == expected
+
+
+# test async_game_engine_forced_moves
+class CountingPlayer(AsyncPlayerAdapter):
+
+    def __init__(self, player):
+
+        super().__init__(player)
+        self.n_card_calls = 0
+
+    async def play_card(self, authorised_cards):
+
+        self.n_card_calls += 1
+        return await super().play_card(authorised_cards)
+
+
+test_values = [(2, 1), (3, 2)]
+
+
+@pytest.mark.parametrize('n_players, seed', test_values)
+def test_async_game_engine_forced_moves(n_players, seed):
+
+    game_engine = AsyncGameEngine(
+        DefaultPointAttributionStrategy(), resolve_forced_moves=True
+    )
+    players = [CountingPlayer(Player(i)) for i in range(n_players)]
+    for player in players:
+        game_engine.subscribe_player(player)
+
+    actual = asyncio.run(game_engine.play_game(seed))
+
+    # the players aren't asked for the last trick of each round
+    n_rounds = 51 // n_players
+    assert actual == play_game(n_players, seed)
+    for player in players:
+        assert player.n_card_calls <= sum(range(n_rounds))
+
+
+# test async_game_engine_play_trick_timeout
+
+test_values = [
+    (
+        (Card(Suit.SPADES, Value.THREE), Card(Suit.HEARTS, Value.TWO)),
+        (Card(Suit.SPADES, Value.TWO),),
+        [
+            (0, Card(Suit.SPADES, Value.THREE)),
+            (1, Card(Suit.SPADES, Value.TWO))
+        ],
+        [Card(Suit.HEARTS, Value.TWO)]
+    )
+]
+
+
+@pytest.mark.parametrize(
+    'hand_0, hand_1, expected_trick, expected_hand_0', test_values
+)
+def test_async_game_engine_play_trick_timeout(
+    hand_0, hand_1, expected_trick, expected_hand_0
+):
+
+    game_engine = AsyncGameEngine(
+        DefaultPointAttributionStrategy(), decision_timeout=0.01
+    )
+    game_engine._game_state.current_round = Round(
+        0, Card(Suit.CLUBS, Value.TWO)
+    )
+    slow_player = SlowPlayer(Player(0, initial_hand=hand_0), delay=1.)
+    game_engine.subscribe_player(slow_player)
+    game_engine.subscribe_player(
+        AsyncPlayerAdapter(Player(1, initial_hand=hand_1))
+    )
+
+    asyncio.run(game_engine._play_trick(0, 0))
+
+    trick = game_engine._game_state.current_round._tricks[0]
+    assert list(trick.player_ids_cards) == expected_trick
+    assert slow_player.hand == expected_hand_0
+
+
+# test async_game_engine_make_bid_timeout
+test_values = [
+    ([0, 1], 0),
+    ([1, 2], 1)
+]
+
+
+@pytest.mark.parametrize('authorised_bids, expected', test_values)
+def test_async_game_engine_make_bid_timeout(authorised_bids, expected):
+
+    game_engine = AsyncGameEngine(
+        DefaultPointAttributionStrategy(), decision_timeout=0.01
+    )
+    slow_player = SlowPlayer(Player(0), delay=1.)
+
+    actual = asyncio.run(
+        game_engine._make_bid(slow_player, authorised_bids)
+    )
+
+    assert actual == expected
+
+
+# test async_game_engine_unauthorised_moves
+class CheatingPlayer(AsyncPlayerAdapter):
+
+    async def play_card(self, authorised_cards):
+
+        card = next(
+            card for card in self.hand if card not in authorised_cards
+        )
+        self.remove_from_hand(card)
+        return card
+
+    async def make_bid(self, authorised_bids):
+
+        return max(authorised_bids) + 1
+
+
+class CancelledPlayer(AsyncPlayerAdapter):
+
+    async def play_card(self, authorised_cards):
+
+        self.remove_from_hand(authorised_cards[-1])
+        await asyncio.sleep(1.)
+        return authorised_cards[-1]
+
+
+test_values = [
+    (CheatingPlayer, None),
+    (CancelledPlayer, 0.01)
+]
+
+
+@pytest.mark.parametrize('player_type, decision_timeout', test_values)
+def test_async_game_engine_unauthorised_moves(player_type, decision_timeout):
+
+    game_engine = AsyncGameEngine(
+        DefaultPointAttributionStrategy(), decision_timeout
+    )
+    game_engine._game_state.current_round = Round(
+        0, Card(Suit.CLUBS, Value.TWO)
+    )
+    hand = [
+        Card(Suit.SPADES, Value.THREE), Card(Suit.SPADES, Value.FOUR),
+        Card(Suit.HEARTS, Value.TWO)
+    ]
+    player = player_type(Player(0, initial_hand=hand))
+    authorised_cards = hand[:2]
+
+    actual_card = asyncio.run(
+        game_engine._play_card(player, authorised_cards)
+    )
+
+    # the fallback card is played, and only it left the hand
+    assert actual_card == Card(Suit.SPADES, Value.THREE)
+    assert sorted(map(str, player.hand)) == sorted(map(str, hand[1:]))
+    if player_type is CheatingPlayer:
+        assert asyncio.run(game_engine._make_bid(player, [0, 1])) == 0
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.pyohhell.batch_engine import BatchGameEngine  # noqa: E402
+from src.pyohhell.cards import card_to_index  # noqa: E402
+from src.pyohhell.game_engine import GameEngine  # noqa: E402
+from src.pyohhell.game_state import (  # noqa: E402
+    DefaultPointAttributionStrategy
+)
+from src.pyohhell.player import (  # noqa: E402
+    FirstBidSelectionStrategy,
+    FirstCardSelectionStrategy,
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+from src.pyohhell.rng import round_seed  # noqa: E402
+
+
+def first_strategies_batch_engine(n_players, seed=None):
+
+    return BatchGameEngine(
+        [FirstCardSelectionStrategy() for _ in range(n_players)],
+        [FirstBidSelectionStrategy() for _ in range(n_players)],
+        seed=seed
+    )
+
+
+def random_strategies_batch_engine(n_players, seed=None):
+
+    return BatchGameEngine(
+        [RandomCardSelectionStrategy() for _ in range(n_players)],
+        [RandomBidSelectionStrategy() for _ in range(n_players)],
+        seed=seed
+    )
+
+
+# test batch_game_engine_init
+test_values = [
+    ([FirstCardSelectionStrategy()], [FirstBidSelectionStrategy()]),
+    (
+        [FirstCardSelectionStrategy(), FirstCardSelectionStrategy()],
+        [FirstBidSelectionStrategy()]
+    ),
+    (
+        [FirstCardSelectionStrategy(), FirstCardSelectionStrategy()],
+        [FirstBidSelectionStrategy(), FirstCardSelectionStrategy()]
+    )
+]
+
+
+@pytest.mark.parametrize(
+    'card_selection_strategies, bid_selection_strategies', test_values
+)
+def test_batch_game_engine_init(
+    card_selection_strategies, bid_selection_strategies
+):
+
+    with pytest.raises(ValueError):
+        BatchGameEngine(card_selection_strategies, bid_selection_strategies)
+
+
+# test batch_game_engine_play_games_game_engine
+test_values = [
+    (2, [1, 2, 3]),
+    (3, [1, 2, 3]),
+    (5, [4, 5])
+]
+
+
+@pytest.mark.parametrize('n_players, seeds', test_values)
+def test_batch_game_engine_play_games_game_engine(n_players, seeds):
+
+    batch_engine = first_strategies_batch_engine(n_players)
+
+    deals = list()
+    expected = list()
+    for seed in seeds:
+
+        game_engine = GameEngine(DefaultPointAttributionStrategy())
+        for player_id in range(n_players):
+            game_engine.subscribe_player(Player(player_id))
+        deal = list()
+        for round_idx in range(batch_engine.n_rounds):
+            game_engine._shuffle_deck(round_seed(seed, round_idx))
+            deal.append([card_to_index(card) for card in game_engine._deck])
+        deals.append(deal)
+
+        points_by_player_id = game_engine.play_game(seed)
+        expected.append([
+            points_by_player_id[player_id]
+            for player_id in range(n_players)
+        ])
+
+    actual = batch_engine.play_games(deals=np.array(deals))
+
+    assert actual.tolist() == expected
+
+
+# test batch_game_engine_play_games
+test_values = [
+    (first_strategies_batch_engine, 2, 50),
+    (first_strategies_batch_engine, 4, 50),
+    (random_strategies_batch_engine, 3, 50),
+    (random_strategies_batch_engine, 6, 50)
+]
+
+
+@pytest.mark.parametrize(
+    'batch_engine_factory, n_players, n_games', test_values
+)
+def test_batch_game_engine_play_games(
+    batch_engine_factory, n_players, n_games
+):
+
+    actual = batch_engine_factory(n_players, seed=1).play_games(n_games)
+    expected = batch_engine_factory(n_players, seed=1).play_games(n_games)
+
+    assert actual.shape == (n_games, n_players)
+    assert np.array_equal(actual, expected)
+
+    # each round scores at least 3 points for a player making its bid, at
+    # most -n_cards otherwise
+    n_rounds = 51 // n_players
+    assert (actual <= sum(3 + n for n in range(1, n_rounds + 1))).all()
+    assert (actual >= -sum(range(1, n_rounds + 1))).all()
+
+
+# test batch_game_engine_play_games_deals
+test_values = [
+    (None, None),
+    (None, np.zeros((1, 3, 52), dtype=int)),
+    (None, np.zeros((1, 25, 51), dtype=int))
+]
+
+
+@pytest.mark.parametrize('n_games, deals', test_values)
+def test_batch_game_engine_play_games_deals(n_games, deals):
+
+    with pytest.raises(ValueError):
+        first_strategies_batch_engine(2).play_games(n_games, deals)
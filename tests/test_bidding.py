@@ -0,0 +1,231 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from pydecklib.card import Card, Suit, Value
+import pytest
+
+from src.pyohhell.bidding import (
+    TABLE_MAGIC,
+    ExpectedTricksTable,
+    HandStrengthBidSelectionStrategy,
+    hand_signature,
+    load_default_table,
+    simulate_expected_tricks
+)
+from src.pyohhell.cards import cards_to_mask, suit_index
+from src.pyohhell.game_engine import GameEngine
+from src.pyohhell.game_state import (
+    DefaultPointAttributionStrategy,
+    GameState,
+    Round
+)
+from src.pyohhell.player import (
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+
+
+# test hand_signature
+test_values = [
+    ([Card(Suit.HEARTS, Value.ACE), Card(Suit.HEARTS, Value.FOUR)],
+     Suit.HEARTS, 0, 4, (4, 2, 0, 2, 1, 0, 0)),
+    ([Card(Suit.SPADES, Value.ACE), Card(Suit.CLUBS, Value.KING),
+      Card(Suit.HEARTS, Value.JACK), Card(Suit.HEARTS, Value.TEN)],
+     Suit.HEARTS, 2, 3, (3, 4, 2, 2, 1, 1, 1)),
+    ([Card(Suit.SPADES, Value.ACE), Card(Suit.SPADES, Value.KING)],
+     Suit.SPADES, 1, 2, (2, 2, 1, 2, 2, 0, 0)),
+    ([], Suit.DIAMONDS, 0, 5, (5, 0, 0, 0, 0, 0, 0))
+]
+
+
+@pytest.mark.parametrize('hand, trump, seat, n_players, expected',
+                         test_values)
+def test_hand_signature(hand, trump, seat, n_players, expected):
+
+    actual = hand_signature(
+        cards_to_mask(hand), suit_index(trump), seat, n_players
+    )
+
+    assert actual == expected
+
+
+# test expected_tricks
+table = ExpectedTricksTable({
+    (2, 1, 0, 1, 1, 0, 0): (1., 24),
+    (2, 1, 0, 0, 0, 0, 0): (0.5, 8)
+})
+test_values = [
+    # shrunk towards the bucket mean, (24 + 4) / 32 = 0.875
+    ((2, 1, 0, 1, 1, 0, 0), (24 + 0.875 * 8) / 32),
+    ((2, 1, 0, 0, 0, 0, 0), (4 + 0.875 * 8) / 16),
+    # the bucket mean
+    ((2, 1, 0, 1, 0, 1, 0), 0.875),
+    # the share of the tricks
+    ((4, 8, 1, 0, 0, 0, 0), 2.)
+]
+
+
+@pytest.mark.parametrize('signature, expected', test_values)
+def test_expected_tricks(signature, expected):
+
+    assert table.expected_tricks(signature) == pytest.approx(expected)
+
+
+# test table_bytes
+def test_table_bytes(tmp_path):
+
+    data = table.to_bytes()
+    path = str(tmp_path / 'table.bin')
+    table.save(path)
+
+    assert data.startswith(TABLE_MAGIC)
+    assert ExpectedTricksTable.from_bytes(data).samples == table.samples
+    assert ExpectedTricksTable.load(path).samples == table.samples
+    assert len(ExpectedTricksTable.load(path)) == 2
+
+
+# test table_bytes_errors
+test_values = [
+    b'',
+    b'OHXX\x00\x00\x00\x00',
+    TABLE_MAGIC + b'\x00\x00\x00\x00garbage',
+    table.to_bytes()[:4] + b'\x03' + table.to_bytes()[5:]
+]
+
+
+@pytest.mark.parametrize('data', test_values)
+def test_table_bytes_errors(data):
+
+    with pytest.raises(ValueError):
+        ExpectedTricksTable.from_bytes(data)
+
+
+# test simulate_expected_tricks
+def test_simulate_expected_tricks():
+
+    actual = simulate_expected_tricks([2, 3], 50, seed=1)
+
+    assert actual.samples == simulate_expected_tricks([2, 3], 50, 1).samples
+
+    # every seat of every deal is a sample, and every trick is won
+    tricks = dict()
+    for signature, (mean, count) in actual.samples.items():
+        n_players, n_cards = signature[:2]
+        total = tricks.setdefault((n_players, n_cards), [0., 0])
+        total[0] += mean * count
+        total[1] += count
+    assert set(tricks) == {(2, n) for n in range(1, 26)} | \
+        {(3, n) for n in range(1, 18)}
+    for (n_players, n_cards), (n_tricks, count) in tricks.items():
+        assert count == 50 * n_players
+        assert n_tricks == pytest.approx(50 * n_cards)
+
+
+# test simulate_expected_tricks_errors
+test_values = [([1], 10), ([52], 10), ([2], 0)]
+
+
+@pytest.mark.parametrize('n_players_range, n_deals', test_values)
+def test_simulate_expected_tricks_errors(n_players_range, n_deals):
+
+    with pytest.raises(ValueError):
+        simulate_expected_tricks(n_players_range, n_deals)
+
+
+# test load_default_table
+def test_load_default_table():
+
+    default_table = load_default_table()
+
+    assert default_table is load_default_table()
+    # more trumps and honours, more tricks
+    assert default_table.expected_tricks((4, 5, 0, 4, 3, 1, 0)) > \
+        default_table.expected_tricks((4, 5, 0, 1, 0, 0, 0))
+    for n_players in range(2, 8):
+        for n_cards in range(1, 51 // n_players + 1):
+            assert default_table.expected_tricks(
+                (n_players, n_cards, 0, 0, 0, 0, 0)
+            ) <= n_cards
+
+
+# test select_bid
+def build_game_state(bids, trump_card):
+
+    game_round = Round(0, trump_card)
+    for player_id, bid in bids:
+        game_round.add_bid(player_id, bid)
+
+    game_state = GameState()
+    game_state.current_round = game_round
+
+    return game_state
+
+
+test_values = [
+    # 0.97 tricks expected
+    ([Card(Suit.HEARTS, Value.ACE)], [0, 1], 1),
+    # 0.69 tricks expected
+    ([Card(Suit.SPADES, Value.TWO)], [0, 1], 1),
+    # the last bidder can't bid 1
+    ([Card(Suit.HEARTS, Value.ACE)], [0], 0)
+]
+
+
+@pytest.mark.parametrize('hand, authorised_bids, expected', test_values)
+def test_select_bid(hand, authorised_bids, expected):
+
+    game_state = build_game_state([], Card(Suit.HEARTS, Value.TWO))
+    strategy = HandStrengthBidSelectionStrategy(table, n_players=2)
+
+    assert strategy.select_bid(hand, authorised_bids, game_state) == \
+        expected
+
+
+def test_select_bid_default_table():
+
+    game_state = build_game_state([(1, 0)], Card(Suit.HEARTS, Value.TWO))
+    strategy = HandStrengthBidSelectionStrategy(n_players=4)
+    strong_hand = [
+        Card(Suit.HEARTS, value) for value in
+        (Value.ACE, Value.KING, Value.QUEEN, Value.JACK, Value.TEN)
+    ] + [Card(Suit.SPADES, Value.ACE)]
+    weak_hand = [
+        Card(suit, value) for suit in (Suit.SPADES, Suit.CLUBS)
+        for value in (Value.TWO, Value.THREE, Value.FOUR)
+    ]
+
+    assert strategy.select_bid(strong_hand, range(7), game_state) > \
+        strategy.select_bid(weak_hand, range(7), game_state)
+
+
+# test select_bid_errors
+def test_select_bid_errors():
+
+    hand = [Card(Suit.HEARTS, Value.ACE)]
+
+    with pytest.raises(ValueError):
+        HandStrengthBidSelectionStrategy(table, 2).select_bid(
+            hand, [0, 1], GameState()
+        )
+    with pytest.raises(ValueError):
+        HandStrengthBidSelectionStrategy(table).select_bid(
+            hand, [0, 1], build_game_state([], Card(Suit.HEARTS, Value.TWO))
+        )
+
+
+# test hand_strength_game
+def test_hand_strength_game():
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    game_engine.subscribe_player(Player(
+        1, RandomCardSelectionStrategy(),
+        HandStrengthBidSelectionStrategy(n_players=3)
+    ))
+    for player_id in (2, 3):
+        game_engine.subscribe_player(Player(
+            player_id, RandomCardSelectionStrategy(),
+            RandomBidSelectionStrategy()
+        ))
+
+    assert set(game_engine.play_game(1)) == {1, 2, 3}
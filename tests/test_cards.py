@@ -0,0 +1,203 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from pydecklib.card import Card, Suit, Value
+import pytest
+
+from src.pyohhell.cards import (
+    CARDS,
+    SUIT_MASKS,
+    Hand,
+    beats,
+    card_rank,
+    card_suit,
+    card_to_index,
+    cards_to_mask,
+    count_cards,
+    index_to_card,
+    mask_to_cards,
+    mask_to_indices,
+    suit_index,
+    trick_winner_position
+)
+
+
+# test card_to_index
+test_values = [
+    (Card(Suit.SPADES, Value.TWO), 0),
+    (Card(Suit.SPADES, Value.ACE), 12),
+    (Card(Suit.HEARTS, Value.FOUR), 15),
+    (Card(Suit.CLUBS, Value.ACE), 51),
+    (CARDS[27], 27)
+]
+
+
+@pytest.mark.parametrize('card, expected', test_values)
+def test_card_to_index(card, expected):
+
+    actual = card_to_index(card)
+    assert actual == expected
+
+
+# test index_to_card
+@pytest.mark.parametrize('index', range(52))
+def test_index_to_card(index):
+
+    card = index_to_card(index)
+
+    assert card is CARDS[index]
+    assert card_to_index(Card(card.suit, card.value)) == index
+    assert card_suit(index) == suit_index(card.suit)
+    assert card_rank(index) == index % 13
+
+
+# test cards_to_mask
+test_values = [
+    ([], 0),
+    ([Card(Suit.SPADES, Value.TWO)], 1),
+    ([Card(Suit.SPADES, Value.TWO), Card(Suit.SPADES, Value.FOUR)], 5),
+    ([Card(Suit.CLUBS, Value.ACE)], 1 << 51)
+]
+
+
+@pytest.mark.parametrize('cards, expected', test_values)
+def test_cards_to_mask(cards, expected):
+
+    actual = cards_to_mask(cards)
+    assert actual == expected
+
+
+# test mask_to_indices
+test_values = [
+    (0, []),
+    (5, [0, 2]),
+    (SUIT_MASKS[1], list(range(13, 26))),
+    ((1 << 51) | 1, [0, 51])
+]
+
+
+@pytest.mark.parametrize('mask, expected', test_values)
+def test_mask_to_indices(mask, expected):
+
+    actual = mask_to_indices(mask)
+    assert actual == expected
+    assert count_cards(mask) == len(expected)
+
+
+# test mask_to_cards
+test_values = [
+    (0, []),
+    (
+        5,
+        [Card(Suit.SPADES, Value.TWO), Card(Suit.SPADES, Value.FOUR)]
+    )
+]
+
+
+@pytest.mark.parametrize('mask, expected', test_values)
+def test_mask_to_cards(mask, expected):
+
+    actual = mask_to_cards(mask)
+    assert [(c.suit, c.value) for c in actual] == \
+           [(c.suit, c.value) for c in expected]
+
+
+# test beats
+test_values = [
+    # lead suit, trump suit, card, other card
+    (0, 1, 1, 0, True),
+    (0, 1, 0, 1, False),
+    (0, 1, 13, 12, True),
+    (0, 1, 12, 13, False),
+    (0, 1, 26, 27, False),
+    (0, 1, 27, 26, False),
+    (0, 1, 0, 51, True),
+    (2, 2, 26, 25, True),
+    (2, 2, 38, 26, True)
+]
+
+
+@pytest.mark.parametrize(
+    'lead_suit, trump_suit, index, other_index, expected', test_values
+)
+def test_beats(lead_suit, trump_suit, index, other_index, expected):
+
+    actual = beats(lead_suit, trump_suit, index, other_index)
+    assert actual == expected
+
+
+# test trick_winner_position
+test_values = [
+    ([0], 3, 0),
+    ([0, 1], 3, 1),
+    ([1, 0], 3, 0),
+    ([0, 27, 26], 3, 0),
+    ([0, 27, 26], 2, 1),
+    ([12, 13, 3], 1, 1),
+    ([26, 51, 27, 39], 2, 2)
+]
+
+
+@pytest.mark.parametrize(
+    'card_indices, trump_suit, expected', test_values
+)
+def test_trick_winner_position(card_indices, trump_suit, expected):
+
+    actual = trick_winner_position(card_indices, trump_suit)
+    assert actual == expected
+
+
+# test hand
+hand_cards = [
+    Card(Suit.HEARTS, Value.ACE), Card(Suit.SPADES, Value.KING),
+    Card(Suit.HEARTS, Value.TEN), Card(Suit.CLUBS, Value.TWO)
+]
+test_values = [
+    (None, hand_cards),
+    (Suit.HEARTS, [hand_cards[0], hand_cards[2]]),
+    (Suit.SPADES, [hand_cards[1]]),
+    (Suit.DIAMONDS, hand_cards)
+]
+
+
+@pytest.mark.parametrize('trick_suit, expected', test_values)
+def test_hand_authorised_cards(trick_suit, expected):
+
+    hand = Hand(hand_cards)
+
+    assert hand.authorised_cards(trick_suit) == expected
+    assert hand.authorised_mask(trick_suit) == cards_to_mask(expected)
+
+
+def test_hand():
+
+    hand = Hand(hand_cards)
+    cards = hand.cards
+
+    assert list(hand) == hand_cards and len(hand) == 4
+    assert hand.cards is cards
+    assert Card(Suit.HEARTS, Value.TEN) in hand
+    assert Card(Suit.DIAMONDS, Value.TEN) not in hand
+
+    # the order of the other cards is kept
+    hand.remove(Card(Suit.HEARTS, Value.ACE))
+    hand.add(Card(Suit.HEARTS, Value.FOUR))
+
+    assert hand.cards == hand_cards[1:] + [Card(Suit.HEARTS, Value.FOUR)]
+    assert hand.authorised_cards(Suit.HEARTS) == [
+        Card(Suit.HEARTS, Value.TEN), Card(Suit.HEARTS, Value.FOUR)
+    ]
+    assert hand.mask == cards_to_mask(hand.cards)
+
+
+# test hand_errors
+def test_hand_errors():
+
+    hand = Hand(hand_cards)
+
+    with pytest.raises(ValueError):
+        hand.add(Card(Suit.SPADES, Value.KING))
+    with pytest.raises(ValueError):
+        hand.remove(Card(Suit.SPADES, Value.QUEEN))
+    with pytest.raises(ValueError):
+        Hand(hand_cards + hand_cards[:1])
@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import logging
+
+from pydecklib.card import Card, Suit, Value
+import pytest
+
+from src.pyohhell.events import (
+    BidMade,
+    CardPlayed,
+    EventStream,
+    LoggingSink,
+    RecordingSink
+)
+
+
+# test event_stream_emit
+test_values = [
+    (0, [BidMade(0, 1, 0)], []),
+    (1, [BidMade(0, 1, 0)], [BidMade(0, 1, 0)]),
+    (
+        2,
+        [BidMade(0, 1, 0), CardPlayed(0, 0, 1, Card(Suit.SPADES, Value.TWO))],
+        [BidMade(0, 1, 0), CardPlayed(0, 0, 1, Card(Suit.SPADES, Value.TWO))]
+    )
+]
+
+
+@pytest.mark.parametrize('n_sinks, events, expected', test_values)
+def test_event_stream_emit(n_sinks, events, expected):
+
+    event_stream = EventStream()
+    sinks = [RecordingSink() for _ in range(n_sinks)]
+    for sink in sinks:
+        event_stream.attach(sink)
+
+    for event in events:
+        event_stream.emit(event)
+
+    assert bool(event_stream) == bool(n_sinks)
+    assert all(sink.events == expected for sink in sinks)
+
+
+# test event_stream_detach
+test_values = [
+    (True, True, []),
+    (True, False, [BidMade(0, 1, 0)]),
+    (False, True, ValueError())
+]
+
+
+@pytest.mark.parametrize('attach, detach, expected', test_values)
+def test_event_stream_detach(attach, detach, expected):
+
+    event_stream = EventStream()
+    sink = RecordingSink()
+    if attach:
+        event_stream.attach(sink)
+
+    if isinstance(expected, Exception):
+        with pytest.raises(type(expected)):
+            event_stream.detach(sink)
+    else:
+        if detach:
+            event_stream.detach(sink)
+        event_stream.emit(BidMade(0, 1, 0))
+
+        assert sink.events == expected
+        assert event_stream.sinks == ([] if detach else [sink])
+
+
+# test logging_sink
+test_values = [
+    (BidMade(0, 1, 0), "BidMade(round_id=0, player_id=1, bid=0)")
+]
+
+
+@pytest.mark.parametrize('event, expected', test_values)
+def test_logging_sink(event, expected, caplog):
+
+    sink = LoggingSink(logging.getLogger('pyohhell'))
+    with caplog.at_level(logging.INFO, logger='pyohhell'):
+        sink(event)
+
+    assert caplog.messages == [expected]
@@ -0,0 +1,249 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pyohhell.game_archive import GameArchive
+from src.pyohhell.game_engine import GameEngine
+from src.pyohhell.game_record import (
+    RECORDED_EVENT_TYPES,
+    GameRecorder,
+    iter_record_rounds
+)
+from src.pyohhell.game_state import DefaultPointAttributionStrategy
+from src.pyohhell.player import (
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+
+
+def record_games(player_ids, seeds):
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    for player_id in player_ids:
+        game_engine.subscribe_player(Player(
+            player_id, RandomCardSelectionStrategy(),
+            RandomBidSelectionStrategy()
+        ))
+    recorder = GameRecorder()
+    game_engine.events.attach(recorder, RECORDED_EVENT_TYPES)
+    for seed in seeds:
+        game_engine.play_game(seed)
+
+    return recorder.records
+
+
+records = (
+    record_games((1, 2, 3), [1, 2, None]) +
+    record_games((3, 67, 4, 5), [2, -7]) +
+    record_games((6, 7), [1])
+)
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+
+    path = str(tmp_path / 'games.ohr')
+    with GameArchive(path, 'a') as archive:
+        for record in records:
+            archive.append(record)
+
+    return path
+
+
+# test game_archive_init
+test_values = ['w', 'r+']
+
+
+@pytest.mark.parametrize('mode', test_values)
+def test_game_archive_init(tmp_path, mode):
+
+    with pytest.raises(ValueError):
+        GameArchive(str(tmp_path / 'games.ohr'), mode)
+
+
+# test game_archive_getitem
+test_values = list(range(len(records)))
+
+
+@pytest.mark.parametrize('game_id', test_values)
+def test_game_archive_getitem(archive_path, game_id):
+
+    with GameArchive(archive_path) as archive:
+        assert len(archive) == len(records)
+        assert archive[game_id] == records[game_id]
+
+
+# test game_archive_getitem_errors
+test_values = [-1, len(records)]
+
+
+@pytest.mark.parametrize('game_id', test_values)
+def test_game_archive_getitem_errors(archive_path, game_id):
+
+    with GameArchive(archive_path) as archive:
+        with pytest.raises(IndexError):
+            archive[game_id]
+
+
+# test game_archive_append
+test_values = [
+    (records[0], None),
+    (b'', ValueError()),
+    (records[0][:3], ValueError())
+]
+
+
+@pytest.mark.parametrize('record, expected', test_values)
+def test_game_archive_append(archive_path, record, expected):
+
+    with GameArchive(archive_path) as archive:
+        with pytest.raises(ValueError):
+            archive.append(records[0])
+
+    with GameArchive(archive_path, 'a') as archive:
+        if expected is not None:
+            with pytest.raises(type(expected)):
+                archive.append(record)
+        else:
+            # the appended games can be read before the archive is closed
+            assert archive[0] == records[0]
+            assert archive.append(record) == len(records)
+            assert archive[len(records)] == record
+
+    with GameArchive(archive_path) as archive:
+        assert len(archive) == len(records) + (expected is None)
+
+
+# test game_archive_interrupted_append
+test_values = [0, 10, 31]
+
+
+@pytest.mark.parametrize('index_bytes', test_values)
+def test_game_archive_interrupted_append(tmp_path, index_bytes):
+
+    path = str(tmp_path / 'games.ohr')
+    with GameArchive(path, 'a') as archive:
+        archive.append(records[0])
+        archive.append(records[1])
+
+    # the record of a third game, and part of its index entry
+    with open(path, 'ab') as data_file:
+        data_file.write(records[2])
+    with open(path + '.idx', 'rb') as index_file:
+        entry = index_file.read(32)
+    with open(path + '.idx', 'ab') as index_file:
+        index_file.write(entry[:index_bytes])
+
+    with GameArchive(path, 'a') as archive:
+        assert len(archive) == 2
+        assert archive.append(records[3]) == 2
+        assert archive[2] == records[3]
+
+    with GameArchive(path) as archive:
+        assert [archive[i] for i in range(len(archive))] == \
+            [records[0], records[1], records[3]]
+
+
+# test game_archive_lookups_append
+def test_game_archive_lookups_append(archive_path):
+
+    with GameArchive(archive_path, 'a') as archive:
+        # the posting lists are built, then kept up to date by the appends
+        assert list(archive.find_by_seed(1)) == [0, 5]
+        scan = archive.scan(player_id=3)
+        assert next(scan)[0] == 0
+        game_id = archive.append(records[3])
+        assert list(archive.find_by_seed(2)) == [1, 3, game_id]
+        assert list(archive.find_by_player(67)) == [3, 4, game_id]
+        # a scan goes over the games archived when it started
+        assert [game_id for game_id, _ in scan] == [1, 2, 3, 4]
+
+
+# test game_archive_close
+def test_game_archive_close(archive_path):
+
+    archive = GameArchive(archive_path)
+    data_map, index_map = archive._map()
+    archive.close()
+
+    # the maps are closed with the archive
+    assert data_map.closed and index_map.closed
+
+
+# test game_archive_find_by_seed
+test_values = [
+    (1, [0, 5]),
+    (2, [1, 3]),
+    (-7, [4]),
+    (3, [])
+]
+
+
+@pytest.mark.parametrize('seed, expected', test_values)
+def test_game_archive_find_by_seed(archive_path, seed, expected):
+
+    with GameArchive(archive_path) as archive:
+        assert list(archive.find_by_seed(seed)) == expected
+
+
+# test game_archive_find_by_player
+test_values = [
+    (3, [0, 1, 2, 3, 4]),
+    (67, [3, 4]),
+    # 67 and 131 share the same bit of the players mask
+    (131, []),
+    (6, [5]),
+    (0, [])
+]
+
+
+@pytest.mark.parametrize('player_id, expected', test_values)
+def test_game_archive_find_by_player(archive_path, player_id, expected):
+
+    with GameArchive(archive_path) as archive:
+        assert list(archive.find_by_player(player_id)) == expected
+
+
+# test game_archive_scan
+test_values = [
+    (None, None, [0, 1, 2, 3, 4, 5]),
+    (2, 67, [3]),
+    (1, 3, [0])
+]
+
+
+@pytest.mark.parametrize('seed, player_id, expected', test_values)
+def test_game_archive_scan(archive_path, seed, player_id, expected):
+
+    with GameArchive(archive_path) as archive:
+        actual = list(archive.scan(seed, player_id))
+
+    assert [game_id for game_id, _ in actual] == expected
+    assert [record for _, record in actual] == [records[i] for i in expected]
+
+
+# test game_archive_scan_rounds
+test_values = [
+    (0, [2]),
+    (2, [4]),
+    (10, [])
+]
+
+
+@pytest.mark.parametrize('round_id, expected', test_values)
+def test_game_archive_scan_rounds(archive_path, round_id, expected):
+
+    # the games where player 3 bid 0 in a round
+    with GameArchive(archive_path) as archive:
+        actual = [
+            game_id for game_id, record in archive.scan(player_id=3)
+            if any(
+                game_round.round_id == round_id and
+                game_round.bid_by_player_id[3] == 0
+                for game_round in iter_record_rounds(record)
+            )
+        ]
+
+    assert actual == expected
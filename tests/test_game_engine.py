@@ -5,14 +5,33 @@ from pydecklib.card import Card, Suit, Value
 import pytest
 
 from src.pyohhell.game_state import DefaultPointAttributionStrategy
-from src.pyohhell.player import Player
+from src.pyohhell.player import (
+    AbstractPlayer,
+    FirstBidSelectionStrategy,
+    FirstCardSelectionStrategy,
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
 from src.pyohhell.game_state import (
     GameState,
     Round,
     Trick
 )
+from src.pyohhell.cards import cards_to_mask
+from src.pyohhell.events import (
+    BidMade,
+    CardPlayed,
+    GameScored,
+    GameStarted,
+    RecordingSink,
+    RoundScored,
+    RoundStarted,
+    TrickWon
+)
 from src.pyohhell.game_engine import (
     get_authorised_cards,
+    get_authorised_mask,
     get_authorised_bids,
     GameEngine
 )
@@ -50,6 +69,30 @@ def test_get_authorised_cards(cards, trick_suit, expected):
     assert actual == expected
 
 
+# test get_authorised_mask
+
+test_values = [
+    ([], Suit.SPADES, []),
+    ([Card(Suit.SPADES, Value.TWO)], None, [Card(Suit.SPADES, Value.TWO)]),
+    (
+        [Card(Suit.DIAMONDS, Value.TWO)], Suit.SPADES,
+        [Card(Suit.DIAMONDS, Value.TWO)]
+    ),
+    (
+        [Card(Suit.SPADES, Value.THREE), Card(Suit.DIAMONDS, Value.TWO)],
+        Suit.SPADES,
+        [Card(Suit.SPADES, Value.THREE)]
+    )
+]
+
+
+@pytest.mark.parametrize('cards, trick_suit, expected', test_values)
+def test_get_authorised_mask(cards, trick_suit, expected):
+
+    actual = get_authorised_mask(cards_to_mask(cards), trick_suit)
+    assert actual == cards_to_mask(expected)
+
+
 # test get_authorised_bids
 
 test_values = [
@@ -170,10 +213,8 @@ def test_game_notify_game_state(players, game_state, expected):
 player_a_0 = Player(0)
 player_a_1 = Player(1)
 
-player_b_0 = Player(0)
-player_b_0._hand = [Card(Suit.SPADES, Value.TWO)]
-player_b_1 = Player(1)
-player_b_1._hand = [Card(Suit.SPADES, Value.THREE)]
+player_b_0 = Player(0, initial_hand=(Card(Suit.SPADES, Value.TWO),))
+player_b_1 = Player(1, initial_hand=(Card(Suit.SPADES, Value.THREE),))
 
 test_values = [
     ([player_a_0, player_a_1], [player_b_0, player_b_1]),
@@ -189,11 +230,38 @@ def test_game_distribute_cards(players, expected):
     ge._distribute_cards(1)
 
     assert all(
-        len(p1._hand) == len(p2._hand)
+        len(p1.hand) == len(p2.hand)
         for p1, p2 in zip(ge._players, expected)
     )
 
 
+# test game_engine_distribute_cards_deal_order
+
+test_values = [(2, 1), (3, 4), (4, 12)]
+
+
+@pytest.mark.parametrize('n_players, n_cards', test_values)
+def test_game_distribute_cards_deal_order(n_players, n_cards):
+
+    ge = GameEngine(DefaultPointAttributionStrategy())
+    for player_id in range(n_players):
+        ge.subscribe_player(Player(player_id))
+    ge._shuffle_deck(1)
+    deck = list(ge._deck)
+
+    ge._distribute_cards(n_cards)
+
+    for player_idx, player in enumerate(ge._players):
+        expected = [
+            deck[card_idx * n_players + player_idx]
+            for card_idx in range(n_cards)
+        ]
+        assert all(
+            actual is card for actual, card in zip(player.hand, expected)
+        )
+        assert len(player.hand) == n_cards
+
+
 # test game_engine_ordered_players
 
 player_0 = Player(0)
@@ -221,15 +289,12 @@ def test_game_ordered_players(players, first_playerd_idx, expected):
 
 # test game_play_trick
 
-player_a_0 = Player(0)
-player_a_0._hand = [Card(Suit.SPADES, Value.TWO)]
-player_a_1 = Player(1)
-player_a_1._hand = [Card(Suit.SPADES, Value.THREE)]
+player_a_0 = Player(0, initial_hand=(Card(Suit.SPADES, Value.TWO),))
+player_a_1 = Player(1, initial_hand=(Card(Suit.SPADES, Value.THREE),))
 
-trick_a = Trick(0)
-trick_a._player_ids_cards = [
+trick_a = Trick(0, (
     (0, Card(Suit.SPADES, Value.TWO)), (1, Card(Suit.SPADES, Value.THREE))
-]
+))
 
 test_values = [
     ([player_a_0, player_a_1], trick_a),
@@ -253,18 +318,17 @@ def test_play_trick(players, expected):
 
 # test game_play_round
 
-player_a_0 = Player(0)
-player_a_0._hand = [Card(Suit.SPADES, Value.TWO)]
-player_a_1 = Player(1)
-player_a_1._hand = [Card(Suit.SPADES, Value.THREE)]
+player_a_0 = Player(0, initial_hand=(Card(Suit.SPADES, Value.TWO),))
+player_a_1 = Player(1, initial_hand=(Card(Suit.SPADES, Value.THREE),))
 
-trick_a = Trick(0)
-trick_a._player_ids_cards = [
+trick_a = Trick(0, (
     (0, Card(Suit.SPADES, Value.TWO)), (1, Card(Suit.SPADES, Value.THREE))
-]
+))
 round_a = Round(0, Card(Suit.DIAMONDS, Value.QUEEN))
-round_a._bid_by_player_id = {0: 0, 1: 0}
-round_a._tricks = [trick_a]
+round_a.add_bid(0, 0)
+round_a.add_bid(1, 0)
+round_a.current_trick = trick_a
+round_a.store_current_trick()
 
 test_values = [
     ([player_a_0, player_a_1], 1, 0, round_a),
@@ -277,7 +341,7 @@ test_values = [
 def test_play_round(players, n_cards, first_player_idx, expected):
 
     ge = GameEngine(DefaultPointAttributionStrategy())
-    ge._deck.initialise(shuffle=True, seed=1)
+    ge._shuffle_deck(1)
     for player in players:
         ge.subscribe_player(player)
     ge.play_round(0, n_cards, first_player_idx)
@@ -295,8 +359,8 @@ player_2 = Player(2)
 
 
 test_values = [
-    ([player_0, player_1], 1, {0: 75, 1: -193}),
-    ([player_0, player_1, player_2], 1, {0: 51, 1: -30, 2: -51})
+    ([player_0, player_1], 1, {0: -171, 1: -148}),
+    ([player_0, player_1, player_2], 1, {0: -35, 1: -45, 2: -55})
 ]
 
 
@@ -312,3 +376,294 @@ def test_play_game(players, seed, expected):
     assert actual == expected
 
 
+
+
+# test game_play_game_events
+
+test_values = [
+    (2, 1),
+    (3, 2)
+]
+
+
+@pytest.mark.parametrize('n_players, seed', test_values)
+def test_play_game_events(n_players, seed):
+
+    ge = GameEngine(DefaultPointAttributionStrategy())
+    for player_id in range(n_players):
+        ge.subscribe_player(Player(player_id))
+    sink = RecordingSink()
+    ge.events.attach(sink)
+
+    points_by_player_id = ge.play_game(seed)
+
+    n_rounds = 51 // n_players
+    n_tricks = sum(range(1, n_rounds + 1))
+    event_types = [type(event) for event in sink.events]
+    assert event_types.count(RoundStarted) == n_rounds
+    assert event_types.count(BidMade) == n_rounds * n_players
+    assert event_types.count(CardPlayed) == n_tricks * n_players
+    assert event_types.count(TrickWon) == n_tricks
+    assert event_types.count(RoundScored) == n_rounds
+    assert sink.events[0] == GameStarted(seed, tuple(range(n_players)))
+    assert sink.events[-1] == GameScored(dict(points_by_player_id))
+
+    ge.events.detach(sink)
+    assert not ge.events
+
+
+# test game_play_game_seeded
+
+test_values = [
+    (2, 1, 2),
+    (4, 3, 1)
+]
+
+
+@pytest.mark.parametrize('n_players, seed, other_seed', test_values)
+def test_play_game_seeded(n_players, seed, other_seed):
+
+    players = [
+        Player(
+            player_id, RandomCardSelectionStrategy(),
+            RandomBidSelectionStrategy()
+        )
+        for player_id in range(n_players)
+    ]
+
+    def play_game(seed):
+
+        ge = GameEngine(DefaultPointAttributionStrategy())
+        for player in players:
+            ge.subscribe_player(player)
+        sink = RecordingSink()
+        ge.events.attach(sink)
+        ge.play_game(seed)
+
+        return sink.events
+
+    expected = play_game(seed)
+    play_game(other_seed)
+    actual = play_game(seed)
+
+    # the game only depends on its seed, and each round has its own deal
+    assert actual == expected
+    trump_cards = [
+        event.trump_card for event in actual
+        if isinstance(event, RoundStarted)
+    ]
+    assert trump_cards.count(trump_cards[0]) < len(trump_cards)
+
+
+# test game_play_game_delta_notifications
+
+
+class NotifiedPlayer(Player):
+
+    def __init__(self, _id, notified_events=None):
+
+        super().__init__(_id, notified_events=notified_events)
+        self.n_game_state_updates = 0
+        self.events = list()
+
+    def update_game_state(self, game_state):
+
+        super().update_game_state(game_state)
+        self.n_game_state_updates += 1
+
+    def notify(self, event):
+
+        self.events.append(event)
+
+
+test_values = [
+    (None, None),
+    (tuple(), []),
+    ((TrickWon,), [TrickWon]),
+    ((BidMade, RoundScored), [BidMade, RoundScored])
+]
+
+
+@pytest.mark.parametrize('notified_events, expected', test_values)
+def test_play_game_delta_notifications(notified_events, expected):
+
+    ge = GameEngine(DefaultPointAttributionStrategy())
+    players = [NotifiedPlayer(i, notified_events) for i in range(2)]
+    for player in players:
+        ge.subscribe_player(player)
+
+    actual = ge.play_game(1)
+
+    reference_ge = GameEngine(DefaultPointAttributionStrategy())
+    for player_id in range(2):
+        reference_ge.subscribe_player(Player(player_id))
+    assert actual == reference_ge.play_game(1)
+
+    for player in players:
+        if notified_events is None:
+            assert player.n_game_state_updates > 1
+            assert player.events == []
+        else:
+            assert player.n_game_state_updates == 1
+            assert player._game_state is ge._game_state
+            assert {type(event) for event in player.events} == set(expected)
+
+    ge.unsubscribe_player(players[0])
+    assert ge.events.sinks == (
+        [] if notified_events is None else [players[1].notify]
+    )
+
+
+# test game_play_game_forced_moves
+
+
+class CountingCardSelectionStrategy(FirstCardSelectionStrategy):
+
+    def __init__(self):
+
+        self.n_calls = 0
+        self.n_forced_calls = 0
+
+    def select_card(self, hand, authorised_cards, game_state):
+
+        self.n_calls += 1
+        self.n_forced_calls += len(authorised_cards) == 1
+        return super().select_card(hand, authorised_cards, game_state)
+
+
+class CountingBidSelectionStrategy(FirstBidSelectionStrategy):
+
+    def __init__(self):
+
+        self.n_calls = 0
+        self.n_forced_calls = 0
+
+    def select_bid(self, hand, authorised_bids, game_state):
+
+        self.n_calls += 1
+        self.n_forced_calls += len(authorised_bids) == 1
+        return super().select_bid(hand, authorised_bids, game_state)
+
+
+class CountingPlayer(NotifiedPlayer):
+
+    def __init__(self, _id):
+
+        super().__init__(_id)
+        self._card_selection_strategy = CountingCardSelectionStrategy()
+        self._bid_selection_strategy = CountingBidSelectionStrategy()
+
+
+test_values = [
+    (2, 1),
+    (3, 2),
+    (4, 3)
+]
+
+
+@pytest.mark.parametrize('n_players, seed', test_values)
+def test_play_game_forced_moves(n_players, seed):
+
+    def play_game(resolve_forced_moves):
+
+        ge = GameEngine(
+            DefaultPointAttributionStrategy(), resolve_forced_moves
+        )
+        players = [CountingPlayer(i) for i in range(n_players)]
+        for player in players:
+            ge.subscribe_player(player)
+        sink = RecordingSink()
+        ge.events.attach(sink)
+
+        return ge.play_game(seed), sink.events, players
+
+    expected, expected_events, expected_players = play_game(False)
+    actual, actual_events, players = play_game(True)
+
+    # the same game, without asking the players for the forced moves
+    assert actual == expected
+    assert actual_events == expected_events
+    n_rounds = 51 // n_players
+    for player, expected_player in zip(players, expected_players):
+        card_strategy = player._card_selection_strategy
+        bid_strategy = player._bid_selection_strategy
+        expected_card_strategy = expected_player._card_selection_strategy
+        assert card_strategy.n_forced_calls == 0
+        assert bid_strategy.n_forced_calls == 0
+        # the last trick of each round is forced
+        assert card_strategy.n_calls <= \
+            expected_card_strategy.n_calls - n_rounds
+        assert card_strategy.n_calls == \
+            expected_card_strategy.n_calls - \
+            expected_card_strategy.n_forced_calls
+        assert 0 < player.n_game_state_updates < \
+            expected_player.n_game_state_updates
+
+    # the last bidder of the round of one card can only bid 0
+    assert expected_players[-1]._bid_selection_strategy.n_forced_calls > 0
+
+
+# test game_play_game_forced_moves_abstract_player
+
+
+class ListPlayer(AbstractPlayer):
+
+    def __init__(self, _id):
+
+        self._id = _id
+        self._hand = list()
+
+    @property
+    def id(self):
+
+        return self._id
+
+    @property
+    def hand(self):
+
+        return self._hand
+
+    def add_to_hand(self, card):
+
+        self._hand.append(card)
+
+    def update_game_state(self, game_state):
+
+        pass
+
+    def play_card(self, authorised_cards):
+
+        self._hand.remove(authorised_cards[0])
+        return authorised_cards[0]
+
+    def make_bid(self, authorised_bids):
+
+        return authorised_bids[0]
+
+
+test_values = [
+    (2, 1),
+    (3, 2)
+]
+
+
+@pytest.mark.parametrize('n_players, seed', test_values)
+def test_play_game_forced_moves_abstract_player(n_players, seed):
+
+    def play_game(resolve_forced_moves):
+
+        ge = GameEngine(
+            DefaultPointAttributionStrategy(), resolve_forced_moves
+        )
+        players = [ListPlayer(i) for i in range(n_players)]
+        for player in players:
+            ge.subscribe_player(player)
+
+        return ge.play_game(seed), players
+
+    expected, _ = play_game(False)
+    actual, players = play_game(True)
+
+    # the forced cards are removed from the hands of the players
+    assert actual == expected
+    assert all(player.hand == [] for player in players)
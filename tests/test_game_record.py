@@ -0,0 +1,170 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pyohhell.cards import CARDS
+from src.pyohhell.game_engine import GameEngine
+from src.pyohhell.game_record import (
+    RECORD_MAGIC,
+    RECORDED_EVENT_TYPES,
+    GameRecorder,
+    _read_varint,
+    _unzigzag,
+    _write_varint,
+    _zigzag,
+    iter_record_rounds,
+    read_record_header,
+    replay_game
+)
+from src.pyohhell.game_state import DefaultPointAttributionStrategy, GameState
+from src.pyohhell.player import (
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+
+
+def recorded_game_engine(player_ids):
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    for player_id in player_ids:
+        game_engine.subscribe_player(Player(
+            player_id, RandomCardSelectionStrategy(),
+            RandomBidSelectionStrategy()
+        ))
+    recorder = GameRecorder()
+    game_engine.events.attach(recorder, RECORDED_EVENT_TYPES)
+
+    return game_engine, recorder
+
+
+# test varint
+test_values = [0, 1, 127, 128, 300, 2 ** 64 + 5]
+
+
+@pytest.mark.parametrize('value', test_values)
+def test_varint(value):
+
+    buffer = bytearray(b'\x00')
+    _write_varint(buffer, value)
+
+    assert _read_varint(bytes(buffer), 1) == (value, len(buffer))
+
+
+# test varint_errors
+test_values = [
+    (-1, None),
+    (None, b'\x80\x80')
+]
+
+
+@pytest.mark.parametrize('value, record', test_values)
+def test_varint_errors(value, record):
+
+    with pytest.raises(ValueError):
+        if value is not None:
+            _write_varint(bytearray(), value)
+        else:
+            _read_varint(record, 0)
+
+
+# test zigzag
+test_values = [(0, 0), (-1, 1), (1, 2), (-2, 3), (2 ** 70, 2 ** 71)]
+
+
+@pytest.mark.parametrize('value, expected', test_values)
+def test_zigzag(value, expected):
+
+    assert _zigzag(value) == expected
+    assert _unzigzag(expected) == value
+
+
+# test read_record_header
+test_values = [
+    ((1, 2), 1),
+    ((0, -3, 7), None),
+    ((4, 5, 6, 7), -12)
+]
+
+
+@pytest.mark.parametrize('player_ids, seed', test_values)
+def test_read_record_header(player_ids, seed):
+
+    game_engine, recorder = recorded_game_engine(player_ids)
+    game_engine.play_game(seed)
+
+    actual = read_record_header(recorder.records[0])
+
+    assert actual.seed == seed
+    assert actual.player_ids == player_ids
+
+
+# test replay_game
+test_values = [
+    ((0, 1), [1]),
+    ((1, 2, 3), [1, 2]),
+    ((0, -3, 7, 12, 4), [5, None])
+]
+
+
+@pytest.mark.parametrize('player_ids, seeds', test_values)
+def test_replay_game(player_ids, seeds):
+
+    game_engine, recorder = recorded_game_engine(player_ids)
+    for seed in seeds:
+
+        points_by_player_id = game_engine.play_game(seed)
+        actual = replay_game(recorder.records[-1])
+
+        assert actual == game_engine._game_state
+        assert actual.zobrist_hash == game_engine._game_state.zobrist_hash
+        assert actual.get_points_by_player_id() == points_by_player_id
+
+        # the game state of the engine keeps the rounds of every game
+        game_engine._game_state = GameState()
+
+    assert len(recorder.records) == len(seeds)
+
+
+# test iter_record_rounds
+test_values = [
+    ((0, 1), 1),
+    ((5, 2, 3), None)
+]
+
+
+@pytest.mark.parametrize('player_ids, seed', test_values)
+def test_iter_record_rounds(player_ids, seed):
+
+    game_engine, recorder = recorded_game_engine(player_ids)
+    game_engine.play_game(seed)
+
+    actual = list(iter_record_rounds(recorder.records[0]))
+    expected = game_engine._game_state._rounds
+
+    assert [r.round_id for r in actual] == [r.id for r in expected]
+    for recorded_round, game_round in zip(actual, expected):
+        assert CARDS[recorded_round.trump_index] == game_round.trump_card
+        assert list(recorded_round.bid_by_player_id.items()) == \
+            list(game_round.bid_by_player_id.items())
+        assert [
+            tuple((player_id, CARDS[index]) for player_id, index in trick)
+            for trick in recorded_round.tricks
+        ] == [trick.player_ids_cards for trick in game_round._tricks]
+
+
+# test replay_game_errors
+test_values = [
+    b'',
+    b'OHR\x02\x00\x00',
+    RECORD_MAGIC + b'\x03\x02\x00\x02\x00\x01\x33\x00\x00',
+    RECORD_MAGIC + b'\x03\x02\x00\x02\x00\x01\x33\x00\x00\x00\x00'
+]
+
+
+@pytest.mark.parametrize('record', test_values)
+def test_replay_game_errors(record):
+
+    with pytest.raises(ValueError):
+        replay_game(record)
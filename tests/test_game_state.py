@@ -4,6 +4,7 @@
 from pydecklib.card import Card, Suit, Value
 import pytest
 
+from src.pyohhell.cards import card_to_index
 from src.pyohhell.game_state import (
     DefaultPointAttributionStrategy,
     GameState,
@@ -57,8 +58,11 @@ def test_trick_add_player_card(player_ids_cards, player_id, card, expected):
 
     trick = Trick(0, player_ids_cards)
     trick.add_player_card(player_id, card)
-    actual = trick._player_ids_cards
-    assert actual == expected
+    actual = trick.player_ids_cards
+    assert actual == tuple(expected)
+    assert trick.player_ids == tuple(p for p, _ in expected)
+    assert trick.card_indices == bytes(card_to_index(c) for _, c in expected)
+    assert trick.n_cards == len(expected)
 
 
 # test trick_get_winner
@@ -164,9 +168,12 @@ test_values = [
 )
 def test_trick_get_winner(players_ids_cards, trump_suit, expected):
 
+    suit_ranking = dict(Card.suit_ranking)
+
     trick = Trick(0, players_ids_cards)
     actual = trick.get_winner(trump_suit)
     assert actual == expected
+    assert Card.suit_ranking == suit_ranking
 
 
 # test default_point_attribution_strategy_attribute_points
@@ -284,6 +291,7 @@ def test_round_store_current_trick(tricks, expected):
 
     assert round.current_trick is None
     assert round._tricks == expected
+    assert round.tricks == tuple(expected)
 
 
 # test round_total_bid
@@ -302,7 +310,8 @@ def test_round_total_bid(bid_by_player_id, expected):
         0, Card(Suit.SPADES, Value.TWO), DefaultPointAttributionStrategy()
     )
 
-    round._bid_by_player_id = bid_by_player_id
+    for player_id, bid in bid_by_player_id.items():
+        round.add_bid(player_id, bid)
     actual = round.total_bid
 
     assert actual == expected
@@ -362,6 +371,16 @@ test_values = [
             ))
         ],
         {1: 1, 3: 1}
+    ),
+    # the tricks won by player 0 are counted
+    (
+        [
+            Trick(0, (
+                (0, Card(Suit.SPADES, Value.ACE)),
+                (1, Card(Suit.HEARTS, Value.TWO))
+            ))
+        ],
+        {0: 1}
     )
 ]
 
@@ -373,7 +392,9 @@ def test_round_get_wins_by_player_id(tricks, expected):
         0, Card(Suit.SPADES, Value.TWO), DefaultPointAttributionStrategy()
     )
 
-    round._tricks = tricks
+    for trick in tricks:
+        round.current_trick = trick
+        round.store_current_trick()
     actual = round.get_wins_by_player_id()
 
     assert actual == expected
@@ -408,6 +429,16 @@ test_values = [
             ))
         ],
         {1: -1, 2: 3, 3: 4}
+    ),
+    (
+        {0: 1, 1: 0},
+        [
+            Trick(0, (
+                (0, Card(Suit.SPADES, Value.ACE)),
+                (1, Card(Suit.HEARTS, Value.TWO))
+            ))
+        ],
+        {0: 4, 1: 3}
     )
 ]
 
@@ -419,8 +450,11 @@ def test_round_get_points_by_player_id(bid_by_player, tricks, expected):
         0, Card(Suit.SPADES, Value.TWO), DefaultPointAttributionStrategy()
     )
 
-    round._bid_by_player_id = bid_by_player
-    round._tricks = tricks
+    for player_id, bid in bid_by_player.items():
+        round.add_bid(player_id, bid)
+    for trick in tricks:
+        round.current_trick = trick
+        round.store_current_trick()
     actual = round.get_points_by_player_id()
 
     assert actual == expected
@@ -481,6 +515,7 @@ def test_game_state_store_current_round(rounds, expected):
 
     assert game_state.current_round is None
     assert game_state._rounds == expected
+    assert game_state.rounds == tuple(expected)
 
 
 # test game_state_get_points_by_player_id
@@ -514,12 +549,14 @@ trick_c = Trick(
         (2, Card(Suit.CLUBS, Value.TEN))
     )
 )
-round_a._tricks = [trick_a]
-round_a._bid_by_player_id = {0: 1, 1: 1, 2: 1}
-round_b._tricks = [trick_b, trick_a]
-round_b._bid_by_player_id = {0: 1, 1: 1, 2: 1}
+for _round, tricks in ((round_a, [trick_a]), (round_b, [trick_b, trick_a])):
+    for player_id in range(3):
+        _round.add_bid(player_id, 1)
+    for trick in tricks:
+        _round.current_trick = trick
+        _round.store_current_trick()
 test_values = [
-    ([round_a, round_b], {0: -2, 1: -2, 2: 8})
+    ([round_a, round_b], {0: 3, 1: -2, 2: 8})
 ]
 
 
@@ -529,8 +566,231 @@ test_values = [
 def test_game_state_get_points_by_player_id(rounds, expected):
 
     game_state = GameState()
-    game_state._rounds = rounds
+    for round in rounds:
+        game_state.current_round = round
+        game_state.store_current_round()
 
     actual = game_state.get_points_by_player_id()
+    assert GameState(tuple(rounds)).get_points_by_player_id() == actual
+
+    assert actual == expected
+
+
+# test trick_zobrist_hash
+card_a = Card(Suit.SPADES, Value.TWO)
+card_b = Card(Suit.HEARTS, Value.KING)
+test_values = [
+    (((0, card_a), (1, card_b)), ((0, card_a), (1, card_b)), True),
+    (((0, card_a), (1, card_b)), ((1, card_b), (0, card_a)), False),
+    (((0, card_a), (1, card_b)), ((1, card_a), (0, card_b)), False),
+    (((0, card_a),), ((0, card_a), (1, card_b)), False),
+    ((), (), True)
+]
+
+
+@pytest.mark.parametrize(
+    'player_ids_cards_1, player_ids_cards_2, expected', test_values
+)
+def test_trick_zobrist_hash(player_ids_cards_1, player_ids_cards_2, expected):
+
+    trick = Trick(0)
+    for player_id, card in player_ids_cards_1:
+        trick.add_player_card(player_id, card)
+
+    actual = trick.zobrist_hash == Trick(0, player_ids_cards_2).zobrist_hash
+    assert actual == expected
+
+
+# test round_zobrist_hash
+def build_round(bids, tricks, current_trick=None, round_id=0):
+
+    _round = Round(round_id, Card(Suit.HEARTS, Value.TWO))
+    for player_id, bid in bids:
+        _round.add_bid(player_id, bid)
+    for trick in tricks:
+        _round.current_trick = Trick(0, trick)
+        _round.store_current_trick()
+    if current_trick is not None:
+        _round.current_trick = Trick(0, current_trick)
+
+    return _round
+
+
+trick_a = (
+    (1, Card(Suit.SPADES, Value.TWO)), (2, Card(Suit.SPADES, Value.ACE))
+)
+trick_b = (
+    (1, Card(Suit.CLUBS, Value.TWO)), (2, Card(Suit.CLUBS, Value.ACE))
+)
+test_values = [
+    (((1, 0), (2, 1)), (), None, ((2, 1), (1, 0)), (), None, True),
+    (((1, 0), (2, 1)), (), None, ((1, 1), (2, 0)), (), None, False),
+    (((1, 0),), (), None, ((1, 0), (2, 1)), (), None, False),
+    ((), (trick_a,), None, (), (), trick_a, False),
+    ((), (trick_a, trick_b), None, (), (trick_b, trick_a), None, True),
+    ((), (trick_a,), None, (), (trick_b,), None, False),
+    ((), (trick_a,), trick_b, (), (trick_a,), trick_b, True)
+]
+
 
+@pytest.mark.parametrize(
+    'bids_1, tricks_1, current_1, bids_2, tricks_2, current_2, expected',
+    test_values
+)
+def test_round_zobrist_hash(
+    bids_1, tricks_1, current_1, bids_2, tricks_2, current_2, expected
+):
+
+    round_1 = build_round(bids_1, tricks_1, current_1)
+    round_2 = build_round(bids_2, tricks_2, current_2)
+
+    actual = round_1.zobrist_hash == round_2.zobrist_hash
     assert actual == expected
+
+
+# test game_state_zobrist_hash
+def test_game_state_zobrist_hash():
+
+    round_a = build_round(((1, 0), (2, 1)), (trick_a,), round_id=0)
+    round_b = build_round(((1, 0), (2, 1)), (trick_a,), round_id=1)
+    game_state = GameState()
+    hashes = [game_state.zobrist_hash]
+
+    game_state.current_round = round_a
+    hashes.append(game_state.zobrist_hash)
+    game_state.store_current_round()
+    assert game_state.zobrist_hash == hashes[-1]
+
+    game_state.current_round = round_b
+    hashes.append(game_state.zobrist_hash)
+    game_state.store_current_round()
+
+    assert len(set(hashes)) == len(hashes)
+    assert GameState((round_a, round_b)).zobrist_hash == hashes[-1]
+
+
+# test game_state_zobrist_hash_identical_rounds
+def test_game_state_zobrist_hash_identical_rounds():
+
+    rounds = [
+        build_round(((1, 0), (2, 1)), (trick_a,), round_id=0)
+        for _ in range(2)
+    ]
+    game_state = GameState(rounds)
+
+    assert game_state.zobrist_hash != 0
+    assert game_state.zobrist_hash != GameState(rounds[:1]).zobrist_hash
+
+
+# test round_apply_undo_move
+def round_snapshot(_round):
+
+    current_trick = _round.current_trick
+    return (
+        dict(_round.bid_by_player_id), _round.total_bid,
+        dict(_round.get_wins_by_player_id()),
+        [trick.player_ids_cards for trick in _round.tricks],
+        None if current_trick is None else current_trick.player_ids_cards,
+        _round.zobrist_hash
+    )
+
+
+card_a = Card(Suit.SPADES, Value.TEN)
+card_b = Card(Suit.HEARTS, Value.JACK)
+card_c = Card(Suit.SPADES, Value.ACE)
+card_d = Card(Suit.CLUBS, Value.TWO)
+test_values = [
+    (
+        [(1, 1), (2, 0), (1, card_a), (2, card_b), (1, card_c), (2, card_d)],
+        [((1, card_a), (2, card_b)), ((1, card_c), (2, card_d))], None,
+        {2: 1, 1: 1}
+    ),
+    (
+        [(0, 0), (1, 1), (2, 1), (0, card_a), (1, card_c), (2, card_d),
+         (0, card_b)],
+        [((0, card_a), (1, card_c), (2, card_d))], ((0, card_b),),
+        {1: 1}
+    ),
+    (
+        [(1, 0), (2, 0), (1, card_c), (2, card_a), (1, card_b)],
+        [((1, card_c), (2, card_a))], ((1, card_b),),
+        {1: 1}
+    )
+]
+
+
+@pytest.mark.parametrize('moves, tricks, current_trick, wins', test_values)
+def test_round_apply_undo_move(moves, tricks, current_trick, wins):
+
+    _round = Round(0, Card(Suit.HEARTS, Value.TWO))
+    snapshots = [round_snapshot(_round)]
+    for player_id, move in moves:
+        _round.apply_move(player_id, move)
+        snapshots.append(round_snapshot(_round))
+
+    expected = Round(0, Card(Suit.HEARTS, Value.TWO))
+    for player_id, move in moves:
+        if isinstance(move, int):
+            expected.add_bid(player_id, move)
+    for trick_id, trick in enumerate(tricks):
+        expected.current_trick = Trick(trick_id, trick)
+        expected.store_current_trick()
+    if current_trick is not None:
+        expected.current_trick = Trick(len(tricks), current_trick)
+
+    assert _round == expected
+    assert _round.zobrist_hash == expected.zobrist_hash
+    assert _round.get_wins_by_player_id() == wins
+
+    for snapshot in reversed(snapshots[:-1]):
+        _round.undo_move()
+        assert round_snapshot(_round) == snapshot
+
+    with pytest.raises(ValueError):
+        _round.undo_move()
+
+
+# test round_apply_move_errors
+def test_round_apply_move_errors():
+
+    _round = Round(0, Card(Suit.HEARTS, Value.TWO))
+    _round.apply_move(1, 0)
+
+    with pytest.raises(ValueError):
+        _round.apply_move(1, 1)
+    with pytest.raises(ValueError):
+        _round.apply_move(2, None)
+    assert _round.bid_by_player_id == {1: 0}
+
+    with pytest.raises(ValueError):
+        _round.apply_move(None, 1)
+    with pytest.raises(ValueError):
+        _round.apply_move(None, Card(Suit.SPADES, Value.TWO))
+    # the player 2 hasn't bid, and can't bid after the first card
+    with pytest.raises(ValueError):
+        _round.apply_move(2, Card(Suit.SPADES, Value.TWO))
+    _round.apply_move(1, Card(Suit.SPADES, Value.TWO))
+    with pytest.raises(ValueError):
+        _round.apply_move(2, 0)
+    assert _round.bid_by_player_id == {1: 0}
+
+    # the rejected moves aren't recorded
+    _round.undo_move()
+    _round.undo_move()
+    assert _round.bid_by_player_id == {}
+    with pytest.raises(ValueError):
+        _round.undo_move()
+
+
+# test slots
+test_values = [
+    GameState(),
+    Round(0, Card(Suit.HEARTS, Value.TWO)),
+    Trick(0)
+]
+
+
+@pytest.mark.parametrize('instance', test_values)
+def test_slots(instance):
+
+    assert not hasattr(instance, '__dict__')
@@ -0,0 +1,273 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import random
+
+from pydecklib.card import Card, Suit, Value
+import pytest
+
+from src.pyohhell.cards import (
+    FULL_MASK,
+    SUIT_MASKS,
+    card_to_index,
+    cards_to_mask,
+    count_cards,
+    suit_index
+)
+from src.pyohhell.game_engine import GameEngine
+from src.pyohhell.game_state import (
+    DefaultPointAttributionStrategy,
+    GameState,
+    Round,
+    Trick
+)
+from src.pyohhell.ismcts import (
+    ISMCTSBidSelectionStrategy,
+    ISMCTSCardSelectionStrategy,
+    deal,
+    observe,
+    observe_bidding,
+    rollout,
+    search
+)
+from src.pyohhell.player import (
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+
+
+def build_game_state(bids, tricks, current_trick, trump_card):
+
+    game_round = Round(0, trump_card)
+    for player_id, bid in bids:
+        game_round.add_bid(player_id, bid)
+    for trick_id, trick in enumerate(tricks):
+        game_round.current_trick = Trick(trick_id, trick)
+        game_round.store_current_trick()
+    game_round.current_trick = Trick(len(tricks), current_trick)
+
+    game_state = GameState()
+    game_state.current_round = game_round
+
+    return game_state
+
+
+# the player 3 didn't follow spades in the first trick, and the player 2
+# plays second in the current trick
+hand_a = [Card(Suit.HEARTS, Value.ACE), Card(Suit.CLUBS, Value.TWO)]
+game_state_a = build_game_state(
+    [(1, 1), (2, 0), (3, 2)],
+    [((1, Card(Suit.SPADES, Value.TWO)), (2, Card(Suit.SPADES, Value.KING)),
+      (3, Card(Suit.DIAMONDS, Value.FIVE)))],
+    ((1, Card(Suit.CLUBS, Value.TEN)),),
+    Card(Suit.DIAMONDS, Value.NINE)
+)
+
+
+# test observe
+def test_observe():
+
+    observation = observe(hand_a, game_state_a)
+
+    assert observation.seat == 1
+    assert observation.leader == 0
+    assert observation.hand == cards_to_mask(hand_a)
+    assert observation.n_cards == (1, 2, 2)
+    assert observation.voids == (0, 0, 1 << suit_index(Suit.SPADES))
+    assert observation.trick == (card_to_index(Card(Suit.CLUBS, Value.TEN)),)
+    assert observation.wins == (0, 0, 1)
+    assert observation.trump_suit == suit_index(Suit.DIAMONDS)
+    assert count_cards(observation.unseen) == 52 - 2 - 4 - 1
+    assert observation.rewards[1][0] == 1. and observation.rewards[1][1] < 1.
+
+
+# test observe_player_0
+def test_observe_player_0():
+
+    # the player 0 won the first trick
+    game_state = build_game_state(
+        [(0, 1), (1, 0)],
+        [((0, Card(Suit.SPADES, Value.ACE)),
+          (1, Card(Suit.SPADES, Value.TWO)))],
+        (), Card(Suit.DIAMONDS, Value.NINE)
+    )
+    observation = observe([Card(Suit.HEARTS, Value.ACE)], game_state)
+
+    assert observation.seat == 0
+    assert observation.wins == (1, 0)
+
+
+# test observe_errors
+def test_observe_errors():
+
+    with pytest.raises(ValueError):
+        observe(hand_a, GameState())
+
+
+# test observe_bidding
+def test_observe_bidding():
+
+    game_state = build_game_state(
+        [(0, 1)], [], (), Card(Suit.DIAMONDS, Value.NINE)
+    )
+    observation = observe_bidding(hand_a, game_state, 3)
+
+    assert observation.seat == 1
+    assert observation.leader == 0
+    assert observation.n_cards == (2, 2, 2)
+    assert observation.wins == (0, 0, 0)
+    assert count_cards(observation.unseen) == 52 - 2 - 1
+
+    with pytest.raises(ValueError):
+        observe_bidding(hand_a, game_state, 1)
+    with pytest.raises(ValueError):
+        observe_bidding(hand_a, GameState(), 3)
+
+
+# test deal
+@pytest.mark.parametrize('seed', range(20))
+def test_deal(seed):
+
+    observation = observe(hand_a, game_state_a)
+    hands = deal(observation, random.Random(seed))
+
+    assert hands[observation.seat] == observation.hand
+    assert [count_cards(hand) for hand in hands] == \
+        list(observation.n_cards)
+    assert not hands[2] & SUIT_MASKS[suit_index(Suit.SPADES)]
+    dealt = 0
+    for seat, hand in enumerate(hands):
+        assert not dealt & hand
+        dealt |= hand
+        if seat != observation.seat:
+            assert not hand & ~observation.unseen & FULL_MASK
+
+
+# test search
+def test_search():
+
+    observation = observe(hand_a, game_state_a)
+    stats = search(observation, 50, rng=random.Random(0))
+
+    # the player has to follow clubs
+    assert list(stats) == [card_to_index(Card(Suit.CLUBS, Value.TWO))]
+    assert stats == search(observation, 50, rng=random.Random(0))
+
+    with pytest.raises(ValueError):
+        search(observation, None, None)
+
+
+# test rollout
+test_values = [
+    # the ace of trumps always wins, a two never does when leading
+    ([Card(Suit.HEARTS, Value.ACE)], [0, 100]),
+    ([Card(Suit.HEARTS, Value.KING), Card(Suit.HEARTS, Value.ACE)],
+     [0, 0, 100])
+]
+
+
+@pytest.mark.parametrize('hand, expected', test_values)
+def test_rollout(hand, expected):
+
+    game_state = build_game_state([], [], (), Card(Suit.HEARTS, Value.TWO))
+    observation = observe_bidding(hand, game_state, 2)
+
+    assert rollout(observation, 100, rng=random.Random(0)) == expected
+
+    with pytest.raises(ValueError):
+        rollout(observation, None, None)
+
+
+# test select_card
+test_values = [
+    (
+        # bid 0 and the ten led: the ace would win the trick
+        [Card(Suit.SPADES, Value.ACE), Card(Suit.SPADES, Value.TWO)],
+        ((1, Card(Suit.SPADES, Value.TEN)),), 0,
+        Card(Suit.SPADES, Value.TWO)
+    ),
+    (
+        # bid 1 and the ten led: the ace wins the trick
+        [Card(Suit.SPADES, Value.ACE), Card(Suit.SPADES, Value.TWO)],
+        ((1, Card(Suit.SPADES, Value.TEN)),), 1,
+        Card(Suit.SPADES, Value.ACE)
+    ),
+    (
+        [Card(Suit.SPADES, Value.TWO)],
+        ((1, Card(Suit.SPADES, Value.TEN)),), 1,
+        Card(Suit.SPADES, Value.TWO)
+    )
+]
+
+
+@pytest.mark.parametrize('hand, current_trick, bid, expected', test_values)
+def test_select_card(hand, current_trick, bid, expected):
+
+    game_state = build_game_state(
+        [(1, 1), (2, bid)], [], current_trick, Card(Suit.HEARTS, Value.TWO)
+    )
+    strategy = ISMCTSCardSelectionStrategy(300, seed=1)
+
+    actual = strategy.select_card(hand, hand, game_state)
+
+    assert actual == expected and actual.suit == expected.suit
+
+
+# test select_bid
+test_values = [
+    ([Card(Suit.HEARTS, Value.ACE)], [0, 1], 1),
+    ([Card(Suit.SPADES, Value.TWO)], [0, 1], 0),
+    # the last bidder can't bid 1
+    ([Card(Suit.HEARTS, Value.ACE)], [0], 0)
+]
+
+
+@pytest.mark.parametrize('hand, authorised_bids, expected', test_values)
+def test_select_bid(hand, authorised_bids, expected):
+
+    game_state = build_game_state([], [], (), Card(Suit.HEARTS, Value.TWO))
+    strategy = ISMCTSBidSelectionStrategy(300, n_players=4, seed=1)
+
+    assert strategy.select_bid(hand, authorised_bids, game_state) == \
+        expected
+
+
+# test ismcts_game
+def ismcts_game_engine():
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    game_engine.subscribe_player(Player(
+        1, ISMCTSCardSelectionStrategy(10),
+        ISMCTSBidSelectionStrategy(10, n_players=4)
+    ))
+    for player_id in (2, 3, 4):
+        game_engine.subscribe_player(Player(
+            player_id, RandomCardSelectionStrategy(),
+            RandomBidSelectionStrategy()
+        ))
+
+    return game_engine
+
+
+def test_ismcts_game():
+
+    actual = ismcts_game_engine().play_game(1)
+
+    assert actual == ismcts_game_engine().play_game(1)
+    assert set(actual) == {1, 2, 3, 4}
+
+
+# test ismcts_errors
+def test_ismcts_errors():
+
+    with pytest.raises(ValueError):
+        ISMCTSCardSelectionStrategy(None, None)
+    with pytest.raises(ValueError):
+        ISMCTSBidSelectionStrategy(None, None)
+    with pytest.raises(ValueError):
+        ISMCTSBidSelectionStrategy().select_bid(
+            hand_a, [0, 1, 2], build_game_state(
+                [], [], (), Card(Suit.HEARTS, Value.TWO)
+            )
+        )
@@ -0,0 +1,143 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from itertools import permutations
+import random
+
+import pytest
+
+from src.pyohhell.isomorphism import (
+    canonical_permutation,
+    canonicalise,
+    invert_permutation,
+    permute_index,
+    permute_mask
+)
+
+
+def random_position(rng):
+
+    """
+    Random hands and current trick of a round, as bitmasks and indices.
+    """
+
+    n_players = rng.randint(2, 5)
+    n_cards = rng.randint(1, 51 // n_players)
+    deck = list(range(52))
+    rng.shuffle(deck)
+    hands = [0] * n_players
+    for seat in range(n_players):
+        for index in deck[seat * n_cards:(seat + 1) * n_cards]:
+            hands[seat] |= 1 << index
+    trick = list()
+    for seat in range(rng.randrange(n_players)):
+        index = hands[seat].bit_length() - 1
+        hands[seat] ^= 1 << index
+        trick.append(index)
+
+    return hands, trick, rng.randrange(4)
+
+
+# test permute_mask
+test_values = [
+    (0, (1, 0, 2, 3), 0),
+    (1, (2, 1, 0, 3), 1 << 26),
+    ((1 << 52) - 1, (3, 2, 1, 0), (1 << 52) - 1),
+    (0b101 | 1 << 51, (1, 2, 3, 0), 0b101 << 13 | 1 << 12)
+]
+
+
+@pytest.mark.parametrize('mask, permutation, expected', test_values)
+def test_permute_mask(mask, permutation, expected):
+
+    actual = permute_mask(mask, permutation)
+    inverse = invert_permutation(permutation)
+
+    assert actual == expected
+    assert permute_mask(actual, inverse) == mask
+
+
+# test permute_index
+test_values = [
+    (0, (1, 0, 2, 3), 13),
+    (25, (1, 2, 3, 0), 38),
+    (51, (1, 2, 3, 0), 12)
+]
+
+
+@pytest.mark.parametrize('index, permutation, expected', test_values)
+def test_permute_index(index, permutation, expected):
+
+    actual = permute_index(index, permutation)
+
+    assert actual == expected
+    assert permute_mask(1 << index, permutation) == 1 << actual
+
+
+# test canonical_permutation
+test_values = [
+    # the fixed suits first, then by decreasing pattern
+    ([1 << 13 | 1 << 40], (2,), (3, 2, 0, 1)),
+    ([0b11, 0b100 << 26], (), (0, 2, 1, 3)),
+    ([0], (3, 1), (2, 1, 3, 0))
+]
+
+
+@pytest.mark.parametrize('masks, fixed_suits, expected', test_values)
+def test_canonical_permutation(masks, fixed_suits, expected):
+
+    assert canonical_permutation(masks, fixed_suits) == expected
+
+
+# test canonical_permutation_errors
+test_values = [(0, 0), (4,), (-1,)]
+
+
+@pytest.mark.parametrize('fixed_suits', test_values)
+def test_canonical_permutation_errors(fixed_suits):
+
+    with pytest.raises(ValueError):
+        canonical_permutation([0], fixed_suits)
+
+
+# test canonicalise
+@pytest.mark.parametrize('seed', range(20))
+def test_canonicalise(seed):
+
+    rng = random.Random(seed)
+    hands, trick, trump_suit = random_position(rng)
+    played = rng.getrandbits(52) & ~sum(hands)
+
+    expected = canonicalise(hands, trump_suit, trick, played)
+
+    # the trump suit is suit 0, the suit led suit 1
+    permutation = expected.permutation
+    assert permutation[trump_suit] == 0
+    if trick and trick[0] // 13 != trump_suit:
+        assert permutation[trick[0] // 13] == 1
+    assert expected.hands == tuple(
+        permute_mask(hand, permutation) for hand in hands
+    )
+
+    # every renaming of the suits gives the same canonical position
+    for renaming in permutations(range(4)):
+        actual = canonicalise(
+            [permute_mask(hand, renaming) for hand in hands],
+            renaming[trump_suit],
+            [permute_index(index, renaming) for index in trick],
+            permute_mask(played, renaming)
+        )
+        assert actual[:3] == expected[:3]
+
+
+# test canonicalise_distinct
+def test_canonicalise_distinct():
+
+    # the same cards, but the ace of hearts in the other hand
+    hands_1 = [1 << 38, 1 << 12]
+    hands_2 = [1 << 12, 1 << 38]
+
+    assert canonicalise(hands_1, 0) != canonicalise(hands_2, 0)
+    # the ace of hearts renamed the ace of diamonds
+    assert canonicalise(hands_1, 0).hands == \
+        canonicalise([1 << 25, 1 << 12], 0).hands
@@ -0,0 +1,239 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import time
+
+from pydecklib.card import Card, Suit, Value
+import pytest
+
+from src.pyohhell.cards import card_to_index
+from src.pyohhell.game_engine import GameEngine
+from src.pyohhell.game_state import DefaultPointAttributionStrategy
+from src.pyohhell.ismcts import observe, observe_bidding, rollout, search
+from src.pyohhell.parallel_ismcts import (
+    ParallelISMCTSBidSelectionStrategy,
+    ParallelISMCTSCardSelectionStrategy,
+    RolloutPool,
+    default_pool,
+    merge_rollout_counts,
+    merge_search_stats
+)
+from src.pyohhell.player import (
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+from src.pyohhell.rng import derive_seed
+from tests.test_ismcts import build_game_state, game_state_a, hand_a
+
+
+@pytest.fixture(scope='module')
+def pool():
+
+    with RolloutPool(workers=2) as rollout_pool:
+        yield rollout_pool
+
+
+# test merge_search_stats
+test_values = [
+    ([], {}),
+    ([{3: (2, 1.)}], {3: (2, 1.)}),
+    ([{3: (2, 1.)}, {3: (1, .5), 7: (1, 0.)}], {3: (3, 1.5), 7: (1, 0.)})
+]
+
+
+@pytest.mark.parametrize('stats, expected', test_values)
+def test_merge_search_stats(stats, expected):
+
+    assert merge_search_stats(stats) == expected
+
+
+# test merge_rollout_counts
+test_values = [
+    ([], []),
+    ([[1, 2]], [1, 2]),
+    ([[1, 2], [0, 1, 3]], [1, 3, 3])
+]
+
+
+@pytest.mark.parametrize('counts, expected', test_values)
+def test_merge_rollout_counts(counts, expected):
+
+    assert merge_rollout_counts(counts) == expected
+
+
+# test rollout_pool
+def test_rollout_pool(pool):
+
+    assert pool.workers == 2
+
+    # the workers are kept from one decision to the next
+    pids = pool.run(_pid, [()] * 4) + pool.run(_pid, [()] * 4)
+    assert len(set(pids)) <= 2 and os.getpid() not in pids
+
+    # the results not back by the deadline are left out, on a pool of its
+    # own not to keep a worker of the shared pool busy
+    with RolloutPool(workers=2) as other_pool:
+        assert other_pool.run(
+            time.sleep, [(0.5,)], time.monotonic() + 0.01
+        ) == []
+
+
+def _pid():
+
+    time.sleep(0.01)
+
+    return os.getpid()
+
+
+# test rollout_pool_errors
+def test_rollout_pool_errors():
+
+    with pytest.raises(ValueError):
+        RolloutPool(0)
+
+
+# test parallel_search
+def test_parallel_search(pool):
+
+    observation = observe(hand_a, game_state_a)
+    strategy = ParallelISMCTSCardSelectionStrategy(
+        101, None, seed=5, pool=pool
+    )
+
+    # the searches of the tasks are independent, each with its own seed
+    seed = random.Random(5).getrandbits(64)
+    expected = merge_search_stats([
+        search(observation, n_iterations, rng=random.Random(
+            derive_seed(seed, task)
+        ))
+        for task, n_iterations in enumerate((51, 50))
+    ])
+
+    assert strategy._search(observation) == expected
+
+
+# test parallel_rollout
+def test_parallel_rollout(pool):
+
+    game_state = build_game_state([], [], (), Card(Suit.HEARTS, Value.TWO))
+    observation = observe_bidding(hand_a, game_state, 3)
+    strategy = ParallelISMCTSBidSelectionStrategy(
+        100, None, seed=5, pool=pool
+    )
+
+    seed = random.Random(5).getrandbits(64)
+    expected = merge_rollout_counts([
+        rollout(observation, 50, rng=random.Random(derive_seed(seed, task)))
+        for task in range(2)
+    ])
+
+    assert strategy._rollout(observation) == expected
+    assert sum(expected) == 100
+
+
+# test parallel_time_limit
+def test_parallel_time_limit(pool):
+
+    observation = observe(hand_a, game_state_a)
+    strategy = ParallelISMCTSCardSelectionStrategy(
+        None, 0.05, seed=5, pool=pool
+    )
+
+    start = time.perf_counter()
+    stats = strategy._search(observation)
+
+    assert time.perf_counter() - start < 0.5
+    assert list(stats) == [card_to_index(Card(Suit.CLUBS, Value.TWO))]
+
+
+# test parallel_deadline_missed
+def test_parallel_deadline_missed(pool, caplog):
+
+    card_strategy = ParallelISMCTSCardSelectionStrategy(
+        None, 1e-6, seed=5, pool=pool
+    )
+    bid_strategy = ParallelISMCTSBidSelectionStrategy(
+        None, 1e-6, seed=5, pool=pool
+    )
+    game_state = build_game_state([], [], (), Card(Suit.HEARTS, Value.TWO))
+
+    # the decisions fall back to the first move, with a warning
+    assert card_strategy._search(observe(hand_a, game_state_a)) == {}
+    assert not any(
+        bid_strategy._rollout(observe_bidding(hand_a, game_state, 3))
+    )
+    assert len(caplog.records) == 2
+    assert all(record.levelname == 'WARNING' for record in caplog.records)
+
+
+# test default_pool
+def test_default_pool():
+
+    card_strategy = ParallelISMCTSCardSelectionStrategy()
+    bid_strategy = ParallelISMCTSBidSelectionStrategy(n_players=3)
+
+    assert card_strategy.pool is bid_strategy.pool is default_pool()
+
+
+# test parallel_select
+test_values = [
+    # bid 1 and the ten led: the ace wins the trick
+    ([Card(Suit.SPADES, Value.ACE), Card(Suit.SPADES, Value.TWO)], 1,
+     Card(Suit.SPADES, Value.ACE)),
+    # bid 0: the two loses it
+    ([Card(Suit.SPADES, Value.ACE), Card(Suit.SPADES, Value.TWO)], 0,
+     Card(Suit.SPADES, Value.TWO))
+]
+
+
+@pytest.mark.parametrize('hand, bid, expected', test_values)
+def test_parallel_select(pool, hand, bid, expected):
+
+    game_state = build_game_state(
+        [(1, 1), (2, bid)], [], ((1, Card(Suit.SPADES, Value.TEN)),),
+        Card(Suit.HEARTS, Value.TWO)
+    )
+    card_strategy = ParallelISMCTSCardSelectionStrategy(
+        300, None, seed=1, pool=pool
+    )
+    bid_strategy = ParallelISMCTSBidSelectionStrategy(
+        200, None, n_players=4, seed=1, pool=pool
+    )
+
+    actual = card_strategy.select_card(hand, hand, game_state)
+
+    assert actual == expected and actual.suit == expected.suit
+    assert bid_strategy.select_bid(
+        [Card(Suit.HEARTS, Value.ACE)], [0, 1],
+        build_game_state([], [], (), Card(Suit.HEARTS, Value.TWO))
+    ) == 1
+
+
+# test parallel_game
+def parallel_game_engine(pool):
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    game_engine.subscribe_player(Player(
+        1, ParallelISMCTSCardSelectionStrategy(20, None, pool=pool),
+        ParallelISMCTSBidSelectionStrategy(20, None, n_players=3, pool=pool)
+    ))
+    for player_id in (2, 3):
+        game_engine.subscribe_player(Player(
+            player_id, RandomCardSelectionStrategy(),
+            RandomBidSelectionStrategy()
+        ))
+
+    return game_engine
+
+
+def test_parallel_game(pool):
+
+    actual = parallel_game_engine(pool).play_game(1)
+
+    assert actual == parallel_game_engine(pool).play_game(1)
+    with RolloutPool(workers=2) as other_pool:
+        assert actual == parallel_game_engine(other_pool).play_game(1)
+    assert set(actual) == {1, 2, 3}
@@ -45,6 +45,11 @@ def test_player_hand(hand, expected):
     actual = p.hand
     assert actual == expected
 
+    # the hand returned is a copy
+    actual.append(Card(Suit.HEARTS, Value.ACE))
+    assert p.hand == expected
+    assert p.authorised_cards(Suit.HEARTS) == expected
+
 
 # test player_add_to_hand
 test_values = [
@@ -66,6 +71,39 @@ def test_player_add_to_hand(initial_hand, card, expected):
     assert actual == expected
 
 
+# test player_authorised_cards
+test_values = [
+    (None, [Card(Suit.SPADES, Value.TWO), Card(Suit.CLUBS, Value.TWO),
+            Card(Suit.SPADES, Value.ACE)]),
+    (Suit.SPADES, [Card(Suit.SPADES, Value.TWO),
+                   Card(Suit.SPADES, Value.ACE)]),
+    (Suit.HEARTS, [Card(Suit.SPADES, Value.TWO), Card(Suit.CLUBS, Value.TWO),
+                   Card(Suit.SPADES, Value.ACE)])
+]
+
+
+@pytest.mark.parametrize('trick_suit, expected', test_values)
+def test_player_authorised_cards(trick_suit, expected):
+
+    p = Player(1, initial_hand=(
+        Card(Suit.SPADES, Value.TWO), Card(Suit.CLUBS, Value.TWO),
+        Card(Suit.SPADES, Value.ACE)
+    ))
+
+    assert p.authorised_cards(trick_suit) == expected
+
+
+# test player_remove_from_hand_errors
+def test_player_remove_from_hand_errors():
+
+    p = Player(1, initial_hand=(Card(Suit.SPADES, Value.TWO),))
+
+    with pytest.raises(ValueError):
+        p.remove_from_hand(Card(Suit.CLUBS, Value.TWO))
+    with pytest.raises(ValueError):
+        p.add_to_hand(Card(Suit.SPADES, Value.TWO))
+
+
 # test player_update_game_state
 test_values = [
     (GameState(), GameState()),
@@ -147,6 +185,33 @@ def test_play_card(initial_hand, authorised_cards, expected):
         assert actual == expected
 
 
+# test player_play_card_hand
+test_values = [
+    (
+        (Card(Suit.SPADES, Value.TWO), Card(Suit.SPADES, Value.THREE)),
+        [Card(Suit.SPADES, Value.THREE)],
+        [(Suit.SPADES, Value.TWO)]
+    ),
+    (
+        (Card(Suit.CLUBS, Value.FIVE), Card(Suit.DIAMONDS, Value.FIVE)),
+        [Card(Suit.DIAMONDS, Value.FIVE)],
+        [(Suit.CLUBS, Value.FIVE)]
+    )
+]
+
+
+@pytest.mark.parametrize(
+    'initial_hand, authorised_cards, expected', test_values
+)
+def test_play_card_hand(initial_hand, authorised_cards, expected):
+
+    p = Player(1, initial_hand=initial_hand)
+    p.play_card(authorised_cards)
+    actual = [(card.suit, card.value) for card in p.hand]
+
+    assert actual == expected
+
+
 # test player_make_bid
 test_values = [
     ([], ValueError()),
@@ -207,7 +272,6 @@ def test_player__str__(player, expected):
 
 # test random_card_selection_strategy_select_card
 
-random_card_selection_strategy = RandomCardSelectionStrategy(seed=42)
 test_values = [
     (
         [Card(Suit.SPADES, Value.TWO)], [],
@@ -237,6 +301,7 @@ def test_random_card_selection_strategy_select_card(
     hand, authorised_cards, game_state, expected
 ):
 
+    random_card_selection_strategy = RandomCardSelectionStrategy(seed=42)
     actual = random_card_selection_strategy.select_card(
         hand, authorised_cards, game_state
     )
@@ -288,7 +353,6 @@ def test_first_card_selection_strategy_select_card(
 
 # test random_bid_selection_strategy_select_bid
 
-random_bid_selection_strategy = RandomBidSelectionStrategy(seed=42)
 test_values = [
     ([Card(Suit.SPADES, Value.TWO)], [], GameState(), None),
     ([Card(Suit.SPADES, Value.TWO)], [1], GameState(), 1),
@@ -310,6 +374,7 @@ def test_random_bid_selection_strategy_select_card(
     hand, authorised_bids, game_state, expected
 ):
 
+    random_bid_selection_strategy = RandomBidSelectionStrategy(seed=42)
     actual = random_bid_selection_strategy.select_bid(
         hand, authorised_bids, game_state
     )
@@ -346,4 +411,23 @@ def test_first_bid_selection_strategy_select_card(
     assert actual == expected
 
 
+# test player_reseed
+test_values = [
+    (1, list(range(10))),
+    (2, list(range(3)))
+]
+
+
+@pytest.mark.parametrize('seed, authorised_bids', test_values)
+def test_player_reseed(seed, authorised_bids):
 
+    player = Player(
+        1, RandomCardSelectionStrategy(), RandomBidSelectionStrategy()
+    )
+
+    player.reseed(seed)
+    expected = [player.make_bid(authorised_bids) for _ in range(10)]
+    player.reseed(seed)
+    actual = [player.make_bid(authorised_bids) for _ in range(10)]
+
+    assert actual == expected
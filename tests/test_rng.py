@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pyohhell.rng import (derive_seed, derive_seeds, player_seed,
+                              round_seed, stream)
+
+
+# test derive_seed
+test_values = [
+    (1, ()),
+    (1, (0,)),
+    (42, (0, 3)),
+    (2 ** 64 - 1, (1, 2 ** 64 - 1))
+]
+
+
+@pytest.mark.parametrize('seed, keys', test_values)
+def test_derive_seed(seed, keys):
+
+    actual = derive_seed(seed, *keys)
+
+    assert actual == derive_seed(seed, *keys)
+    assert 0 <= actual < 2 ** 64
+
+
+# test derive_seed_distinct
+test_values = [
+    [(1,), (2,), (1, 0), (1, 1), (2, 0)],
+    [(0, round_idx) for round_idx in range(25)] +
+    [(1, player_id) for player_id in range(25)]
+]
+
+
+@pytest.mark.parametrize('keys', test_values)
+def test_derive_seed_distinct(keys):
+
+    seeds = [derive_seed(1, *k) for k in keys]
+
+    assert len(set(seeds)) == len(seeds)
+
+
+# test derive_seeds
+test_values = [
+    (1, 0, ()),
+    (1, 3, ()),
+    (42, 52, (5, 3)),
+    (2 ** 64 - 1, 2, (1, 2 ** 64 - 1))
+]
+
+
+@pytest.mark.parametrize('seed, count, keys', test_values)
+def test_derive_seeds(seed, count, keys):
+
+    expected = [derive_seed(seed, *keys, i) for i in range(count)]
+
+    assert derive_seeds(seed, count, *keys) == expected
+
+
+# test round_seed
+test_values = [
+    (None, 0, None),
+    (1, 0, derive_seed(1, 0, 0)),
+    (0, 3, derive_seed(0, 0, 3))
+]
+
+
+@pytest.mark.parametrize('seed, round_idx, expected', test_values)
+def test_round_seed(seed, round_idx, expected):
+
+    assert round_seed(seed, round_idx) == expected
+
+
+# test player_seed
+test_values = [
+    (None, 1, None),
+    (1, 1, derive_seed(1, 1, 1)),
+    (1, 0, derive_seed(1, 1, 0))
+]
+
+
+@pytest.mark.parametrize('seed, player_id, expected', test_values)
+def test_player_seed(seed, player_id, expected):
+
+    assert player_seed(seed, player_id) == expected
+
+
+# test stream
+test_values = [
+    (1, ()),
+    (1, (0, 2)),
+    (7, (1, 3))
+]
+
+
+@pytest.mark.parametrize('seed, keys', test_values)
+def test_stream(seed, keys):
+
+    actual = [stream(seed, *keys).random() for _ in range(2)]
+
+    assert actual[0] == actual[1]
+    assert actual[0] != stream(seed + 1, *keys).random()
@@ -0,0 +1,120 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pyohhell.game_engine import GameEngine
+from src.pyohhell.game_state import DefaultPointAttributionStrategy
+from src.pyohhell.player import (
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+from src.pyohhell.simulator import Simulator, ThreadedSimulator
+
+
+def two_players_engine_factory():
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    game_engine.subscribe_player(Player(0))
+    game_engine.subscribe_player(Player(1))
+
+    return game_engine
+
+
+def three_players_engine_factory():
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    for player_id in range(3):
+        game_engine.subscribe_player(Player(player_id))
+
+    return game_engine
+
+
+def random_players_engine_factory():
+
+    game_engine = GameEngine(DefaultPointAttributionStrategy())
+    for player_id in range(4):
+        game_engine.subscribe_player(Player(
+            player_id,
+            RandomCardSelectionStrategy(seed=player_id + 1),
+            RandomBidSelectionStrategy(seed=player_id + 1)
+        ))
+
+    return game_engine
+
+
+# test simulator_init
+test_values = [
+    (0, 1, ValueError()),
+    (1, 0, ValueError())
+]
+
+
+@pytest.mark.parametrize('workers, chunksize, expected', test_values)
+def test_simulator_init(workers, chunksize, expected):
+
+    with pytest.raises(type(expected)):
+        Simulator(two_players_engine_factory, workers, chunksize)
+
+
+# test simulator_play_games
+test_values = [
+    (two_players_engine_factory, [1], [{0: -171, 1: -148}]),
+    (
+        three_players_engine_factory, [1, 1],
+        [{0: -35, 1: -45, 2: -55}, {0: -35, 1: -45, 2: -55}]
+    )
+]
+
+
+@pytest.mark.parametrize('engine_factory, seeds, expected', test_values)
+def test_simulator_play_games(engine_factory, seeds, expected):
+
+    simulator = Simulator(engine_factory, workers=1)
+    actual = simulator.play_games(seeds)
+
+    assert actual == expected
+
+
+# test simulator_simulate
+test_values = [
+    (two_players_engine_factory, [], 1, dict()),
+    (two_players_engine_factory, [1, 1], 1, {0: -342, 1: -296}),
+    (two_players_engine_factory, [1, 1], 2, {0: -342, 1: -296}),
+    (three_players_engine_factory, range(1, 9), 1, None),
+    (three_players_engine_factory, range(1, 9), 3, None)
+]
+
+
+@pytest.mark.parametrize(
+    'engine_factory, seeds, workers, expected', test_values
+)
+def test_simulator_simulate(engine_factory, seeds, workers, expected):
+
+    if expected is None:
+        expected = Simulator(engine_factory, workers=1).simulate(seeds)
+
+    simulator = Simulator(engine_factory, workers=workers, chunksize=2)
+    actual = simulator.simulate(seeds)
+
+    assert actual == expected
+
+
+# test threaded_simulator_play_games
+test_values = [
+    (two_players_engine_factory, range(1, 9), 4),
+    (three_players_engine_factory, range(1, 9), 8),
+    (random_players_engine_factory, range(1, 17), 8)
+]
+
+
+@pytest.mark.parametrize('engine_factory, seeds, workers', test_values)
+def test_threaded_simulator_play_games(engine_factory, seeds, workers):
+
+    expected = Simulator(engine_factory, workers=1).play_games(seeds)
+
+    simulator = ThreadedSimulator(engine_factory, workers=workers)
+    actual = simulator.play_games(seeds)
+
+    assert actual == expected
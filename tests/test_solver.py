@@ -0,0 +1,222 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import random
+
+from pydecklib.card import Card, Suit, Value
+import pytest
+
+from src.pyohhell.cards import (
+    N_CARDS,
+    SUIT_MASKS,
+    card_suit,
+    card_to_index,
+    cards_to_mask,
+    suit_index,
+    trick_winner_position
+)
+from src.pyohhell.isomorphism import permute_index, permute_mask
+from src.pyohhell.solver import _equivalence_classes, solve, solve_seat
+from src.pyohhell.transposition import TranspositionTable
+
+
+def minimax(hands, trump_suit, leader, trick, seat, winner_leads):
+
+    """
+    Tricks taken by a seat, exploring every sequence of cards.
+    """
+
+    hands = list(hands)
+    n_players = len(hands)
+
+    def search(leader, trick):
+
+        if len(trick) == n_players:
+            winner = (
+                leader + trick_winner_position(trick, trump_suit)
+            ) % n_players
+            next_leader = winner if winner_leads else leader
+            won = int(winner == seat)
+            if not hands[next_leader]:
+                return won
+            return won + search(next_leader, [])
+
+        player = (leader + len(trick)) % n_players
+        hand = hands[player]
+        moves = hand
+        if trick:
+            moves = hand & SUIT_MASKS[card_suit(trick[0])] or hand
+
+        values = list()
+        for index in range(N_CARDS):
+            if moves >> index & 1:
+                hands[player] = hand ^ (1 << index)
+                values.append(search(leader, trick + [index]))
+                hands[player] = hand
+
+        return max(values) if player == seat else min(values)
+
+    return search(leader, list(trick))
+
+
+def random_position(rng):
+
+    n_players = rng.choice([2, 3, 4])
+    n_cards = rng.randint(1, 5 if n_players == 2 else 3)
+    deck = list(range(N_CARDS))
+    rng.shuffle(deck)
+    hands = [
+        sum(1 << index for index in deck[seat::n_players][:n_cards])
+        for seat in range(n_players)
+    ]
+    leader = rng.randrange(n_players)
+
+    trick = list()
+    for position in range(rng.randrange(n_players)):
+        player = (leader + position) % n_players
+        moves = hands[player]
+        if trick:
+            moves = moves & SUIT_MASKS[card_suit(trick[0])] or moves
+        index = rng.choice([i for i in range(N_CARDS) if moves >> i & 1])
+        hands[player] ^= 1 << index
+        trick.append(index)
+
+    return hands, rng.randrange(4), leader, trick
+
+
+# test equivalence_classes
+test_values = [
+    (0b1011, 0b1111, [3, 1]),
+    (0b1011, 0b1011, [3]),
+    (0b101 | 1 << 13, 0b111 | 1 << 13, [2, 0, 13]),
+    (0, 0b1, [])
+]
+
+
+@pytest.mark.parametrize('moves, remaining, expected', test_values)
+def test_equivalence_classes(moves, remaining, expected):
+
+    assert _equivalence_classes(moves, remaining) == expected
+
+
+# test solve
+test_values = [
+    (
+        [[Card(Suit.SPADES, Value.ACE)], [Card(Suit.HEARTS, Value.TWO)]],
+        Suit.HEARTS, 0, [], False, [0, 1]
+    ),
+    (
+        [[Card(Suit.SPADES, Value.ACE)], [Card(Suit.HEARTS, Value.TWO)]],
+        Suit.CLUBS, 0, [], False, [1, 0]
+    ),
+    (
+        [
+            [Card(Suit.SPADES, Value.ACE), Card(Suit.SPADES, Value.KING)],
+            [Card(Suit.SPADES, Value.TWO), Card(Suit.HEARTS, Value.TWO)],
+            [Card(Suit.SPADES, Value.THREE), Card(Suit.SPADES, Value.FOUR)]
+        ],
+        Suit.HEARTS, 0, [], False, [1, 1, 0]
+    ),
+    (
+        [
+            [Card(Suit.SPADES, Value.KING)],
+            [Card(Suit.SPADES, Value.TWO), Card(Suit.HEARTS, Value.TWO)],
+            [Card(Suit.SPADES, Value.THREE), Card(Suit.SPADES, Value.FOUR)]
+        ],
+        Suit.HEARTS, 0, [Card(Suit.SPADES, Value.ACE)], False, [1, 1, 0]
+    )
+]
+
+
+@pytest.mark.parametrize(
+    'hands, trump_suit, leader, trick, winner_leads, expected', test_values
+)
+def test_solve(hands, trump_suit, leader, trick, winner_leads, expected):
+
+    actual = solve(
+        [cards_to_mask(hand) for hand in hands], suit_index(trump_suit),
+        leader, [card_to_index(card) for card in trick], winner_leads
+    )
+
+    assert actual == expected
+
+
+# test solve_minimax
+test_values = [(seed, winner_leads) for seed in range(40)
+               for winner_leads in (False, True)]
+
+
+@pytest.mark.parametrize('seed, winner_leads', test_values)
+def test_solve_minimax(seed, winner_leads):
+
+    hands, trump_suit, leader, trick = random_position(random.Random(seed))
+
+    actual = solve(hands, trump_suit, leader, trick, winner_leads)
+    expected = [
+        minimax(hands, trump_suit, leader, trick, seat, winner_leads)
+        for seat in range(len(hands))
+    ]
+
+    assert actual == expected
+
+
+# test solve_table
+test_values = [(seed, policy) for seed in range(5)
+               for policy in ('depth', 'lru')]
+
+
+@pytest.mark.parametrize('seed, policy', test_values)
+def test_solve_table(seed, policy):
+
+    hands, trump_suit, leader, trick = random_position(random.Random(seed))
+    table = TranspositionTable(8, policy)
+
+    expected = solve(hands, trump_suit, leader, trick)
+    first = solve(hands, trump_suit, leader, trick, table=table)
+    second = solve(hands, trump_suit, leader, trick, table=table)
+
+    assert first == second == expected
+    assert len(table) <= 8
+
+
+# test solve_isomorphic
+test_values = [(seed, permutation) for seed in range(5)
+               for permutation in ((0, 1, 2, 3), (1, 2, 3, 0), (3, 0, 2, 1))]
+
+
+@pytest.mark.parametrize('seed, permutation', test_values)
+def test_solve_isomorphic(seed, permutation):
+
+    hands, trump_suit, leader, trick = random_position(random.Random(seed))
+    table = TranspositionTable()
+
+    expected = solve(hands, trump_suit, leader, trick, table=table)
+    n_entries = len(table)
+    actual = solve(
+        [permute_mask(hand, permutation) for hand in hands],
+        permutation[trump_suit], leader,
+        [permute_index(index, permutation) for index in trick], table=table
+    )
+
+    # the renamed position finds all its entries in the table
+    assert actual == expected
+    assert len(table) == n_entries
+
+
+# test solve_seat_errors
+test_values = [
+    ([0b1], 0, 0, []),
+    ([0b1, 0b10], 2, 0, []),
+    ([0b1, 0b10], 0, 2, []),
+    ([0b1, 0b1], 0, 0, []),
+    ([0b1, 0b110], 0, 0, []),
+    ([0b1, 0b10], 0, 0, [2, 3]),
+    ([0b1, 0b10], 0, 0, [0])
+]
+
+
+@pytest.mark.parametrize('hands, leader, seat, trick', test_values)
+def test_solve_seat_errors(hands, leader, seat, trick):
+
+    with pytest.raises(ValueError):
+        solve_seat(hands, 0, leader, seat, trick)
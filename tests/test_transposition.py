@@ -0,0 +1,178 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pyohhell.isomorphism import invert_permutation, permute_index
+from src.pyohhell.transposition import (
+    TranspositionTable,
+    canonical_position_key,
+    position_key
+)
+
+
+class Key:
+
+    """
+    Key whose hash is chosen, to force the slot of the entries.
+    """
+
+    def __init__(self, name, hash_value):
+
+        self.name = name
+        self.hash_value = hash_value
+
+    def __hash__(self):
+
+        return self.hash_value
+
+    def __eq__(self, other):
+
+        return isinstance(other, Key) and self.name == other.name
+
+
+# test position_key
+test_values = [
+    (([1, 2], [], 0, 3), ([1, 2], [], 0, 3), True),
+    (([1, 2], [], 0, 3), ([1, 2], [], 1, 3), False),
+    (([1, 2], [5], 0, 3), ([1, 2, 5], [], 0, 3), False),
+    (([1, 2], [], 0, 3), ([1, 2], [], 0, 2), False)
+]
+
+
+@pytest.mark.parametrize('position_1, position_2, expected', test_values)
+def test_position_key(position_1, position_2, expected):
+
+    actual = position_key(*position_1) == position_key(*position_2)
+    assert actual == expected
+
+
+# test canonical_position_key
+test_values = [
+    # clubs and diamonds swapped, hearts trump
+    (([1, 2], [], 0, 2), ([1 << 13, 2 << 13], [], 0, 2), True),
+    # the trump suit renamed with the others
+    (([1, 2 << 26], [], 0, 2), ([1 << 39, 2], [], 0, 0), True),
+    (([1, 2 << 26], [], 0, 2), ([1, 2 << 26], [], 0, 0), False),
+    # the suit led is renamed with the cards of the trick
+    (([1 << 13], [2], 1, 3), ([1], [15], 1, 3), True),
+    (([1 << 13], [2], 1, 3), ([1], [2], 1, 3), False),
+    (([1 << 26], [2], 1, 3), ([1 << 26], [15], 1, 3), True)
+]
+
+
+@pytest.mark.parametrize('position_1, position_2, expected', test_values)
+def test_canonical_position_key(position_1, position_2, expected):
+
+    key_1, _ = canonical_position_key(*position_1)
+    key_2, _ = canonical_position_key(*position_2)
+
+    assert (key_1 == key_2) == expected
+
+
+def test_canonical_position_key_permutation():
+
+    key, permutation = canonical_position_key([1 << 40, 1 << 2], [], 0, 1)
+
+    # the trump suit is suit 0 in the key, mapped back to spades
+    assert permute_index(0, invert_permutation(permutation)) == 13
+    assert key[0] == 0
+
+
+# test get_store
+test_values = ['depth', 'lru']
+
+
+@pytest.mark.parametrize('policy', test_values)
+def test_get_store(policy):
+
+    # int keys hash to themselves, so they don't share a slot
+    table = TranspositionTable(16, policy)
+
+    assert table.get(1) is None
+    assert table.get(1, 0) == 0
+    table.store(1, 1)
+    table.store(2, 2)
+    table.store(1, 3)
+
+    assert table.get(1) == 3
+    assert table.get(2) == 2
+    assert 1 in table and 3 not in table
+    assert table.stats() == {
+        'entries': 2, 'hits': 2, 'misses': 2, 'stores': 3, 'evictions': 0,
+        'rejections': 0
+    }
+    assert table.hit_rate == 0.5
+
+    table.clear()
+    assert len(table) == 0
+    assert table.get(1) is None
+    assert table.stats()['misses'] == 1
+
+
+# test lru
+def test_lru():
+
+    table = TranspositionTable(2, 'lru')
+    table.store('a', 1)
+    table.store('b', 2)
+    table.get('a')
+    table.store('c', 3)
+
+    assert len(table) == 2
+    assert 'a' in table and 'b' not in table and 'c' in table
+    assert table.evictions == 1
+
+
+# test depth
+test_values = [
+    (2, 1, False, 'a'),
+    (1, 1, False, 'b'),
+    (1, 2, False, 'b'),
+    (2, 1, True, 'b')
+]
+
+
+@pytest.mark.parametrize(
+    'depth_1, depth_2, new_search, expected', test_values
+)
+def test_depth(depth_1, depth_2, new_search, expected):
+
+    table = TranspositionTable(4, 'depth')
+    key_1, key_2 = Key('a', 5), Key('b', 9)
+    table.store(key_1, 1, depth_1)
+    if new_search:
+        table.new_search()
+        assert key_1 in table
+    table.store(key_2, 2, depth_2)
+
+    assert len(table) == 1
+    assert (key_1 in table) == (expected == 'a')
+    assert (key_2 in table) == (expected == 'b')
+    assert table.evictions + table.rejections == 1
+
+
+# test bounded
+test_values = ['depth', 'lru']
+
+
+@pytest.mark.parametrize('policy', test_values)
+def test_bounded(policy):
+
+    table = TranspositionTable(64, policy)
+    for key in range(1000):
+        table.store(key, key, key % 7)
+
+    assert len(table) <= 64
+    assert table.stores + table.rejections == 1000
+
+
+# test errors
+test_values = [(0, 'depth'), (16, 'fifo')]
+
+
+@pytest.mark.parametrize('capacity, policy', test_values)
+def test_errors(capacity, policy):
+
+    with pytest.raises(ValueError):
+        TranspositionTable(capacity, policy)
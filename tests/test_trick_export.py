@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.pyohhell.cards import card_to_index  # noqa: E402
+from src.pyohhell.game_engine import GameEngine  # noqa: E402
+from src.pyohhell.game_state import (  # noqa: E402
+    DefaultPointAttributionStrategy
+)
+from src.pyohhell.player import (  # noqa: E402
+    Player,
+    RandomBidSelectionStrategy,
+    RandomCardSelectionStrategy
+)
+from src.pyohhell.trick_export import (  # noqa: E402
+    TRICK_DTYPE,
+    export_tricks,
+    iter_trick_chunks
+)
+
+
+def play_games(n_players, seeds):
+
+    game_states = list()
+    for seed in seeds:
+        game_engine = GameEngine(DefaultPointAttributionStrategy())
+        for player_id in range(n_players):
+            game_engine.subscribe_player(Player(
+                player_id, RandomCardSelectionStrategy(),
+                RandomBidSelectionStrategy()
+            ))
+        game_engine.play_game(seed)
+        game_states.append(game_engine._game_state)
+
+    return game_states
+
+
+def trick_rows(game_states):
+
+    rows = list()
+    for game_id, game_state in enumerate(game_states):
+        for game_round in game_state.rounds:
+            for trick in game_round.tricks:
+                winner_id, _ = trick.get_winner(game_round.trump_card.suit)
+                lead_suit = card_to_index(trick.player_ids_cards[0][1]) // 13
+                for position, (player_id, card) in \
+                        enumerate(trick.player_ids_cards):
+                    rows.append((
+                        game_id, game_round.id, trick.id, position, player_id,
+                        card_to_index(card), lead_suit,
+                        card_to_index(game_round.trump_card),
+                        game_round.bid_by_player_id[player_id],
+                        player_id == winner_id
+                    ))
+
+    return rows
+
+
+game_states = play_games(3, [1, 2, 3]) + play_games(5, [4])
+
+
+# test iter_trick_chunks
+test_values = [1, 100, 1 << 16]
+
+
+@pytest.mark.parametrize('chunk_size', test_values)
+def test_iter_trick_chunks(chunk_size):
+
+    chunks = list(iter_trick_chunks(game_states, chunk_size))
+    actual = np.concatenate(chunks)
+
+    assert actual.dtype == TRICK_DTYPE
+    assert actual.tolist() == trick_rows(game_states)
+    # the chunks hold whole games
+    assert len(chunks) == (1 if chunk_size > len(actual) else 4)
+
+
+# test iter_trick_chunks_errors
+test_values = [0, -1]
+
+
+@pytest.mark.parametrize('chunk_size', test_values)
+def test_iter_trick_chunks_errors(chunk_size):
+
+    with pytest.raises(ValueError):
+        iter_trick_chunks(game_states, chunk_size)
+
+
+# test export_tricks
+test_values = [
+    ('tricks.npy', 1),
+    ('tricks.npy', 1 << 16),
+    ('tricks.npz', 100),
+    ('tricks.npy', None),
+    ('tricks.npz', None)
+]
+
+
+@pytest.mark.parametrize('file_name, chunk_size', test_values)
+def test_export_tricks(tmp_path, file_name, chunk_size):
+
+    exported_game_states = game_states if chunk_size is not None else []
+    expected = np.array(trick_rows(exported_game_states), dtype=TRICK_DTYPE)
+    path = str(tmp_path / file_name)
+
+    n_rows = export_tricks(
+        iter(exported_game_states), path, chunk_size or 1
+    )
+
+    assert n_rows == len(expected)
+    if file_name.endswith('.npz'):
+        with np.load(path) as actual:
+            assert sorted(actual.files) == sorted(TRICK_DTYPE.names)
+            for name in TRICK_DTYPE.names:
+                assert np.array_equal(actual[name], expected[name])
+    else:
+        actual = np.load(path, mmap_mode='r')
+        assert actual.dtype == TRICK_DTYPE
+        assert np.array_equal(actual, expected)
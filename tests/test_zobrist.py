@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pyohhell.zobrist import (
+    BID,
+    HAND_CARD,
+    N_TABLE_PLAYERS,
+    PLAYED_CARD,
+    TO_MOVE,
+    TRICK_CARD,
+    TRUMP,
+    WINS,
+    bid_key,
+    hand_card_key,
+    hand_hash,
+    played_card_key,
+    round_hash,
+    to_move_key,
+    trick_card_key,
+    trump_key,
+    wins_key,
+    zobrist_key
+)
+
+
+# test zobrist_key
+test_values = [
+    ((BID, 1, 2), (BID, 1, 2), True),
+    ((BID, 1, 2), (BID, 2, 1), False),
+    ((BID, 1), (TO_MOVE, 1), False),
+    ((HAND_CARD, -1, 0), (HAND_CARD, -1, 0), True)
+]
+
+
+@pytest.mark.parametrize('keys_1, keys_2, expected', test_values)
+def test_zobrist_key(keys_1, keys_2, expected):
+
+    assert (zobrist_key(*keys_1) == zobrist_key(*keys_2)) == expected
+    assert 0 <= zobrist_key(*keys_1) < 2 ** 64
+
+
+# test table_keys
+test_values = [
+    (trump_key, TRUMP, (0, 0)),
+    (trump_key, TRUMP, (N_TABLE_PLAYERS - 1, 51)),
+    (trump_key, TRUMP, (N_TABLE_PLAYERS, 51)),
+    (bid_key, BID, (0, 0)),
+    (bid_key, BID, (3, 52)),
+    (bid_key, BID, (N_TABLE_PLAYERS, 2)),
+    (bid_key, BID, (-1, 2)),
+    (trick_card_key, TRICK_CARD, (0, 0, 0)),
+    (trick_card_key, TRICK_CARD, (2, N_TABLE_PLAYERS - 1, 51)),
+    (trick_card_key, TRICK_CARD, (N_TABLE_PLAYERS, 1, 5)),
+    (trick_card_key, TRICK_CARD, (1, N_TABLE_PLAYERS, 5)),
+    (played_card_key, PLAYED_CARD, (5, 13)),
+    (played_card_key, PLAYED_CARD, (67, 13)),
+    (hand_card_key, HAND_CARD, (N_TABLE_PLAYERS - 1, 51)),
+    (hand_card_key, HAND_CARD, (-1, 0)),
+    (wins_key, WINS, (2, 52)),
+    (wins_key, WINS, (131, 1)),
+    (to_move_key, TO_MOVE, (0,)),
+    (to_move_key, TO_MOVE, (N_TABLE_PLAYERS,))
+]
+
+
+@pytest.mark.parametrize('key_function, domain, keys', test_values)
+def test_table_keys(key_function, domain, keys):
+
+    assert key_function(*keys) == zobrist_key(domain, *keys)
+
+
+# test round_hash
+def test_round_hash():
+
+    hashes = [round_hash(0, 0), round_hash(1, 0), round_hash(0, 1)]
+
+    assert len(set(hashes)) == len(hashes)
+    assert round_hash(1, 0) == round_hash(1, 0)
+
+
+# test hand_hash
+test_values = [
+    (1, 0, []),
+    (1, 0b1011, [0, 1, 3]),
+    (2, 1 << 51, [51])
+]
+
+
+@pytest.mark.parametrize('player_id, mask, card_indices', test_values)
+def test_hand_hash(player_id, mask, card_indices):
+
+    expected = 0
+    for card_index in card_indices:
+        expected ^= hand_card_key(player_id, card_index)
+
+    assert hand_hash(player_id, mask) == expected
+
+
+# test to_move_key
+def test_to_move_key():
+
+    assert to_move_key(1) == zobrist_key(TO_MOVE, 1)
+    assert to_move_key(1) != to_move_key(2)
+
+
+# test wins_key
+test_values = [(1, 0, True), (1, 1, False), (2, 3, False)]
+
+
+@pytest.mark.parametrize('player_id, n_wins, is_zero', test_values)
+def test_wins_key(player_id, n_wins, is_zero):
+
+    assert (wins_key(player_id, n_wins) == 0) == is_zero